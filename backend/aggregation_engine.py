@@ -0,0 +1,430 @@
+"""
+Single-Pass Aggregation Engine for RIT Basketball Statistics
+Pulls a season's plays once per gender and computes every cached team and
+player dataset in-process
+
+Each dataset mirrors one query file under queries/{gender}/ column for
+column, including MySQL's DECIMAL arithmetic (integer division reported at
+scale 4, ROUND half away from zero) and PERCENT_RANK percentiles. If a query file changes, the
+matching function here must change with it.
+"""
+
+import math
+import threading
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from query_executor import QueryExecutor
+from serialization import convert_rows, decimal_converters
+from seasons import normalize_conference, normalize_season
+from sql_connector import get_mens_db, get_womens_db
+
+
+PLAYS_QUERY = """
+    SELECT
+        primary_team, primary_player, secondary_player,
+        primary_play, secondary_play, outcome, shot_level
+    FROM plays_table_denorm_extra
+    WHERE conference = %s AND
+          year = %s
+"""
+
+# MySQL reports an integer DECIMAL quotient at scale 0 + div_precision_increment
+# (default 4), but keeps a full 9-digit word of fraction while the quotient is
+# still feeding further arithmetic such as "* 100" or ROUND().
+_DIV_SCALE = Decimal("0.0001")
+_DIV_WORKING_SCALE = Decimal("0.000000001")
+_SCALES = {1: Decimal("0.1"), 2: Decimal("0.01")}
+
+# Per-play indicator columns summed by the group-bys
+_FLAGS = [
+    "m2", "x2", "m3", "x3",
+    "l1", "l1_m", "l1_x",
+    "l2", "l2_m", "l2_x",
+    "l3", "l3_m", "l3_x",
+    "l4", "l4_m", "l4_x",
+]
+
+
+# ==================== MYSQL ARITHMETIC ====================
+
+def _quotient(numerator: int, denominator: int) -> Optional[Decimal]:
+    """Integer DECIMAL division at MySQL's working precision (NULL on division by zero)."""
+    if not denominator:
+        return None
+    return (Decimal(int(numerator)) / Decimal(int(denominator))).quantize(_DIV_WORKING_SCALE, ROUND_DOWN)
+
+
+def _div(numerator: int, denominator: int) -> Optional[Decimal]:
+    """A bare ``numerator / denominator`` column, as MySQL returns it."""
+    ratio = _quotient(numerator, denominator)
+    return ratio.quantize(_DIV_SCALE, ROUND_HALF_UP) if ratio is not None else None
+
+
+def _round(value: Optional[Decimal], places: int) -> Optional[Decimal]:
+    """ROUND() on a DECIMAL: half away from zero."""
+    if value is None:
+        return None
+    return value.quantize(_SCALES[places], ROUND_HALF_UP)
+
+
+def _pct(numerator: int, denominator: int, places: int) -> Optional[Decimal]:
+    """ROUND(numerator / denominator * 100, places)."""
+    ratio = _quotient(numerator, denominator)
+    return _round(ratio * 100 if ratio is not None else None, places)
+
+
+def _percent_rank(values: List[Any]) -> List[float]:
+    """
+    ROUND(PERCENT_RANK() OVER (ORDER BY value) * 100, 1) for one partition.
+
+    NULLs sort first, ties share the lowest rank, and the double result is
+    rounded with rint() as MySQL's ROUND on approximate values does.
+    """
+    n = len(values)
+    if n <= 1:
+        return [0.0] * n
+    keys = [(0, 0) if v is None else (1, v) for v in values]
+    ordered = sorted(keys)
+    first_rank = {}
+    for position, key in enumerate(ordered):
+        first_rank.setdefault(key, position)
+    return [round(first_rank[key] / (n - 1) * 100 * 10) / 10 for key in keys]
+
+
+def _percentiles(rows: List[Dict[str, Any]], column: str, eligible: Callable[[Dict[str, Any]], bool],
+                 partition: Optional[str] = None) -> List[Optional[float]]:
+    """
+    PERCENT_RANK over every row of each partition, then NULL for rows that
+    fail ``eligible`` (the CASE WHEN ... ELSE NULL wrapper in the query files).
+    """
+    groups: Dict[Any, List[int]] = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(row[partition] if partition else None, []).append(i)
+
+    result: List[Optional[float]] = [None] * len(rows)
+    for indexes in groups.values():
+        ranks = _percent_rank([rows[i][column] for i in indexes])
+        for i, rank in zip(indexes, ranks):
+            result[i] = rank if eligible(rows[i]) else None
+    return result
+
+
+def _order(rows: List[Dict[str, Any]], *keys: Tuple[str, bool]) -> List[Dict[str, Any]]:
+    """ORDER BY the given (column, descending) keys; strings compare case-insensitively."""
+    for column, descending in reversed(keys):
+        rows.sort(
+            key=lambda r: (r[column] is not None,
+                           r[column].casefold() if isinstance(r[column], str) else r[column] or 0),
+            reverse=descending
+        )
+    return rows
+
+
+def _clean(value: Any) -> Any:
+    """Turn pandas' NaN group keys back into NULLs."""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+# ==================== SOURCE ROWS ====================
+
+def prepare_plays(plays: pd.DataFrame) -> pd.DataFrame:
+    """
+    Derive grouping keys and per-play indicator columns from raw play rows.
+
+    Outcome comparisons are case-insensitive to match the database collation
+    ('2pma' and '2pMa' are the same outcome).
+    """
+    frame = pd.DataFrame({
+        "PLAY_TYPE": plays["secondary_play"].where(plays["secondary_play"].notna(), plays["primary_play"]),
+        "PLAYER": plays["secondary_player"].where(plays["secondary_player"].notna(), plays["primary_player"]),
+        "TEAM": plays["primary_team"],
+    })
+    outcome = plays["outcome"].str.lower()
+    level = pd.to_numeric(plays["shot_level"], errors="coerce")
+    two = outcome.isin(["2pmi", "2pma"])
+
+    flags = {
+        "m2": outcome == "2pma",
+        "x2": outcome == "2pmi",
+        "m3": outcome == "3pma",
+        "x3": outcome == "3pmi",
+        "l1": (level == 1) & two,
+        "l1_m": (level == 1) & (outcome == "2pma"),
+        "l1_x": (level == 1) & (outcome == "2pmi"),
+        "l2": level == 2,
+        "l2_m": (level == 2) & (outcome == "2pma"),
+        "l2_x": (level == 2) & (outcome == "2pmi"),
+        "l3": level == 3,
+        "l3_m": (level == 3) & (outcome == "2pma"),
+        "l3_x": (level == 3) & (outcome == "2pmi"),
+        "l4": level == 4,
+        "l4_m": (level == 4) & (outcome == "3pma"),
+        "l4_x": (level == 4) & (outcome == "3pmi"),
+    }
+    for name, flag in flags.items():
+        frame[name] = flag.fillna(False).astype("int64")
+
+    # shot_level IN (1, 2, 3, 4) AND NOT (shot_level = 1 AND outcome NOT IN ('2pmi', '2pMa'))
+    frame["is_shot"] = level.isin([2, 3, 4]) | ((level == 1) & two.fillna(False))
+    return frame
+
+
+def _group(frame: pd.DataFrame, keys: List[str]) -> List[Dict[str, Any]]:
+    """Sum every indicator column per group and count plays."""
+    grouped = frame.groupby(keys, dropna=False, sort=False)
+    sums = grouped[_FLAGS].sum()
+    sums["count"] = grouped.size()
+    rows = []
+    for key, values in zip(sums.index, sums.to_dict("records")):
+        key = key if isinstance(key, tuple) else (key,)
+        row = {k: _clean(v) for k, v in zip(keys, key)}
+        row.update({name: int(value) for name, value in values.items()})
+        rows.append(row)
+    return rows
+
+
+# ==================== DATASETS ====================
+
+def _offensive_efficiency(frame: pd.DataFrame, keys: List[str], min_plays: int,
+                          min_2pa: int, min_3pa: int) -> List[Dict[str, Any]]:
+    """Team-/Player-OffensiveEfficiency.sql: efficiency by play type with percentiles."""
+    rows = []
+    for g in _group(frame, keys):
+        if g["count"] < min_plays:
+            continue
+        row = {k: g[k] for k in keys}
+        attempts_2, attempts_3 = g["x2"] + g["m2"], g["x3"] + g["m3"]
+        row.update({
+            "PPP": _div(g["m2"] * 2 + g["m3"] * 3, g["count"]),
+            "2PA": Decimal(attempts_2),
+            "2PM": Decimal(g["m2"]),
+            "2P%": _pct(g["m2"], attempts_2, 2),
+            "3PA": Decimal(attempts_3),
+            "3PM": Decimal(g["m3"]),
+            "3P%": _pct(g["m3"], attempts_3, 2),
+            "PLAY_COUNT": g["count"],
+        })
+        rows.append(row)
+
+    ppp = _percentiles(rows, "PPP", lambda r: True, partition="PLAY_TYPE")
+    two = _percentiles(rows, "2P%", lambda r: r["2PA"] >= min_2pa, partition="PLAY_TYPE")
+    three = _percentiles(rows, "3P%", lambda r: r["3PA"] >= min_3pa, partition="PLAY_TYPE")
+    for row, p, t, h in zip(rows, ppp, two, three):
+        row.update({"PPP_PERCENTILE": p, "2P%_PERCENTILE": t, "3P%_PERCENTILE": h})
+
+    return _order(rows, ("PLAY_COUNT", True))
+
+
+def _shot_frequency(frame: pd.DataFrame, keys: List[str], min_shots: int,
+                    order: List[Tuple[str, bool]]) -> List[Dict[str, Any]]:
+    """*-ShotLocation-FreqDist.sql: shot counts per court zone."""
+    rows = []
+    for g in _group(frame[frame["is_shot"]], keys):
+        total = g["l1"] + g["l2"] + g["l3"] + g["l4"]
+        if total < min_shots:
+            continue
+        row = {k: g[k] for k in keys}
+        row.update({
+            "LAYUP_COUNT": Decimal(g["l1"]),
+            "CLOSE_COUNT": Decimal(g["l2"]),
+            "MID_COUNT": Decimal(g["l3"]),
+            "THREE_COUNT": Decimal(g["l4"]),
+            "TOTAL_SHOTS": Decimal(total),
+        })
+        rows.append(row)
+    return _order(rows, *order)
+
+
+def _zone_stats(g: Dict[str, Any], zone: str, level: str, points: int) -> Dict[str, Any]:
+    plays, makes, misses = g[level], g[f"{level}_m"], g[f"{level}_x"]
+    return {
+        f"{zone}_PLAYS": Decimal(plays),
+        f"{zone}_MAKES": Decimal(makes),
+        f"{zone}_MISS": Decimal(misses),
+        f"{zone}_PCT": _pct(makes, plays, 1),
+        f"{zone}_PPP": _round(_quotient(makes * points, plays), 2),
+    }
+
+
+def _player_shot_efficiency(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Player-ShotLocation-EffDist.sql: efficiency per court zone with percentiles."""
+    zones = [("LAYUP", "l1", 2, 10), ("CLOSE", "l2", 2, 8), ("MID", "l3", 2, 10), ("THREE", "l4", 3, 10)]
+    rows = []
+    for g in _group(frame[frame["is_shot"]], ["PLAYER", "TEAM"]):
+        if g["l1"] + g["l2"] + g["l3"] + g["l4"] < 10:
+            continue
+        row = {"PLAYER": g["PLAYER"], "TEAM": g["TEAM"]}
+        for zone, level, points, _ in zones:
+            row.update(_zone_stats(g, zone, level, points))
+        rows.append(row)
+
+    for zone, _, _, min_plays in zones:
+        eligible = lambda r, z=zone, m=min_plays: r[f"{z}_PLAYS"] >= m
+        pct = _percentiles(rows, f"{zone}_PCT", eligible)
+        ppp = _percentiles(rows, f"{zone}_PPP", eligible)
+        for row, a, b in zip(rows, pct, ppp):
+            row[f"{zone}_PCT_PCTL"] = a
+            row[f"{zone}_PPP_PCTL"] = b
+
+    for row in rows:
+        row["_TOTAL"] = row["LAYUP_PLAYS"] + row["CLOSE_PLAYS"] + row["MID_PLAYS"] + row["THREE_PLAYS"]
+    _order(rows, ("_TOTAL", True))
+    for row in rows:
+        del row["_TOTAL"]
+    return rows
+
+
+def compute_datasets(plays: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compute every cached team and player dataset from one set of play rows.
+
+    Args:
+        plays: Raw rows of plays_table_denorm_extra for one gender and season
+
+    Returns:
+        Result rows keyed by dataset name (as used in fetch_and_cache.py)
+    """
+    frame = prepare_plays(plays)
+    team_eff = _offensive_efficiency(frame, ["PLAY_TYPE", "TEAM"], 30, 30, 20)
+    no_percentiles = [
+        {k: v for k, v in row.items() if not k.endswith("_PERCENTILE")} for row in team_eff
+    ]
+    return {
+        "team-offensive-efficiency": team_eff,
+        "team-offensive-efficiency-no-percentiles": no_percentiles,
+        "team-shot-location-frequency": _shot_frequency(
+            frame, ["TEAM"], 50, [("TOTAL_SHOTS", True)]),
+        "team-playtype-shot-frequency": _shot_frequency(
+            frame, ["TEAM", "PLAY_TYPE"], 10, [("TEAM", False), ("TOTAL_SHOTS", True)]),
+        "player-offensive-efficiency": _offensive_efficiency(
+            frame, ["PLAY_TYPE", "PLAYER", "TEAM"], 15, 15, 10),
+        "player-shot-location-efficiency": _player_shot_efficiency(frame),
+        "player-shot-location-frequency": _shot_frequency(
+            frame, ["PLAYER", "TEAM"], 1, [("TOTAL_SHOTS", True)]),
+        "player-playtype-shot-frequency": _shot_frequency(
+            frame, ["PLAYER", "TEAM", "PLAY_TYPE"], 5, [("PLAYER", False), ("TOTAL_SHOTS", True)]),
+    }
+
+
+# ==================== EXECUTOR ====================
+
+class SeasonScan:
+    """
+    One gender's plays, streamed once and aggregated into every dataset.
+
+    Safe to share between threads: the first caller runs the scan on its own
+    database connection while later callers wait for the result.
+    """
+
+    def __init__(self, gender: str = "mens", batch_size: int = 5000,
+                 season: Optional[str] = None, conference: Optional[str] = None):
+        """
+        Initialize the scan.
+
+        Args:
+            gender: Either "mens" or "womens"
+            batch_size: Rows fetched per round trip while streaming plays
+            season: Season to scan (None = CURRENT_SEASON)
+            conference: Conference to scan (None = CONFERENCE)
+        """
+        self.gender = gender.lower()
+        self.batch_size = batch_size
+        self.season = normalize_season(season)
+        self.conference = normalize_conference(conference)
+        self._datasets: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._lock = threading.Lock()
+
+    def load_plays(self) -> pd.DataFrame:
+        """Stream the season's plays in batches into one DataFrame."""
+        db = get_mens_db() if self.gender == "mens" else get_womens_db()
+        chunks = []
+        with db.connection():
+            for batch in db.stream_query(
+                PLAYS_QUERY, (self.conference, self.season),
+                batch_size=self.batch_size, label=f"{self.gender}/scan/plays"
+            ):
+                chunks.append(pd.DataFrame.from_records(batch))
+        if not chunks:
+            return pd.DataFrame(columns=[
+                "primary_team", "primary_player", "secondary_player",
+                "primary_play", "secondary_play", "outcome", "shot_level"
+            ])
+        return pd.concat(chunks, ignore_index=True)
+
+    def datasets(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        All computed datasets, scanning the plays on first call.
+
+        DECIMAL results become floats, as DatabaseManager converts query results.
+        """
+        with self._lock:
+            if self._datasets is None:
+                datasets = compute_datasets(self.load_plays())
+                for rows in datasets.values():
+                    convert_rows(rows, decimal_converters(rows))
+                self._datasets = datasets
+            return self._datasets
+
+
+class SinglePassExecutor(QueryExecutor):
+    """
+    QueryExecutor whose team/player dataset methods are answered from one
+    streamed scan of the season's plays instead of one query per dataset.
+
+    Filtered calls and metadata methods still query the database directly.
+    """
+
+    def __init__(self, gender: str = "mens", scan: Optional[SeasonScan] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            gender: Either "mens" or "womens"
+            scan: Scan shared with other executors for the same gender
+                  (a private one is created if omitted); its season and
+                  conference are the executor's too
+        """
+        scan = scan or SeasonScan(gender)
+        super().__init__(gender, season=scan.season, conference=scan.conference)
+        self.scan = scan
+
+    def datasets(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.scan.datasets()
+
+    def execute_dataset(self, dataset: str) -> List[Dict[str, Any]]:
+        """Datasets the scan computes come from it; other templates still run their query."""
+        datasets = self.datasets()
+        if dataset in datasets:
+            return datasets[dataset]
+        return super().execute_dataset(dataset)
+
+    def execute_team_offensive_efficiency(self, include_percentiles: bool = True, **kwargs) -> List[Dict[str, Any]]:
+        if not self._is_full_result(**kwargs):
+            return super().execute_team_offensive_efficiency(include_percentiles=include_percentiles, **kwargs)
+        key = "team-offensive-efficiency" if include_percentiles else "team-offensive-efficiency-no-percentiles"
+        return self.datasets()[key]
+
+    def execute_team_shot_location_frequency(self) -> List[Dict[str, Any]]:
+        return self.datasets()["team-shot-location-frequency"]
+
+    def execute_team_playtype_shot_frequency(self) -> List[Dict[str, Any]]:
+        return self.datasets()["team-playtype-shot-frequency"]
+
+    def execute_player_offensive_efficiency(self, include_percentiles: bool = True, **kwargs) -> List[Dict[str, Any]]:
+        if not include_percentiles or not self._is_full_result(**kwargs):
+            return super().execute_player_offensive_efficiency(include_percentiles=include_percentiles, **kwargs)
+        return self.datasets()["player-offensive-efficiency"]
+
+    def execute_player_shot_location_efficiency(self) -> List[Dict[str, Any]]:
+        return self.datasets()["player-shot-location-efficiency"]
+
+    def execute_player_shot_location_frequency(self) -> List[Dict[str, Any]]:
+        return self.datasets()["player-shot-location-frequency"]
+
+    def execute_player_playtype_shot_frequency(self) -> List[Dict[str, Any]]:
+        return self.datasets()["player-playtype-shot-frequency"]
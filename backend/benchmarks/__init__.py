@@ -0,0 +1 @@
+# RIT Basketball Statistics Backend Benchmarks
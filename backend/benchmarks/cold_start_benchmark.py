@@ -0,0 +1,149 @@
+"""
+Cold Start Benchmark
+Measures what a fresh API process pays before it can answer: importing the
+app, then its first and second requests
+
+Every run is a new interpreter, as on scale-to-zero hosting where each cold
+start imports the app from scratch. The database is simulated (no MySQL
+server needed), so the first request measures the app's own one-time work:
+settings, template parsing and caches. The report also lists heavy analytics
+modules (pandas, NumPy) that the import pulled in, and what importing them
+would have added.
+
+Usage (from backend/):
+    python -m benchmarks.cold_start_benchmark --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that should only load when a code path needs them
+HEAVY_MODULES = ["pandas", "numpy"]
+
+TIMINGS = ["import_s", "first_request_s", "second_request_s", "deferred_import_s"]
+
+
+def probe() -> Dict[str, Any]:
+    """
+    Time one cold start in this (fresh) interpreter.
+
+    Returns:
+        Seconds to import main, for the first and a second (uncached) request,
+        and for importing the heavy modules the app deferred
+    """
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter() - started
+
+    heavy_loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    module_count = len(sys.modules)
+
+    # Imported after the measurement: the client is not part of the app
+    import asyncio
+    from unittest import mock
+
+    import httpx
+    from query_executor import QueryExecutor
+
+    def query(self, **kwargs):
+        return [{"PLAY_TYPE": "Transition", "TEAM": "RIT", "PLAY_COUNT": 1}]
+
+    async def requests() -> List[float]:
+        transport = httpx.ASGITransport(app=main.app)
+        timings = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for limit in (1, 2):
+                request_started = time.perf_counter()
+                response = await client.get("/api/stats/mens/teams/offensive-efficiency", params={"limit": limit})
+                timings.append(time.perf_counter() - request_started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Request failed: {response.status_code} {response.text}")
+        return timings
+
+    with mock.patch.object(QueryExecutor, "execute_team_offensive_efficiency", query), \
+            mock.patch.object(QueryExecutor, "data_version", lambda self, dataset: None):
+        first, second = asyncio.run(requests())
+
+    deferred_started = time.perf_counter()
+    for name in HEAVY_MODULES:
+        __import__(name)
+    deferred = time.perf_counter() - deferred_started
+
+    return {
+        "import_s": round(imported, 4),
+        "first_request_s": round(first, 4),
+        "second_request_s": round(second, 4),
+        "deferred_import_s": round(deferred, 4),
+        "modules": module_count,
+        "heavy_modules_loaded": heavy_loaded,
+    }
+
+
+def run_benchmark(runs: int) -> Dict[str, Any]:
+    """
+    Run probe() in fresh interpreters and summarize the timings.
+
+    Args:
+        runs: Number of cold starts
+
+    Returns:
+        Per-run results plus the median, min and max of every timing
+    """
+    results = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start_benchmark", "--probe"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    summary = {
+        timing: {
+            "median": round(statistics.median(r[timing] for r in results), 4),
+            "min": min(r[timing] for r in results),
+            "max": max(r[timing] for r in results),
+        }
+        for timing in TIMINGS
+    }
+    return {
+        "runs": results,
+        "summary": summary,
+        "modules": results[-1]["modules"],
+        "heavy_modules_loaded": results[-1]["heavy_modules_loaded"],
+    }
+
+
+def main_cli(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark API import time and first-request latency")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts (fresh interpreters) to time")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        print(json.dumps(probe()))
+        return
+
+    results = run_benchmark(args.runs)
+    print(f"Cold starts: {args.runs} (median / min / max seconds)")
+    for timing in TIMINGS:
+        s = results["summary"][timing]
+        print(f"  {timing:<18} {s['median']:>8.4f}  {s['min']:>8.4f}  {s['max']:>8.4f}")
+    print(f"  modules loaded by import: {results['modules']}")
+    print(f"  heavy modules loaded by import: {', '.join(results['heavy_modules_loaded']) or 'none'}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,127 @@
+"""
+Concurrency Benchmark
+Measures API throughput with blocking database calls run inline on the event
+loop versus offloaded to the database thread pool, and how many query
+executions a burst of identical requests costs with and without single-flight
+coalescing.
+
+The database is simulated with a fixed per-query latency so the benchmark runs
+without a MySQL server; only the request handling path is real.
+
+Usage (from backend/):
+    python -m benchmarks.concurrency_benchmark --requests 50 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, Any
+from unittest import mock
+
+import httpx
+
+import main
+from query_executor import QueryExecutor
+
+
+async def _run_inline(func, *args, **kwargs):
+    """Old behaviour: call the blocking function directly inside the handler."""
+    return func(*args, **kwargs)
+
+
+class _NoCoalescing:
+    """Old behaviour: every request runs its own execution."""
+
+    async def do(self, key, func):
+        return await func(), False
+
+
+async def _fire(requests: int, identical: bool = False) -> float:
+    """Send concurrent requests (distinct cache keys unless identical) and return elapsed seconds."""
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.get("/api/stats/mens/teams/offensive-efficiency", params={"limit": 1 if identical else i + 1})
+            for i in range(requests)
+        ])
+        elapsed = time.perf_counter() - started
+    failed = [r for r in responses if r.status_code != 200]
+    if failed:
+        raise RuntimeError(f"{len(failed)} requests failed: {failed[0].text}")
+    return elapsed
+
+
+def run_benchmark(requests: int, latency: float) -> Dict[str, Any]:
+    """
+    Time the same concurrent burst with inline and offloaded database calls,
+    then a burst of identical requests with and without coalescing.
+
+    Args:
+        requests: Number of concurrent requests per run
+        latency: Simulated seconds per database query
+
+    Returns:
+        Dictionary of timings and throughput for every mode
+    """
+    executions = []
+
+    def slow_query(self, **kwargs):
+        executions.append(1)
+        time.sleep(latency)
+        return [{"PLAY_TYPE": "Transition", "TEAM": "RIT", "PLAY_COUNT": 1}]
+
+    results = {}
+    # No base result to version: responses go out without conditional headers
+    with mock.patch.object(QueryExecutor, "execute_team_offensive_efficiency", slow_query), \
+            mock.patch.object(QueryExecutor, "data_version", lambda self, dataset: None):
+        for mode in ["inline", "offloaded"]:
+            main.result_cache.invalidate()
+            if mode == "inline":
+                with mock.patch.object(main, "run_blocking", _run_inline):
+                    elapsed = asyncio.run(_fire(requests))
+            else:
+                elapsed = asyncio.run(_fire(requests))
+            results[mode] = {
+                "elapsed_s": round(elapsed, 4),
+                "requests_per_s": round(requests / elapsed, 2)
+            }
+
+        results["speedup"] = round(results["inline"]["elapsed_s"] / results["offloaded"]["elapsed_s"], 2)
+
+        for mode in ["uncoalesced", "coalesced"]:
+            main.result_cache.invalidate()
+            executions.clear()
+            if mode == "uncoalesced":
+                with mock.patch.object(main, "request_flight", _NoCoalescing()):
+                    elapsed = asyncio.run(_fire(requests, identical=True))
+            else:
+                elapsed = asyncio.run(_fire(requests, identical=True))
+            results[mode] = {
+                "elapsed_s": round(elapsed, 4),
+                "requests_per_s": round(requests / elapsed, 2),
+                "executions": len(executions)
+            }
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark blocking vs offloaded DB calls")
+    parser.add_argument("--requests", type=int, default=50, help="Concurrent requests per run")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated query latency (seconds)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.requests, args.latency)
+    print(f"Concurrent requests: {args.requests}, simulated query latency: {args.latency}s")
+    for mode in ["inline", "offloaded"]:
+        r = results[mode]
+        print(f"  {mode:<10} {r['elapsed_s']:>8.3f}s  {r['requests_per_s']:>8.2f} req/s")
+    print(f"  speedup    {results['speedup']:.2f}x")
+    print(f"Identical concurrent requests: {args.requests}")
+    for mode in ["uncoalesced", "coalesced"]:
+        r = results[mode]
+        print(f"  {mode:<11} {r['elapsed_s']:>7.3f}s  {r['requests_per_s']:>8.2f} req/s  {r['executions']:>4} executions")
+
+
+if __name__ == "__main__":
+    main_cli()
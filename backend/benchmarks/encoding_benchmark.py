@@ -0,0 +1,138 @@
+"""
+Encoding Benchmark
+Measures JSON encoding of the cached datasets before and after the fast
+serialization path: Decimal rows through jsonable_encoder + json.dumps (API)
+and json.dumps(default=str) (cache files), versus rows converted once to
+native numbers and encoded with orjson.
+
+Dataset rows are computed from synthetic plays by the aggregation engine,
+which produces the same columns and DECIMAL values as the query files, so
+no MySQL server is needed.
+
+Usage (from backend/):
+    python -m benchmarks.encoding_benchmark --rows 100000 --repeat 5
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from aggregation_engine import compute_datasets
+from benchmarks.synthetic_plays import COLUMNS, generate_plays
+from serialization import convert_rows, decimal_converters, dumps
+
+
+def _median_seconds(func: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def _payload(name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The envelope the API and fetch_and_cache.py wrap rows in."""
+    return {"success": True, "gender": "mens", "query": name, "row_count": len(rows), "data": rows}
+
+
+def encode_before_api(payload: Dict[str, Any]) -> bytes:
+    """FastAPI's default path: jsonable_encoder walk, then JSONResponse's json.dumps."""
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_before_file(payload: Dict[str, Any]) -> bytes:
+    """The old save_json: Decimals written as strings."""
+    return json.dumps(payload, indent=2, default=str).encode("utf-8")
+
+
+def run_benchmark(rows: int, seed: int, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Time every encoding path for each dataset computed from ``rows`` synthetic plays.
+
+    Returns:
+        Per dataset: row count, seconds per path (median of ``repeat`` runs) and output bytes
+    """
+    plays = pd.DataFrame(
+        [play for batch in generate_plays(rows, seed) for play in batch], columns=COLUMNS
+    )
+    datasets = compute_datasets(plays)
+
+    results = {}
+    for name, decimal_rows in datasets.items():
+        payload = _payload(name, decimal_rows)
+        converters = decimal_converters(decimal_rows)
+        native_rows = convert_rows(copy.deepcopy(decimal_rows), converters)
+        native = _payload(name, native_rows)
+
+        results[name] = {
+            "rows": len(decimal_rows),
+            "convert_s": _median_seconds(
+                lambda: convert_rows([dict(r) for r in decimal_rows], converters), repeat),
+            "copy_s": _median_seconds(lambda: [dict(r) for r in decimal_rows], repeat),
+            "api_before_s": _median_seconds(lambda: encode_before_api(payload), repeat),
+            "api_after_s": _median_seconds(lambda: dumps(native), repeat),
+            "file_before_s": _median_seconds(lambda: encode_before_file(payload), repeat),
+            "file_after_s": _median_seconds(lambda: dumps(native, indent=True), repeat),
+            "api_before_bytes": len(encode_before_api(payload)),
+            "api_after_bytes": len(dumps(native)),
+            "file_before_bytes": len(encode_before_file(payload)),
+            "file_after_bytes": len(dumps(native, indent=True)),
+        }
+        # Conversion is timed on fresh row copies; report it net of the copy
+        results[name]["convert_s"] = max(0.0, results[name]["convert_s"] - results[name].pop("copy_s"))
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    header = (f"{'Dataset':<42} {'rows':>6} {'convert':>9} {'api before':>11} {'api after':>10} "
+              f"{'speedup':>8} {'file before':>12} {'file after':>11} {'speedup':>8}")
+    print(header)
+    print("-" * len(header))
+    totals = {key: 0.0 for key in ("convert_s", "api_before_s", "api_after_s", "file_before_s", "file_after_s")}
+    for name, r in results.items():
+        for key in totals:
+            totals[key] += r[key]
+        print(f"{name:<42} {r['rows']:>6} {r['convert_s'] * 1000:>7.2f}ms "
+              f"{r['api_before_s'] * 1000:>9.2f}ms {r['api_after_s'] * 1000:>8.2f}ms "
+              f"{r['api_before_s'] / max(r['api_after_s'], 1e-9):>7.1f}x "
+              f"{r['file_before_s'] * 1000:>10.2f}ms {r['file_after_s'] * 1000:>9.2f}ms "
+              f"{r['file_before_s'] / max(r['file_after_s'], 1e-9):>7.1f}x")
+    print("-" * len(header))
+    print(f"{'total':<42} {'':>6} {totals['convert_s'] * 1000:>7.2f}ms "
+          f"{totals['api_before_s'] * 1000:>9.2f}ms {totals['api_after_s'] * 1000:>8.2f}ms "
+          f"{totals['api_before_s'] / max(totals['api_after_s'], 1e-9):>7.1f}x "
+          f"{totals['file_before_s'] * 1000:>10.2f}ms {totals['file_after_s'] * 1000:>9.2f}ms "
+          f"{totals['file_before_s'] / max(totals['file_after_s'], 1e-9):>7.1f}x")
+    before = sum(r["file_before_bytes"] for r in results.values())
+    after = sum(r["file_after_bytes"] for r in results.values())
+    print(f"Cache file bytes: {before:,} -> {after:,} (numbers no longer quoted)")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of the cached datasets")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic plays to compute datasets from")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic plays")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path (median reported)")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.seed, args.repeat)
+    print(f"Synthetic plays: {args.rows:,}, median of {args.repeat} runs")
+    print_results(results)
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(dumps(results, indent=True))
+        print(f"📁 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
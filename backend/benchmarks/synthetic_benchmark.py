@@ -0,0 +1,543 @@
+"""
+Synthetic Benchmark Suite
+Times every QueryExecutor.execute_* method, the API endpoints and the full
+fetch_and_cache refresh against synthetic plays at several table sizes, and
+writes the results as JSON so runs can be compared
+
+Two backends:
+    mysql     Load the plays into dedicated benchmark databases on the MySQL
+              server configured by DB_HOST / PORT / DB_USERNAME / DB_PASSWORD
+              and run every query for real.
+    embedded  No server needed: the plays stay in memory and every dataset is
+              computed by the single-pass aggregation engine, which mirrors
+              the query files column for column. Measures the Python side
+              (aggregation, in-memory filtering, serialization, endpoints and
+              the refresh) but not MySQL itself.
+
+Usage (from backend/):
+    python -m benchmarks.synthetic_benchmark --backend embedded --rows 10000 100000
+    python -m benchmarks.synthetic_benchmark --backend mysql --rows 10000 1000000 \\
+        --output results.json --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+import httpx
+import numpy as np
+import pandas as pd
+
+import fetch_and_cache
+import main
+from aggregation_engine import SeasonScan, SinglePassExecutor
+from benchmarks.synthetic_plays import COLUMNS, generate_plays, load_into_mysql
+from config import get_settings, reload_settings
+from data_versions import get_data_versions
+from dataset_registry import get_dataset_registry
+from query_executor import (
+    STREAM_BATCH_SIZE, QueryExecutor, invalidate_base_results
+)
+from query_profiler import get_profiler
+from result_frame import ResultFrame
+from sql_connector import close_pools
+
+
+GENDERS = ["mens", "womens"]
+
+# (name, method, kwargs) for every QueryExecutor call the API and refresh make
+EXECUTE_CASES = [
+    ("execute_team_offensive_efficiency", "execute_team_offensive_efficiency", {}),
+    ("execute_team_offensive_efficiency[no_percentiles]", "execute_team_offensive_efficiency",
+     {"include_percentiles": False}),
+    ("execute_team_offensive_efficiency[filtered]", "execute_team_offensive_efficiency",
+     {"play_types": ["Spot Ups", "Transition"], "order_by": "PPP", "limit": 10}),
+    ("execute_team_shot_location_frequency", "execute_team_shot_location_frequency", {}),
+    ("execute_team_playtype_shot_frequency", "execute_team_playtype_shot_frequency", {}),
+    ("execute_player_offensive_efficiency", "execute_player_offensive_efficiency", {}),
+    ("execute_player_offensive_efficiency[filtered]", "execute_player_offensive_efficiency",
+     {"team_filter": "Rochester Institute of Technology Tigers", "order_by": "PPP", "limit": 25}),
+    ("execute_player_shot_location_efficiency", "execute_player_shot_location_efficiency", {}),
+    ("execute_player_shot_location_frequency", "execute_player_shot_location_frequency", {}),
+    ("execute_player_playtype_shot_frequency", "execute_player_playtype_shot_frequency", {}),
+    ("get_available_play_types", "get_available_play_types", {}),
+    ("get_available_teams", "get_available_teams", {}),
+    ("get_source_watermark", "get_source_watermark", {}),
+]
+
+# Endpoint paths ({gender} is substituted) and query parameters
+ENDPOINT_CASES = [
+    ("/api/stats/{gender}/teams/offensive-efficiency", {}),
+    ("/api/stats/{gender}/teams/offensive-efficiency",
+     {"play_types": "Spot Ups,Transition", "order_by": "PPP", "limit": 10}),
+    ("/api/stats/{gender}/players/offensive-efficiency", {}),
+    ("/api/stats/{gender}/players/offensive-efficiency",
+     {"team": "Rochester Institute of Technology Tigers", "order_by": "PPP", "page_size": 25}),
+    ("/api/stats/{gender}/players/shot-location-efficiency", {}),
+    ("/api/stats/{gender}/players/shot-location-frequency", {}),
+    ("/api/stats/{gender}/players/playtype-shot-frequency", {}),
+    ("/api/stream/{gender}/player-offensive-efficiency", {}),
+    ("/api/stats/{gender}/metadata/play-types", {}),
+    ("/api/stats/{gender}/metadata/teams", {}),
+    ("/api/stats/{gender}/bundle", {"datasets": "team"}),
+    ("/api/stats/{gender}/bundle", {"datasets": "player"}),
+]
+
+# A closed season and a current-season conference without any plays
+EMPTY_SEASON = "2000-2001"
+EMPTY_CONFERENCE = "No Plays Conference"
+
+# Requests against those ({gender} is substituted): each must answer 200 with
+# an empty page, ordering included, rather than rejecting the sort column
+EMPTY_CASES = [
+    ("/api/stats/{gender}/teams/offensive-efficiency",
+     {"conference": EMPTY_CONFERENCE, "order_by": "PPP", "limit": 5}),
+    ("/api/stats/{gender}/%s/teams/offensive-efficiency" % EMPTY_SEASON, {"order_by": "PPP", "limit": 5}),
+    ("/api/stats/{gender}/players/offensive-efficiency", {"conference": EMPTY_CONFERENCE}),
+    ("/api/stats/{gender}/players/offensive-efficiency",
+     {"conference": EMPTY_CONFERENCE, "order_by": "PPP", "include_percentiles": "false"}),
+    ("/api/stats/{gender}/%s/players/offensive-efficiency" % EMPTY_SEASON, {}),
+    ("/api/stats/{gender}/%s/players/offensive-efficiency" % EMPTY_SEASON, {"order_by": "PPP"}),
+    ("/api/stats/{gender}/%s/players/shot-location-frequency" % EMPTY_SEASON, {}),
+    ("/api/stats/{gender}/datasets/team-shot-location-frequency",
+     {"conference": EMPTY_CONFERENCE, "order_by": "TOTAL_SHOTS"}),
+    ("/api/stats/{gender}/%s/datasets/team-shot-location-frequency" % EMPTY_SEASON, {"order_by": "TOTAL_SHOTS"}),
+    ("/api/stats/{gender}/%s/datasets/team-playtype-shot-frequency" % EMPTY_SEASON, {}),
+]
+
+# Share of slowdown against the baseline reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+# ==================== EMBEDDED BACKEND ====================
+
+class SyntheticScan(SeasonScan):
+    """SeasonScan over in-memory synthetic plays instead of a database stream."""
+
+    def __init__(self, gender: str, plays: pd.DataFrame,
+                 season: Optional[str] = None, conference: Optional[str] = None):
+        super().__init__(gender, season=season, conference=conference)
+        self.plays = plays
+        # Materialized base results, as cached by QueryExecutor._get_base_frame
+        self.frames: Dict[str, ResultFrame] = {}
+
+    def current_plays(self) -> pd.DataFrame:
+        """The plays the query files select: the scan's season and conference."""
+        plays = self.plays
+        return plays[(plays["conference"] == self.conference) & (plays["year"] == self.season)]
+
+    def load_plays(self) -> pd.DataFrame:
+        return self.current_plays().reset_index(drop=True)
+
+
+class SyntheticExecutor(SinglePassExecutor):
+    """
+    SinglePassExecutor whose remaining database calls (filtered variants,
+    pages, streams and metadata) are answered from the synthetic plays too.
+
+    Executors share one scan per gender, as the scan refresh engine does;
+    reset() starts the next measurement from cold.
+    """
+
+    plays: Dict[str, pd.DataFrame] = {}
+    scans: Dict[Tuple[str, str, str], SyntheticScan] = {}
+
+    def __init__(self, gender: str = "mens", in_memory_filters: bool = True, scan: Optional[SeasonScan] = None,
+                 season: Optional[str] = None, conference: Optional[str] = None):
+        gender = gender.lower()
+        if scan is None:
+            scan = SyntheticScan(gender, self.plays[gender], season, conference)
+            scan = self.scans.setdefault((gender, scan.season, scan.conference), scan)
+        super().__init__(gender, scan)
+        # There is no database to fall back to
+        self.in_memory_filters = True
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop every computed dataset and materialized base result."""
+        cls.scans.clear()
+        invalidate_base_results()
+
+    def execute_dataset(self, dataset: str) -> List[Dict[str, Any]]:
+        get_dataset_registry().get(dataset)
+        # Templates the aggregation engine does not compute have no synthetic
+        # equivalent; they come back empty so refreshes still run end to end
+        return self.datasets().get(dataset, [])
+
+    def _get_base_frame(self, dataset: str) -> ResultFrame:
+        if dataset not in self.scan.frames:
+            rows = self.execute_dataset(dataset)
+            get_data_versions().observe((self.gender, self.season, self.conference, dataset), rows)
+            self.scan.frames[dataset] = ResultFrame(rows, key_columns=get_dataset_registry().get(dataset).key_columns)
+        return self.scan.frames[dataset]
+
+    def stream_dataset(self, dataset: str, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        rows = self._get_base_frame(dataset).rows
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    def get_available_play_types(self) -> List[str]:
+        plays = self.scan.current_plays()
+        play_types = plays["secondary_play"].where(plays["secondary_play"].notna(), plays["primary_play"])
+        return sorted(play_types.dropna().unique(), key=str.casefold)
+
+    def get_available_teams(self) -> List[str]:
+        plays = self.scan.current_plays()
+        return sorted(plays["primary_team"].dropna().unique(), key=str.casefold)
+
+    def get_source_watermark(self) -> Dict[str, Any]:
+        plays = self.scan.current_plays()
+        hashes = pd.util.hash_pandas_object(plays, index=False).to_numpy()
+        checksum = int(np.bitwise_xor.reduce(hashes)) if len(hashes) else 0
+        return {"row_count": len(plays), "checksum": checksum}
+
+
+@contextlib.contextmanager
+def embedded_backend() -> Iterator[None]:
+    """Route the API and refresh through SyntheticExecutor."""
+    with mock.patch.object(main, "QueryExecutor", SyntheticExecutor), \
+            mock.patch.object(fetch_and_cache, "QueryExecutor", SyntheticExecutor), \
+            mock.patch.object(fetch_and_cache, "executor_factory", lambda engine, stream=False: SyntheticExecutor):
+        yield
+
+
+# ==================== TIMING ====================
+
+def _row_count(result: Any) -> Optional[int]:
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict) and "row_count" in result:
+        return result["row_count"]
+    return None
+
+
+def time_call(func: Callable[[], Any], repeat: int, before: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """
+    Time ``func`` ``repeat`` times, calling ``before`` (untimed) ahead of each run.
+
+    Returns:
+        Dictionary with min/median/max seconds and the result's row count
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return {
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "max_s": round(max(times), 6),
+        "rows": _row_count(result),
+    }
+
+
+def time_execute(gender: str, make_executor: Callable[[str], QueryExecutor], repeat: int,
+                 reset: Callable[[], None]) -> Dict[str, Dict[str, Any]]:
+    """Time every EXECUTE_CASES call from cold (caches reset before each run)."""
+    results = {}
+    for name, method, kwargs in EXECUTE_CASES:
+        print(f"  ⏱️  {gender}/{name}")
+        results[f"{gender}/{name}"] = time_call(
+            lambda: getattr(make_executor(gender), method)(**kwargs), repeat, before=reset
+        )
+    return results
+
+
+async def _request(client: httpx.AsyncClient, path: str, params: Dict[str, Any]) -> Tuple[float, int]:
+    started = time.perf_counter()
+    response = await client.get(path, params=params)
+    elapsed = time.perf_counter() - started
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+    return elapsed, len(response.content)
+
+
+async def _time_endpoints(gender: str, repeat: int, reset: Callable[[], None]) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for template, params in ENDPOINT_CASES:
+            path = template.format(gender=gender)
+            name = path + ("?" + "&".join(f"{k}={v}" for k, v in params.items()) if params else "")
+            print(f"  🌐 {name}")
+            cold = []
+            for _ in range(repeat):
+                reset()
+                elapsed, size = await _request(client, path, params)
+                cold.append(elapsed)
+            # Same request again with result caches and base results warm
+            warm, _ = await _request(client, path, params)
+            results[name] = {
+                "min_s": round(min(cold), 6),
+                "median_s": round(statistics.median(cold), 6),
+                "max_s": round(max(cold), 6),
+                "warm_s": round(warm, 6),
+                "bytes": size,
+            }
+    return results
+
+
+def time_endpoints(gender: str, repeat: int, reset: Callable[[], None]) -> Dict[str, Dict[str, Any]]:
+    """Time every ENDPOINT_CASES request through the ASGI app, cold and warm."""
+    return asyncio.run(_time_endpoints(gender, repeat, reset))
+
+
+async def _check_empty(gender: str) -> int:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for template, params in EMPTY_CASES:
+            path = template.format(gender=gender)
+            response = await client.get(path, params=params)
+            body = response.json() if response.status_code == 200 else {}
+            if body.get("data") != [] or body.get("next_cursor") is not None:
+                raise RuntimeError(
+                    f"{path} {params} should be an empty page, got {response.status_code}: {response.text[:200]}"
+                )
+    return len(EMPTY_CASES)
+
+
+def check_empty(gender: str) -> int:
+    """
+    Check that every EMPTY_CASES request returns an empty page.
+
+    Returns:
+        Number of requests checked
+
+    Raises:
+        RuntimeError: If a request fails or returns rows
+    """
+    print(f"  🕳️  empty season checks")
+    return asyncio.run(_check_empty(gender))
+
+
+def time_refresh(engine: str, repeat: int, reset: Callable[[], None]) -> Dict[str, Any]:
+    """Time full forced fetch_and_cache refreshes into a throwaway output directory."""
+    print(f"  🔄 refresh (--engine {engine})")
+    with tempfile.TemporaryDirectory() as output_dir:
+        def refresh() -> None:
+            with mock.patch.object(fetch_and_cache, "OUTPUT_DIR", Path(output_dir)), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                fetch_and_cache.main(["--force", "--engine", engine, "--keep-snapshots", "1"])
+
+        result = time_call(refresh, repeat, before=reset)
+        manifest = json.loads((Path(output_dir) / "manifest.json").read_text())
+    result["rows"] = None
+    result["datasets"] = sum(1 for path in manifest.get("files", {}) if path.endswith(".json"))
+    return result
+
+
+# ==================== RUNS ====================
+
+def _plays_frame(rows: int, seed: int, season_count: int) -> pd.DataFrame:
+    return pd.concat(
+        [pd.DataFrame.from_records(batch, columns=COLUMNS)
+         for batch in generate_plays(rows, seed, season_count)],
+        ignore_index=True
+    )
+
+
+def _reset_caches() -> None:
+    main.result_cache.invalidate()
+    invalidate_base_results()
+
+
+def run_size(rows: int, backend: str, seed: int, season_count: int, repeat: int,
+             gender: str, databases: Dict[str, str], protected: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Generate (and load) one table size, then time everything against it."""
+    print(f"\n📦 {rows:,} plays per gender ({backend})")
+    run: Dict[str, Any] = {"rows": rows}
+    get_profiler().reset()
+
+    started = time.perf_counter()
+    if backend == "mysql":
+        for offset, g in enumerate(GENDERS):
+            load_into_mysql(databases[g], rows, seed + offset, season_count, protected=protected)
+        # Pooled connections may still point at the dropped databases
+        close_pools()
+        run["load_s"] = round(time.perf_counter() - started, 3)
+        reset = _reset_caches
+        make_executor: Callable[[str], QueryExecutor] = QueryExecutor
+        context = contextlib.nullcontext()
+    else:
+        SyntheticExecutor.plays = {
+            g: _plays_frame(rows, seed + offset, season_count) for offset, g in enumerate(GENDERS)
+        }
+        run["generate_s"] = round(time.perf_counter() - started, 3)
+
+        def reset() -> None:
+            _reset_caches()
+            SyntheticExecutor.reset()
+        make_executor = SyntheticExecutor
+        context = embedded_backend()
+
+    with context:
+        if backend == "mysql":
+            run["aggregate"] = {f"{gender}/scan": time_call(
+                lambda: SeasonScan(gender).datasets(), repeat, before=reset)}
+        else:
+            run["aggregate"] = {f"{gender}/scan": time_call(
+                lambda: SyntheticScan(gender, SyntheticExecutor.plays[gender]).datasets(), repeat)}
+        run["execute"] = time_execute(gender, make_executor, repeat, reset)
+        run["endpoints"] = time_endpoints(gender, repeat, reset)
+        run["empty_checks"] = check_empty(gender)
+        engines = ["sql", "scan"] if backend == "mysql" else ["scan"]
+        run["refresh"] = {engine: time_refresh(engine, repeat, reset) for engine in engines}
+
+    run["query_profile"] = get_profiler().summary()
+    return run
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _medians(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten results into {"rows/section/name": median seconds}."""
+    medians = {}
+    for run in results.get("runs", []):
+        for section in ("aggregate", "execute", "endpoints", "refresh"):
+            for name, timing in run.get(section, {}).items():
+                medians[f"{run['rows']}/{section}/{name}"] = timing["median_s"]
+    return medians
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Median timings that exist in both result sets, with the relative change.
+
+    Returns:
+        Rows sorted by change, largest slowdown first
+    """
+    current, previous = _medians(results), _medians(baseline)
+    rows = []
+    for key in current.keys() & previous.keys():
+        change = (current[key] - previous[key]) / previous[key] if previous[key] else 0.0
+        rows.append({
+            "key": key,
+            "baseline_s": previous[key],
+            "median_s": current[key],
+            "change": round(change, 4),
+            "regression": change > REGRESSION_THRESHOLD,
+        })
+    return sorted(rows, key=lambda r: r["change"], reverse=True)
+
+
+def run_benchmark(sizes: List[int], backend: str, seed: int = 0, season_count: int = 1,
+                  repeat: int = 3, gender: str = "mens", database_prefix: str = "ritbb_bench"
+                  ) -> Dict[str, Any]:
+    """
+    Run the whole suite for each table size.
+
+    Args:
+        sizes: Plays per gender for each run
+        backend: "mysql" or "embedded"
+        seed: Random seed for the synthetic plays
+        season_count: Seasons to spread plays over
+        repeat: Timed runs per measurement
+        gender: Gender whose executor methods and endpoints are timed
+        database_prefix: Benchmark databases are {prefix}_mens and {prefix}_womens
+
+    Returns:
+        Results dictionary (also the JSON written to disk)
+    """
+    databases = {g: f"{database_prefix}_{g}" for g in GENDERS}
+    # The real databases, which the loader refuses to drop
+    protected = (get_settings().mens_database, get_settings().womens_database)
+    if backend == "mysql":
+        # Point the app at the benchmark databases
+        os.environ["MENS"], os.environ["WOMENS"] = databases["mens"], databases["womens"]
+        reload_settings()
+
+    return {
+        "benchmark": "synthetic",
+        "started_at": datetime.now().isoformat(),
+        "backend": backend,
+        "seed": seed,
+        "seasons": season_count,
+        "repeat": repeat,
+        "gender": gender,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": [
+            run_size(rows, backend, seed, season_count, repeat, gender, databases, protected)
+            for rows in sizes
+        ],
+    }
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    for run in results["runs"]:
+        print(f"\n{run['rows']:,} plays per gender")
+        for section in ("aggregate", "execute", "endpoints", "refresh"):
+            for name, timing in run[section].items():
+                note = f"{timing['rows']:>7} rows" if timing.get("rows") is not None else ""
+                if "warm_s" in timing:
+                    note = f"{timing['warm_s']:>9.4f}s warm"
+                print(f"  {section:<9} {name[:70]:<70} {timing['median_s']:>9.4f}s {note}")
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    regressions = [r for r in rows if r["regression"]]
+    print(f"\nCompared {len(rows)} timings with the baseline: {len(regressions)} regression(s) "
+          f"over {REGRESSION_THRESHOLD:.0%}")
+    for r in rows:
+        marker = "▲" if r["regression"] else " "
+        print(f"  {marker} {r['key'][:80]:<80} {r['baseline_s']:>9.4f}s -> {r['median_s']:>9.4f}s "
+              f"({r['change']:+.1%})")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark queries, endpoints and the refresh on synthetic plays")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Plays per gender for each run (10k to 10M)")
+    parser.add_argument("--backend", choices=["mysql", "embedded"], default="embedded",
+                        help="mysql: load into benchmark databases on DB_HOST; embedded: in-memory, no server")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--seasons", type=int, default=1, help="Seasons to spread plays over")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument("--gender", choices=GENDERS, default="mens", help="Gender to time methods and endpoints for")
+    parser.add_argument("--database-prefix", default="ritbb_bench",
+                        help="mysql backend: databases {prefix}_mens / {prefix}_womens are dropped and recreated")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.backend, args.seed, args.seasons, args.repeat,
+                            args.gender, args.database_prefix)
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["comparison"] = compare(results, json.load(f))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+
+    print_summary(results)
+    if args.baseline:
+        print_comparison(results["comparison"])
+    print(f"\n📁 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
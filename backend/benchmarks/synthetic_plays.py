@@ -0,0 +1,326 @@
+"""
+Synthetic Play Generator
+Builds a reproducible plays_table_denorm_extra with realistic distributions
+of teams, players, play types, outcomes, shot levels and game clock
+
+Distributions are modelled on the published 2025-2026 Liberty League data:
+roughly three in four plays end in a shot, spot ups and transition make up
+half of all plays, three-point share depends on the play type and most two
+point attempts are at the rim. The same seed always produces the same rows.
+
+Usage (from backend/):
+    python -m benchmarks.synthetic_plays --rows 100000 --output plays.csv
+"""
+
+import argparse
+import csv
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pymysql
+
+from config import get_settings
+from seasons import CURRENT_SEASON, DEFAULT_CONFERENCE as CONFERENCE
+
+
+# Column order of every generated row
+COLUMNS = (
+    "conference", "year", "primary_team", "primary_player", "secondary_player",
+    "primary_play", "secondary_play", "outcome", "shot_level", "period", "start_time",
+)
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE plays_table_denorm_extra (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        conference VARCHAR(64),
+        year VARCHAR(9),
+        primary_team VARCHAR(128),
+        primary_player VARCHAR(128),
+        secondary_player VARCHAR(128),
+        primary_play VARCHAR(64),
+        secondary_play VARCHAR(64),
+        outcome VARCHAR(16),
+        shot_level TINYINT,
+        period VARCHAR(4),
+        start_time TIME
+    )
+"""
+
+LIBERTY_LEAGUE_TEAMS = [
+    "Bard College", "Clarkson University Golden Knights", "Hobart College Statesmen",
+    "Ithaca College", "Rensselaer Polytechnic", "Rochester Institute of Technology Tigers",
+    "Skidmore Thoroughbreds", "St. Lawrence Saints", "Union (NY) Chargers", "Vassar Brewers",
+]
+
+# Non-conference opponents, so the conference filter has rows to discard
+OTHER_CONFERENCES = {
+    "Empire 8": 8,
+    "SUNYAC": 8,
+    "UAA": 8,
+}
+
+# Share of plays involving a Liberty League team
+CONFERENCE_SHARE = 0.8
+
+# Effective play type (COALESCE(secondary_play, primary_play)) and its share of plays
+PLAY_TYPES = {
+    "Spot Ups": 0.298, "Transition": 0.195, "Cuts": 0.098, "PNR": 0.097,
+    "Misc": 0.078, None: 0.050, "Post": 0.049, "Off Screens": 0.038,
+    "Hand Offs": 0.038, "Iso": 0.035, "P&R Roll Man": 0.024,
+}
+
+# Share of shots from three by play type
+THREE_SHARE = {
+    "Spot Ups": 0.65, "Transition": 0.30, "Cuts": 0.02, "PNR": 0.35, "Misc": 0.20,
+    None: 0.30, "Post": 0.03, "Off Screens": 0.55, "Hand Offs": 0.45, "Iso": 0.30,
+    "P&R Roll Man": 0.10,
+}
+
+SHOT_SHARE = 0.73             # plays ending in a field goal attempt
+SECONDARY_PLAY_SHARE = 0.35   # plays tagged with a more specific secondary play
+SECONDARY_PLAYER_SHARE = 0.15 # plays finished by a second player (e.g. roll man)
+
+# Two-point shot levels (1 = rim, 2 = close, 3 = mid-range) and make rates; 4 = three
+TWO_POINT_LEVELS = [1, 2, 3]
+TWO_POINT_LEVEL_SHARE = [0.72, 0.15, 0.13]
+MAKE_RATE = {1: 0.55, 2: 0.42, 3: 0.38, 4: 0.33}
+
+# Non-shot outcomes and their share of non-shot plays
+OTHER_OUTCOMES = ["Turnover", "Foul", "And1"]
+OTHER_OUTCOME_SHARE = [0.55, 0.30, 0.15]
+AND1_LEVELS = [1, 2, 3, 4]
+AND1_LEVEL_SHARE = [0.60, 0.15, 0.10, 0.15]
+
+PERIODS = ["H1", "H2", "OT1", "OT2"]
+PERIOD_SHARE = [0.485, 0.500, 0.012, 0.003]
+
+ROSTER_SIZE = 15
+
+# Plays drawn from the random generator at a time
+GENERATION_CHUNK = 50_000
+
+FIRST_NAMES = [
+    "Aiden", "Braeden", "Caleb", "Dante", "Elijah", "Finn", "Gavin", "Hunter", "Isaac", "Jalen",
+    "Kellan", "Liam", "Marcus", "Nolan", "Owen", "Parker", "Quinn", "Reid", "Silas", "Tyler",
+    "Ava", "Brooke", "Chloe", "Delaney", "Emma", "Faith", "Grace", "Hailey", "Isla", "Jordan",
+    "Kayla", "Lauren", "Maya", "Nora", "Olivia", "Paige", "Riley", "Sydney", "Taylor", "Zoe",
+]
+LAST_NAMES = [
+    "Adams", "Bennett", "Burns", "Carter", "Collins", "Davis", "Edwards", "Foster", "Garcia", "Hayes",
+    "Hughes", "Jenkins", "Kelly", "Lewis", "Martin", "Mitchell", "Morgan", "Murphy", "Nelson", "Owens",
+    "Parker", "Perry", "Price", "Reed", "Rivera", "Roberts", "Russell", "Sanders", "Scott", "Stewart",
+    "Sullivan", "Taylor", "Thompson", "Turner", "Walker", "Ward", "Watson", "White", "Wood", "Young",
+]
+
+
+def seasons(count: int) -> List[str]:
+    """The ``count`` most recent seasons, ending with the current one."""
+    start = int(CURRENT_SEASON[:4])
+    return [f"{year}-{year + 1}" for year in range(start - count + 1, start + 1)]
+
+
+def _league(rng: np.random.Generator) -> Tuple[List[str], List[str], np.ndarray, np.ndarray]:
+    """Teams, their conferences, team weights and a (team x roster) name table."""
+    teams = list(LIBERTY_LEAGUE_TEAMS)
+    conferences = [CONFERENCE] * len(teams)
+    for conference, count in OTHER_CONFERENCES.items():
+        teams += [f"{conference} College {i + 1}" for i in range(count)]
+        conferences += [conference] * count
+
+    others = len(teams) - len(LIBERTY_LEAGUE_TEAMS)
+    weights = np.array(
+        [CONFERENCE_SHARE / len(LIBERTY_LEAGUE_TEAMS)] * len(LIBERTY_LEAGUE_TEAMS)
+        + [(1 - CONFERENCE_SHARE) / others] * others
+    )
+
+    # Unique names across the league, so a player never appears on two teams
+    picks = rng.choice(len(FIRST_NAMES) * len(LAST_NAMES), size=len(teams) * ROSTER_SIZE, replace=False)
+    names = np.array(
+        [f"{FIRST_NAMES[p // len(LAST_NAMES)]} {LAST_NAMES[p % len(LAST_NAMES)]}" for p in picks],
+        dtype=object
+    ).reshape(len(teams), ROSTER_SIZE)
+    return teams, conferences, weights, names
+
+
+def generate_plays(
+    rows: int,
+    seed: int = 0,
+    season_count: int = 1,
+    batch_size: int = 100_000
+) -> Iterator[List[Tuple]]:
+    """
+    Generate synthetic plays in batches.
+
+    Args:
+        rows: Total number of plays
+        seed: Random seed (same seed, same rows)
+        season_count: Seasons to spread plays over (1 = every play is in the current season)
+        batch_size: Plays per yielded batch
+
+    Yields:
+        Lists of row tuples in COLUMNS order
+    """
+    rng = np.random.default_rng(seed)
+    teams, conferences, team_weights, names = _league(rng)
+    team_names = np.array(teams, dtype=object)
+    team_conferences = np.array(conferences, dtype=object)
+    years = np.array(seasons(season_count), dtype=object)
+
+    play_types = list(PLAY_TYPES)
+    play_type_names = np.array(play_types, dtype=object)
+    play_type_share = np.array(list(PLAY_TYPES.values()))
+    play_type_share /= play_type_share.sum()
+    three_share = np.array([THREE_SHARE[p] for p in play_types])
+    # Specific play types a secondary_play can refine (never the untagged None)
+    is_tagged = np.array([p is not None for p in play_types])
+    tagged = np.flatnonzero(is_tagged)
+
+    # Skewed usage: the top of the roster takes most of the plays
+    usage = 1.0 / np.arange(1, ROSTER_SIZE + 1) ** 0.9
+    usage /= usage.sum()
+    make_rate = np.array([0.0] + [MAKE_RATE[level] for level in (1, 2, 3, 4)])
+
+    pending: List[Tuple] = []
+    remaining = rows
+    while remaining > 0:
+        # Rows are drawn in fixed-size chunks so the batch size never changes them
+        n = min(GENERATION_CHUNK, remaining)
+        remaining -= n
+
+        team = rng.choice(len(teams), size=n, p=team_weights)
+        player = names[team, rng.choice(ROSTER_SIZE, size=n, p=usage)]
+        finisher = names[team, rng.choice(ROSTER_SIZE, size=n, p=usage)]
+        secondary_player = np.where(rng.random(n) < SECONDARY_PLAYER_SHARE, finisher, None)
+
+        play_type = rng.choice(len(play_types), size=n, p=play_type_share)
+        refined = (rng.random(n) < SECONDARY_PLAY_SHARE) & is_tagged[play_type]
+        generic = tagged[rng.integers(0, len(tagged), size=n)]
+        primary_play = np.where(refined, play_type_names[generic], play_type_names[play_type])
+        secondary_play = np.where(refined, play_type_names[play_type], None)
+
+        # Outcomes: shots (level picked by play type) or turnovers, fouls and and-ones
+        is_shot = rng.random(n) < SHOT_SHARE
+        is_three = rng.random(n) < three_share[play_type]
+        two_level = rng.choice(TWO_POINT_LEVELS, size=n, p=TWO_POINT_LEVEL_SHARE)
+        level = np.where(is_three, 4, two_level)
+        made = rng.random(n) < make_rate[level]
+        shot_outcome = np.where(is_three, np.where(made, "3pMa", "3pmi"), np.where(made, "2pMa", "2pmi"))
+        other_outcome = rng.choice(OTHER_OUTCOMES, size=n, p=OTHER_OUTCOME_SHARE)
+        and1_level = rng.choice(AND1_LEVELS, size=n, p=AND1_LEVEL_SHARE)
+        outcome = np.where(is_shot, shot_outcome, other_outcome).astype(object)
+        shot_level = np.where(
+            is_shot, level.astype(object),
+            np.where(other_outcome == "And1", and1_level.astype(object), None)
+        )
+
+        # The clock counts down from 20:00 each half; MINUTES:SECONDS is stored
+        # in a TIME column's hour and minute fields, as in the source data
+        clock = rng.integers(0, 20 * 60, size=n)
+        start_time = np.array([f"{c // 60:02d}:{c % 60:02d}:00" for c in clock.tolist()], dtype=object)
+        period = rng.choice(PERIODS, size=n, p=PERIOD_SHARE).astype(object)
+        year = years[rng.integers(0, len(years), size=n)]
+
+        columns = (
+            team_conferences[team], year, team_names[team], player, secondary_player,
+            primary_play, secondary_play, outcome, shot_level, period, start_time,
+        )
+        pending.extend(zip(*(column.tolist() for column in columns)))
+        while len(pending) >= batch_size or (pending and remaining == 0):
+            yield pending[:batch_size]
+            pending = pending[batch_size:]
+
+
+def load_into_mysql(
+    database: str,
+    rows: int,
+    seed: int = 0,
+    season_count: int = 1,
+    batch_size: int = 20_000,
+    protected: Sequence[Optional[str]] = ()
+) -> int:
+    """
+    (Re)create ``database`` with a synthetic plays_table_denorm_extra.
+
+    Connects with the DB_HOST / PORT / DB_USERNAME / DB_PASSWORD settings
+    used by sql_connector. The database is dropped first, so it must never
+    be one of the real databases.
+
+    Args:
+        database: Benchmark database to create
+        rows: Number of plays to insert
+        seed: Random seed
+        season_count: Seasons to spread plays over
+        batch_size: Rows per INSERT round trip
+        protected: Database names that must not be overwritten
+
+    Returns:
+        Number of rows inserted
+
+    Raises:
+        ValueError: If database is a protected name
+    """
+    if database in protected:
+        raise ValueError(f"Refusing to overwrite {database}: use a dedicated benchmark database")
+
+    settings = get_settings()
+    conn = pymysql.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        user=settings.db_username,
+        password=settings.db_password,
+        autocommit=False,
+    )
+    inserted = 0
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+            cursor.execute(f"CREATE DATABASE `{database}`")
+            cursor.execute(f"USE `{database}`")
+            cursor.execute(CREATE_TABLE_SQL)
+            insert = (
+                f"INSERT INTO plays_table_denorm_extra ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join(['%s'] * len(COLUMNS))})"
+            )
+            for batch in generate_plays(rows, seed, season_count, batch_size):
+                # pymysql folds executemany into multi-row INSERT statements
+                cursor.executemany(insert, batch)
+                inserted += len(batch)
+            conn.commit()
+    finally:
+        conn.close()
+    return inserted
+
+
+def write_csv(path: str, rows: int, seed: int = 0, season_count: int = 1) -> int:
+    """Write synthetic plays to a CSV file with a header row (empty field = NULL)."""
+    written = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for batch in generate_plays(rows, seed, season_count):
+            writer.writerows(batch)
+            written += len(batch)
+    return written
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Generate synthetic plays_table_denorm_extra rows")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of plays")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--seasons", type=int, default=1, help="Seasons to spread plays over")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", help="Write a CSV file")
+    target.add_argument("--database", help="(Re)create this MySQL database and load the plays into it")
+    args = parser.parse_args()
+
+    if args.output:
+        written = write_csv(args.output, args.rows, args.seed, args.seasons)
+        print(f"Wrote {written:,} plays to {args.output}")
+    else:
+        protected = (get_settings().mens_database, get_settings().womens_database)
+        inserted = load_into_mysql(args.database, args.rows, args.seed, args.seasons, protected=protected)
+        print(f"Loaded {inserted:,} plays into {args.database}")
+
+
+if __name__ == "__main__":
+    main_cli()
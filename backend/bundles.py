@@ -0,0 +1,133 @@
+"""
+Dataset Bundles for RIT Basketball Statistics
+Several datasets delivered in one response or one static file
+
+The leaderboard pages each need five or six datasets on load. A bundle
+carries them together, keyed by dataset name, so a page makes one request
+(and one compressed transfer) instead of one per dataset. The API resolves
+bundles on demand; fetch_and_cache.py also writes the page bundles as
+static files next to the individual datasets.
+"""
+
+import gzip
+from typing import Dict, List, Optional
+
+from dataset_registry import get_dataset_registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Metadata lists that can be bundled alongside the registry's datasets
+METADATA_DATASETS = ["play-types", "teams"]
+
+# Named bundles: everything a leaderboard page loads
+BUNDLES = {
+    "team": [
+        "team-offensive-efficiency",
+        "team-shot-location-frequency",
+        "team-playtype-shot-frequency",
+        "play-types",
+        "teams",
+    ],
+    "player": [
+        "player-offensive-efficiency",
+        "player-shot-location-efficiency",
+        "player-shot-location-frequency",
+        "player-playtype-shot-frequency",
+        "play-types",
+        "teams",
+    ],
+}
+
+# Content codings in order of preference (br only when brotli is installed)
+ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def parse_datasets(value: str) -> List[str]:
+    """
+    Resolve a comma-separated list of dataset and bundle names.
+
+    Bundle names (team, player) expand to their datasets; duplicates are
+    dropped, keeping the first occurrence.
+
+    Returns:
+        Dataset names in request order
+
+    Raises:
+        ValueError: If the list is empty or names an unknown dataset
+    """
+    datasets: List[str] = []
+    for name in (part.strip() for part in value.split(",")):
+        if not name:
+            continue
+        if name in BUNDLES:
+            expanded = BUNDLES[name]
+        elif name in METADATA_DATASETS or name in get_dataset_registry():
+            expanded = [name]
+        else:
+            raise ValueError(f"Unknown dataset: {name}")
+        datasets.extend(dataset for dataset in expanded if dataset not in datasets)
+    if not datasets:
+        raise ValueError("datasets must name at least one dataset")
+    return datasets
+
+
+def bundle_filename(bundle: str) -> str:
+    """Name of a static bundle file (team -> bundle-team.json); src/data/staticStats.js uses the same naming."""
+    return f"bundle-{bundle}.json"
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the preferred supported content coding from an Accept-Encoding header.
+
+    Returns:
+        'br', 'gzip', or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str], static: bool = False) -> bytes:
+    """
+    Compress a body with a content coding.
+
+    Args:
+        encoding: 'br', 'gzip', or None (body returned unchanged)
+        static: Compress for a file written once and served many times
+                (maximum level) rather than for a response built per request
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if static else 5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9 if static else 6, mtime=0)
+    return body
+
+
+def compress_all(body: bytes) -> Dict[str, bytes]:
+    """Precompressed variants of a static body, keyed by content coding."""
+    return {encoding: compress(body, encoding, static=True) for encoding in ENCODINGS}
+
+
+def encoding_suffix(encoding: str) -> str:
+    """File suffix of a precompressed sibling (gzip -> .gz, br -> .br)."""
+    return ".gz" if encoding == "gzip" else f".{encoding}"
+
@@ -0,0 +1,195 @@
+"""
+Background Cache Refresh for RIT Basketball Statistics
+Stale-while-revalidate refresh of cached results and cache warm-up at startup
+
+A cached entry in the last CACHE_REFRESH_AHEAD seconds of its TTL is still
+served while a background task recomputes it, so a busy dataset's expiry
+never lands on a request. At startup the API warms the datasets pages load
+first the same way. Refreshes run on their own small thread pool and never
+take a worker from request handling.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from config import get_settings
+
+
+def _describe(key: Hashable) -> str:
+    """Readable form of a cache key (tuples joined with '/')."""
+    if isinstance(key, tuple):
+        return "/".join(str(part) for part in key)
+    return str(key)
+
+
+class BackgroundRefresher:
+    """
+    Runs cache refreshes off the request path and records how they went.
+
+    A key is refreshed at most once at a time; after a failure it is not
+    retried for ``retry_interval`` seconds, so a database outage does not turn
+    every cache hit into another failing query. The entry keeps being served
+    until its TTL runs out.
+    """
+
+    def __init__(self, workers: int = 2, retry_interval: float = 30):
+        """
+        Initialize the refresher.
+
+        Args:
+            workers: Refreshes run concurrently
+            retry_interval: Seconds before a failed key may be refreshed again
+        """
+        self.workers = max(1, workers)
+        self.retry_interval = retry_interval
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._in_flight: set = set()
+        self._failed_at: Dict[Hashable, float] = {}
+        self._stats = {"scheduled": 0, "completed": 0, "failed": 0, "skipped": 0}
+        self._last_completed: Optional[Dict[str, Any]] = None
+        self._recent_failures: deque = deque(maxlen=10)
+        self._warm_up: Dict[str, Any] = {"status": "not started"}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """The refresh thread pool, started on first use (call with the lock held)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="refresh")
+        return self._executor
+
+    def schedule(self, key: Hashable, refresh: Callable[[], Any]) -> bool:
+        """
+        Run ``refresh`` in the background unless ``key`` is already being
+        refreshed or failed within the retry interval.
+
+        Returns:
+            True if the refresh was scheduled
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            failed_at = self._failed_at.get(key)
+            if key in self._in_flight or (failed_at and time.monotonic() - failed_at < self.retry_interval):
+                self._stats["skipped"] += 1
+                return False
+            self._in_flight.add(key)
+            self._stats["scheduled"] += 1
+            self._pool().submit(self._run, key, refresh)
+        return True
+
+    def _run(self, key: Hashable, refresh: Callable[[], Any]) -> bool:
+        started = time.perf_counter()
+        try:
+            refresh()
+        except Exception as e:
+            print(f"⚠️  Background refresh of {_describe(key)} failed: {e}")
+            with self._lock:
+                self._stats["failed"] += 1
+                self._failed_at[key] = time.monotonic()
+                self._recent_failures.append({
+                    "key": _describe(key),
+                    "error": str(e),
+                    "at": datetime.now().isoformat(),
+                })
+            return False
+        else:
+            with self._lock:
+                self._stats["completed"] += 1
+                self._failed_at.pop(key, None)
+                self._last_completed = {
+                    "key": _describe(key),
+                    "at": datetime.now().isoformat(),
+                    "seconds": round(time.perf_counter() - started, 4),
+                }
+            return True
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def warm_up(self, tasks: List[Tuple[Hashable, Callable[[], Any]]]) -> None:
+        """
+        Fill caches in the background, e.g. at startup before the first request.
+
+        Each task is run like a refresh; progress is reported under ``warm_up``
+        in stats().
+        """
+        with self._lock:
+            self._warm_up = {
+                "status": "running",
+                "started_at": datetime.now().isoformat(),
+                "tasks": len(tasks),
+                "warmed": 0,
+                "failed": 0,
+                "seconds": None,
+            }
+            self._stats["scheduled"] += len(tasks)
+        started = time.perf_counter()
+
+        def run(key: Hashable, task: Callable[[], Any]) -> None:
+            ok = self._run(key, task)
+            with self._lock:
+                self._warm_up["warmed" if ok else "failed"] += 1
+                if self._warm_up["warmed"] + self._warm_up["failed"] == len(tasks):
+                    self._warm_up["status"] = "done"
+                    self._warm_up["seconds"] = round(time.perf_counter() - started, 4)
+
+        if not tasks:
+            with self._lock:
+                self._warm_up.update(status="done", seconds=0.0)
+            return
+        with self._lock:
+            if self._closed:
+                self._warm_up["status"] = "cancelled"
+                return
+            for key, task in tasks:
+                self._pool().submit(run, key, task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, keys in flight, the last refresh and recent failures."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "workers": self.workers,
+                "retry_interval": self.retry_interval,
+                "in_flight": sorted(_describe(key) for key in self._in_flight),
+                "last_completed": self._last_completed,
+                "recent_failures": list(self._recent_failures),
+                "warm_up": dict(self._warm_up),
+            })
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the refresh threads, dropping refreshes that have not started."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_refresher: Optional[BackgroundRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher() -> BackgroundRefresher:
+    """Get the process-wide background refresher."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            settings = get_settings()
+            _refresher = BackgroundRefresher(settings.cache_refresh_workers, settings.cache_refresh_retry)
+        return _refresher
+
+
+def shutdown_refresher() -> None:
+    """Stop background refreshes (e.g. on application shutdown); the next get_refresher() starts afresh."""
+    global _refresher
+    with _refresher_lock:
+        refresher, _refresher = _refresher, None
+    if refresher is not None:
+        refresher.shutdown()
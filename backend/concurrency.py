@@ -0,0 +1,241 @@
+"""
+Concurrency Helpers for RIT Basketball Statistics
+Runs blocking database work off the asyncio event loop
+
+Each HTTP request also gets a CancelScope: queries register with it while
+they run, and CancelOnDisconnect cancels it when the client goes away before
+its response was sent, which stops the request's in-flight query on the server.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from config import get_settings
+from single_flight import CallCancelled
+
+
+_DONE = object()
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool used for blocking database calls.
+
+    Sized by DB_EXECUTOR_WORKERS, defaulting to one worker per pooled
+    connection across both databases so threads never queue on the pool.
+    """
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(
+                max_workers=get_settings().db_executor_workers,
+                thread_name_prefix="db"
+            )
+        return _db_executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the database thread pool and await its result.
+
+    Args:
+        func: Blocking callable (e.g. a QueryExecutor method)
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    # Run in a copy of the caller's context so the request's cancel scope is seen
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_db_executor(), functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+async def iterate_blocking(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator (e.g. a server-side cursor stream) from async code.
+    
+    Each item is fetched in the database thread pool. If the consumer stops
+    early (e.g. the client disconnected), the iterator is closed in the pool
+    as well, once any fetch still in flight has finished.
+    
+    Args:
+        iterator: Blocking iterator or generator
+        
+    Yields:
+        The iterator's items
+    """
+    lock = threading.Lock()
+    
+    def step() -> Any:
+        with lock:
+            return next(iterator, _DONE)
+    
+    def close() -> None:
+        with lock:
+            if hasattr(iterator, "close"):
+                iterator.close()
+    
+    finished = False
+    try:
+        while True:
+            item = await run_blocking(step)
+            if item is _DONE:
+                finished = True
+                return
+            yield item
+    finally:
+        if not finished:
+            # Not awaited: this may run while the request is being cancelled
+            get_db_executor().submit(close)
+
+
+def shutdown_db_executor() -> None:
+    """Stop the database thread pool, waiting for running calls to finish."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is not None:
+            _db_executor.shutdown(wait=True)
+            _db_executor = None
+
+
+# ==================== CANCELLATION ====================
+
+class QueryCancelledError(CallCancelled):
+    """Raised when a query is stopped because the request it ran for was cancelled."""
+
+
+class CancelScope:
+    """
+    Cancellation of the database work done for one request.
+
+    A query registers how to stop itself (e.g. KILL QUERY) for as long as it
+    runs; cancel() stops every running query and makes later ones fail fast.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._running: Dict[int, Callable[[], None]] = {}
+        # Stops in progress, by token: set when the stop has finished
+        self._stopping: Dict[int, threading.Event] = {}
+        self._next_token = 0
+
+    def check(self) -> None:
+        """Raise QueryCancelledError if the scope was cancelled."""
+        if self.cancelled:
+            raise QueryCancelledError("Request was cancelled")
+
+    @contextmanager
+    def running(self, stop: Callable[[], None]):
+        """
+        Register ``stop`` for the duration of the block.
+
+        Leaving the block waits for this query's stop() if it is in progress,
+        so a connection is never handed to another request while it is being
+        killed.
+        """
+        with self._lock:
+            self.check()
+            token = self._next_token
+            self._next_token += 1
+            self._running[token] = stop
+        try:
+            yield
+        finally:
+            with self._lock:
+                del self._running[token]
+                stopping = self._stopping.get(token)
+            if stopping is not None:
+                stopping.wait()
+
+    def cancel(self) -> int:
+        """
+        Cancel the scope, stopping every registered query (blocking).
+
+        Returns:
+            Number of queries that were stopped
+        """
+        with self._lock:
+            if self.cancelled:
+                return 0
+            self.cancelled = True
+            stops = list(self._running.items())
+            for token, _ in stops:
+                self._stopping[token] = threading.Event()
+
+        # Outside the lock: each stop is a blocking KILL over a new connection
+        for token, stop in stops:
+            try:
+                stop()
+            except Exception as e:
+                print(f"⚠️  Could not stop a cancelled query: {e}")
+            finally:
+                self._stopping[token].set()
+        return len(stops)
+
+
+_cancel_scope: contextvars.ContextVar[Optional[CancelScope]] = contextvars.ContextVar(
+    "cancel_scope", default=None
+)
+
+
+def current_cancel_scope() -> Optional[CancelScope]:
+    """The cancel scope of the request being served, if any."""
+    return _cancel_scope.get()
+
+
+class CancelOnDisconnect:
+    """
+    ASGI middleware giving each HTTP request a CancelScope, cancelled when
+    the client disconnects before the response has been sent in full.
+
+    The request's receive channel is read by one watcher task that passes
+    messages on to the app, so a disconnect is noticed while the app is busy.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cancel_scope = CancelScope()
+        messages: asyncio.Queue = asyncio.Queue()
+        response_sent = False
+
+        async def watch() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    if not response_sent:
+                        # KILL QUERY needs its own connection: keep it off the loop
+                        asyncio.get_running_loop().run_in_executor(None, cancel_scope.cancel)
+                    return
+
+        async def send_watched(message) -> None:
+            nonlocal response_sent
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_sent = True
+            await send(message)
+
+        token = _cancel_scope.set(cancel_scope)
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await self.app(scope, messages.get, send_watched)
+        finally:
+            watcher.cancel()
+            _cancel_scope.reset(token)
@@ -0,0 +1,147 @@
+"""
+Configuration for RIT Basketball Statistics
+Settings read from the environment (and .env) once per process
+
+.env is loaded the first time any setting is needed, never again per request
+or per database connection. Modules read their settings from get_settings()
+instead of calling os.getenv themselves, so every setting is parsed in one
+place and a cold start pays for one .env read.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """Load .env into the environment, once per process (variables already set win)."""
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
+
+
+def _bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+class Settings:
+    """
+    Every setting the API and its shared modules read from the environment.
+
+    See env_template.txt for the variables and their defaults.
+    """
+
+    def __init__(self):
+        load_env()
+
+        # Database
+        self.db_host = os.getenv("DB_HOST")
+        self.db_username = os.getenv("DB_USERNAME")
+        self.db_password = os.getenv("DB_PASSWORD")
+        self.db_port = int(os.getenv("PORT", 25060))
+        self.db_connect_timeout = int(os.getenv("DB_CONNECT_TIMEOUT", 10))
+        self.mens_database = os.getenv("MENS", "RITMensBasketball")
+        self.womens_database = os.getenv("WOMENS", "RITWomensBasketball")
+
+        # Connection pool (per database) and the thread pool in front of it.
+        # The pool size is each database's concurrent query limit; requests
+        # beyond it wait in a queue of at most DB_POOL_MAX_WAITING
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+        self.db_pool_size_mens = int(os.getenv("DB_POOL_SIZE_MENS", self.db_pool_size))
+        self.db_pool_size_womens = int(os.getenv("DB_POOL_SIZE_WOMENS", self.db_pool_size))
+        self.db_pool_max_waiting = int(os.getenv("DB_POOL_MAX_WAITING", 10))
+        self.db_pool_max_lifetime = float(os.getenv("DB_POOL_MAX_LIFETIME", 1800))
+        self.db_pool_idle_timeout = float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300))
+        self.db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", 10))
+        self.db_pool_ping_interval = float(os.getenv("DB_POOL_PING_INTERVAL", 30))
+        # Server-side prepared statements cost extra round trips per query
+        # (PREPARE on a miss, SET and EXECUTE): opt in with a cache size
+        self.db_statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 0))
+        # Server-side time limit for SELECTs (MySQL max_execution_time), 0 = none
+        self.db_max_execution_time = float(os.getenv("DB_MAX_EXECUTION_TIME", 30))
+        # By default one worker per pooled connection and queue place across
+        # both databases, so the wait queues (not the thread pool) fill up first
+        self.db_executor_workers = int(os.getenv(
+            "DB_EXECUTOR_WORKERS",
+            self.db_pool_size_mens + self.db_pool_size_womens + self.db_pool_max_waiting * 2
+        ))
+
+        # API
+        self.api_host = os.getenv("API_HOST", "0.0.0.0")
+        self.api_port = int(os.getenv("API_PORT", 8000))
+        self.debug = _bool("DEBUG", "True")
+        self.admin_token = os.getenv("ADMIN_TOKEN")
+        self.http_max_age = int(os.getenv("HTTP_MAX_AGE", 60))
+
+        # Caching and streaming
+        self.result_cache_size = int(os.getenv("RESULT_CACHE_SIZE", 256))
+        self.result_cache_ttl = float(os.getenv("RESULT_CACHE_TTL", 300))
+        self.in_memory_filters = _bool("IN_MEMORY_FILTERS", "True")
+        self.base_result_ttl = float(os.getenv("BASE_RESULT_TTL", 300))
+        self.stream_batch_size = int(os.getenv("STREAM_BATCH_SIZE", 1000))
+
+        # Background refresh (stale-while-revalidate) and startup warm-up
+        self.cache_refresh_ahead = float(os.getenv("CACHE_REFRESH_AHEAD", 60))
+        self.cache_refresh_workers = int(os.getenv("CACHE_REFRESH_WORKERS", 2))
+        self.cache_refresh_retry = float(os.getenv("CACHE_REFRESH_RETRY", 30))
+        self.cache_warm_up = _bool("CACHE_WARM_UP", "True")
+
+        # Query profiling
+        self.query_profiling = _bool("QUERY_PROFILING", "True")
+        self.query_profile_history = int(os.getenv("QUERY_PROFILE_HISTORY", 200))
+        self.query_explain = _bool("QUERY_EXPLAIN", "False")
+        self.query_explain_threshold = float(os.getenv("QUERY_EXPLAIN_THRESHOLD", 1.0))
+
+        # Seasons
+        self.current_season = os.getenv("CURRENT_SEASON", "2025-2026")
+        self.conference = os.getenv("CONFERENCE", "Liberty League")
+        self.season_archive_dir = Path(os.getenv(
+            "SEASON_ARCHIVE_DIR",
+            Path(__file__).resolve().parent.parent / "public" / "data" / "stats" / "seasons"
+        ))
+
+    def database(self, gender: str) -> str:
+        """Database name for 'mens' or 'womens'."""
+        return self.womens_database if gender == "womens" else self.mens_database
+
+    def pool_size(self, database: str) -> int:
+        """Connection pool size (concurrent query limit) for a database."""
+        if database == self.womens_database:
+            return self.db_pool_size_womens
+        if database == self.mens_database:
+            return self.db_pool_size_mens
+        return self.db_pool_size
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Get the process-wide settings, reading the environment on first use."""
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings()
+        return _settings
+
+
+def reload_settings() -> Settings:
+    """
+    Re-read settings from the environment (e.g. after a script points the app
+    at other databases). Values modules copied at import time keep their old values.
+    """
+    global _settings
+    settings = Settings()
+    with _settings_lock:
+        _settings = settings
+    return settings
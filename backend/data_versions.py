@@ -0,0 +1,77 @@
+"""
+Data Versions for RIT Basketball Statistics
+Content versions of materialized results, for conditional (304) API responses
+
+A result's version is a hash of its rows, recorded when the result is
+computed, together with the time its content last changed. Re-materializing
+identical rows keeps both, so ETags and Last-Modified dates stay stable until
+the data really moves.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from serialization import dumps
+
+
+class DataVersion:
+    """Content hash of a result and the time that content was first seen."""
+
+    __slots__ = ("token", "last_modified")
+
+    def __init__(self, token: str, last_modified: Optional[float] = None):
+        self.token = token
+        self.last_modified = last_modified
+
+    @classmethod
+    def of(cls, content: Any) -> "DataVersion":
+        """Version of a result that is not tracked in the registry (no known modification time)."""
+        return cls(content_hash(content))
+
+
+def content_hash(content: Any) -> str:
+    """Stable hash of a JSON-like result, over its compact JSON encoding."""
+    return hashlib.blake2b(dumps(content), digest_size=16).hexdigest()
+
+
+class VersionRegistry:
+    """Thread-safe map of result key -> DataVersion."""
+
+    def __init__(self):
+        self._versions: Dict[Hashable, DataVersion] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: Hashable, content: Any) -> DataVersion:
+        """
+        Record freshly computed content for a key.
+
+        Returns:
+            The key's version; last_modified only moves when the hash changes
+        """
+        token = content_hash(content)
+        with self._lock:
+            version = self._versions.get(key)
+            if version is None or version.token != token:
+                version = DataVersion(token, time.time())
+                self._versions[key] = version
+            return version
+
+    def get(self, key: Hashable) -> Optional[DataVersion]:
+        """The last recorded version of a key, if any."""
+        with self._lock:
+            return self._versions.get(key)
+
+
+_registry: Optional[VersionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_data_versions() -> VersionRegistry:
+    """Get the process-wide data version registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = VersionRegistry()
+        return _registry
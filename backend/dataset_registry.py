@@ -0,0 +1,173 @@
+"""
+Dataset Registry for RIT Basketball Statistics
+Every .sql template under queries/{gender}/{category} exposed as a named dataset
+
+A template's dataset is its CTE followed by SELECT * FROM its final CTE table,
+ordered by the file's own ORDER BY. Templates are discovered from disk, so a
+new query file becomes an API dataset and a refresh task without new code.
+DATASET_OVERRIDES only renames templates and names their row identity;
+DATASET_VARIANTS adds datasets with their own final SELECT over a template.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from query_templates import QUERIES_ROOT, SQLTemplate
+
+
+# Per template ("category/filename"): a dataset name other than the file
+# name's slug, and the columns that identify one row (keyset pagination
+# tie-breakers, also used by the template's variants). Templates not listed
+# here are still discovered and paginate by row position among ties.
+DATASET_OVERRIDES = {
+    "team/Team-OffensiveEfficiency.sql": {
+        "key_columns": ["PLAY_TYPE", "TEAM"]},
+    "team/Team-ShotLocation-FreqDist.sql": {
+        "name": "team-shot-location-frequency", "key_columns": ["TEAM"]},
+    "team/Team-PlayType-ShotLocation-FreqDist.sql": {
+        "name": "team-playtype-shot-frequency", "key_columns": ["TEAM", "PLAY_TYPE"]},
+    "team/Team-ShotLocation-EffDist.sql": {
+        "name": "team-shot-location-efficiency", "key_columns": ["TEAM"]},
+    "player/Player-OffensiveEfficiency.sql": {
+        "key_columns": ["PLAY_TYPE", "PLAYER", "TEAM"]},
+    "player/Player-ShotLocation-EffDist.sql": {
+        "name": "player-shot-location-efficiency", "key_columns": ["PLAYER", "TEAM"]},
+    "player/Player-ShotLocation-FreqDist.sql": {
+        "name": "player-shot-location-frequency", "key_columns": ["PLAYER", "TEAM"]},
+    "player/Player-PlayType-ShotLocation-FreqDist.sql": {
+        "name": "player-playtype-shot-frequency", "key_columns": ["PLAYER", "TEAM", "PLAY_TYPE"]},
+    "situation/Team-Situ-QuarterEff.sql": {
+        "name": "team-quarter-efficiency", "key_columns": ["TEAM", "PERIOD"]},
+}
+
+# Extra datasets: name -> (template, final SELECT with {table} and {order} slots)
+DATASET_VARIANTS = {
+    "team-offensive-efficiency-no-percentiles": (
+        "team/Team-OffensiveEfficiency.sql",
+        "SELECT PLAY_TYPE, TEAM, PPP, `2PA`, `2PM`, `2P%`, `3PA`, `3PM`, `3P%`, PLAY_COUNT FROM {table}{order}"),
+}
+
+# Categories in the order their datasets are listed
+CATEGORY_ORDER = ["team", "player", "situation"]
+
+_DEFAULT_SELECT = "SELECT * FROM {table}{order}"
+
+
+def dataset_slug(filename: str) -> str:
+    """Default dataset name of a template (Team-OffensiveEfficiency.sql -> team-offensive-efficiency)."""
+    stem = Path(filename).stem
+    words = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "-", stem)
+    return re.sub(r"[^a-z0-9]+", "-", words.lower()).strip("-")
+
+
+class DatasetSpec:
+    """One dataset: the template it runs and how its final SELECT is built."""
+
+    __slots__ = ("name", "category", "filename", "select", "key_columns")
+
+    def __init__(self, name: str, category: str, filename: str,
+                 select: Optional[str] = None, key_columns: Optional[List[str]] = None):
+        self.name = name
+        self.category = category
+        self.filename = filename
+        self.select = select or _DEFAULT_SELECT
+        self.key_columns = key_columns
+
+    @property
+    def template_path(self) -> str:
+        return f"{self.category}/{self.filename}"
+
+    def final_select(self, template: SQLTemplate) -> str:
+        """
+        The SELECT that follows the template's CTE.
+
+        Raises:
+            ValueError: If the template has no final CTE table to select from
+        """
+        if not template.final_table:
+            raise ValueError(f"{self.template_path} has no final SELECT over a CTE table")
+        order = f" ORDER BY {template.order_by}" if template.order_by else ""
+        return self.select.format(table=template.final_table, order=order)
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "template": self.filename,
+            "key_columns": self.key_columns,
+        }
+
+
+class DatasetRegistry:
+    """
+    Named datasets discovered from the query templates of every gender.
+
+    Discovery only lists files; templates are parsed on first query through
+    the template registry.
+    """
+
+    def __init__(self, root: Path = QUERIES_ROOT):
+        self.root = root
+        self._specs = self._discover()
+
+    def _discover(self) -> Dict[str, DatasetSpec]:
+        category_rank = {category: i for i, category in enumerate(CATEGORY_ORDER)}
+        paths = sorted(
+            {(path.parent.name, path.name) for path in self.root.glob("*/*/*.sql")},
+            key=lambda p: (category_rank.get(p[0], len(CATEGORY_ORDER)), p[0], p[1])
+        )
+        specs: Dict[str, DatasetSpec] = {}
+        for category, filename in paths:
+            template_path = f"{category}/{filename}"
+            override = DATASET_OVERRIDES.get(template_path, {})
+            name = override.get("name") or dataset_slug(filename)
+            if name in specs:
+                raise ValueError(f"Dataset name {name} is used by both "
+                                 f"{specs[name].template_path} and {template_path}")
+            specs[name] = DatasetSpec(name, category, filename, key_columns=override.get("key_columns"))
+            for variant, (base, select) in DATASET_VARIANTS.items():
+                if base == template_path:
+                    specs[variant] = DatasetSpec(
+                        variant, category, filename, select=select, key_columns=override.get("key_columns")
+                    )
+        return specs
+
+    def get(self, name: str) -> DatasetSpec:
+        """
+        Look up a dataset by name.
+
+        Raises:
+            ValueError: If no template provides the dataset
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown dataset: {name}")
+        return spec
+
+    def names(self) -> List[str]:
+        """Every dataset name, team datasets first."""
+        return list(self._specs)
+
+    def items(self) -> Iterator[Tuple[str, DatasetSpec]]:
+        return iter(self._specs.items())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+
+_registry: Optional[DatasetRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_dataset_registry() -> DatasetRegistry:
+    """Get the process-wide dataset registry, discovering templates on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DatasetRegistry()
+        return _registry
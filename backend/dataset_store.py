@@ -0,0 +1,212 @@
+"""
+Dataset Store for RIT Basketball Statistics
+Crash-safe, versioned snapshots of the cached JSON datasets
+
+Each refresh writes into its own snapshot directory under snapshots/. Only
+when every dataset has been written is the snapshot published by replacing
+manifest.json, whose "files" map each dataset to its immutable copy in the
+snapshot. Readers that resolve files through the manifest (the frontend
+pages) therefore switch from one snapshot to the next in a single atomic
+rename. The live {gender}/ paths are mirrored from the snapshot before the
+manifest is replaced, for readers that do not use it. Older snapshots are
+kept for instant rollback.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """
+    Open a temp file next to ``path`` for writing and rename it into place on
+    success, so readers see either the old or the new contents, never a
+    truncated file. On error the temp file is removed and ``path`` is untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write a whole file atomically (see atomic_writer)."""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotStore:
+    """Manages versioned dataset snapshots under ``root/snapshots``."""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Path, genders: List[str]):
+        """
+        Initialize the store.
+
+        Args:
+            root: Live output directory (public/data/stats)
+            genders: Gender subfolders holding datasets
+        """
+        self.root = root
+        self.genders = genders
+        self.snapshots_dir = root / "snapshots"
+
+    def new_version(self) -> str:
+        """A sortable, unique snapshot version such as 20260120T085157Z."""
+        version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        suffix = 0
+        candidate = version
+        while (self.snapshots_dir / candidate).exists() or self._staging(candidate).exists():
+            suffix += 1
+            candidate = f"{version}-{suffix}"
+        return candidate
+
+    def _staging(self, version: str) -> Path:
+        return self.snapshots_dir / f".{version}.partial"
+
+    def begin(self, version: str) -> Path:
+        """Create the staging directory a refresh writes its datasets into."""
+        staging = self._staging(version)
+        for gender in self.genders:
+            (staging / gender).mkdir(parents=True, exist_ok=True)
+        return staging
+
+    def abort(self, version: str) -> None:
+        """Discard a staging directory after a failed refresh."""
+        shutil.rmtree(self._staging(version), ignore_errors=True)
+
+    def carry_over(self, staging: Path, gender: str, source: Optional[Path]) -> None:
+        """
+        Copy a gender's unchanged datasets into the new snapshot (hard links where possible).
+
+        Args:
+            staging: Staging directory of the snapshot being built
+            gender: Gender subfolder to copy
+            source: Directory containing the gender subfolder (previous snapshot, or the live root)
+        """
+        src_dir = (source or self.root) / gender
+        if not src_dir.is_dir():
+            return
+        for src in src_dir.iterdir():
+            if not src.is_file() or src.name.startswith("."):
+                continue
+            dst = staging / gender / src.name
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+    def commit(self, version: str) -> Path:
+        """Atomically turn a complete staging directory into a snapshot."""
+        final = self.snapshots_dir / version
+        os.replace(self._staging(version), final)
+        return final
+
+    def file_entries(self, version: str) -> Dict[str, Dict[str, Any]]:
+        """Content hash, size and immutable path of every file in a snapshot."""
+        snapshot = self.snapshots_dir / version
+        entries = {}
+        for gender in self.genders:
+            for path in sorted((snapshot / gender).glob("*")):
+                if not path.is_file() or path.name.startswith("."):
+                    continue
+                rel = f"{gender}/{path.name}"
+                entries[rel] = {
+                    "path": f"snapshots/{version}/{rel}",
+                    "sha256": file_digest(path),
+                    "bytes": path.stat().st_size,
+                }
+        return entries
+
+    def publish(self, version: str, manifest: Dict[str, Any]) -> None:
+        """
+        Make a snapshot live by replacing the manifest, which points readers
+        at the snapshot's immutable files.
+
+        First the live {gender}/ paths are made to mirror the snapshot: each
+        of its files is swapped in and live files it does not contain are
+        removed. A copy of the manifest is also stored inside the snapshot so
+        it can be republished by rollback().
+        """
+        snapshot = self.snapshots_dir / version
+        body = json.dumps(manifest, indent=2, default=str).encode("utf-8")
+        atomic_write_bytes(snapshot / self.MANIFEST, body)
+
+        for gender in self.genders:
+            published = set()
+            for src in sorted((snapshot / gender).glob("*")):
+                if src.is_file() and not src.name.startswith("."):
+                    atomic_write_bytes(self.root / gender / src.name, src.read_bytes())
+                    published.add(src.name)
+            live_dir = self.root / gender
+            if live_dir.is_dir():
+                for stale in live_dir.iterdir():
+                    if stale.is_file() and not stale.name.startswith(".") and stale.name not in published:
+                        stale.unlink()
+
+        atomic_write_bytes(self.root / self.MANIFEST, body)
+
+    def rollback(self, version: str) -> Dict[str, Any]:
+        """
+        Republish an earlier snapshot, including removing live files it does not contain.
+
+        Returns:
+            The manifest that was republished
+
+        Raises:
+            FileNotFoundError: If the snapshot or its manifest does not exist
+        """
+        manifest_path = self.snapshots_dir / version / self.MANIFEST
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.publish(version, manifest)
+        return manifest
+
+    def list_versions(self) -> List[str]:
+        """Committed snapshot versions, oldest first."""
+        if not self.snapshots_dir.is_dir():
+            return []
+        return sorted(
+            p.name for p in self.snapshots_dir.iterdir()
+            if p.is_dir() and not p.name.startswith(".")
+        )
+
+    def prune(self, keep: int, protect: Optional[str] = None) -> List[str]:
+        """
+        Delete all but the newest ``keep`` snapshots (never the ``protect`` version).
+
+        Returns:
+            Versions that were deleted
+        """
+        versions = self.list_versions()
+        doomed = [v for v in versions[:max(0, len(versions) - keep)] if v != protect]
+        for version in doomed:
+            shutil.rmtree(self.snapshots_dir / version, ignore_errors=True)
+        return doomed
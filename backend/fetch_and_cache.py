@@ -2,22 +2,60 @@
 Data Fetcher & Cache Script
 Pulls data from the database and saves as JSON files for the frontend.
 Run this script whenever you want to update the website's data.
+Every query template in the dataset registry is refreshed, so a new .sql
+file under queries/ is picked up without code changes.
+
+Only genders whose source plays changed since the last run (per the
+watermarks recorded in manifest.json) are refreshed, so the script is cheap
+to run on a short schedule.
+
+Each refresh is written into a new snapshot directory and only published
+once every dataset succeeded: the live paths are mirrored from it, then
+manifest.json is replaced to point the pages at the snapshot's files.
+Each gender also gets page bundles (bundle-team.json, bundle-player.json,
+with .gz/.br siblings) holding everything a leaderboard page loads.
+
+Only the current season (CURRENT_SEASON) is refreshed. Closed seasons never
+change: --archive-season computes their datasets once into the season
+archive, and artifacts already archived are never recomputed.
 
 Usage:
-    python fetch_and_cache.py
+    python fetch_and_cache.py [--workers N] [--per-db N] [--force] [--compact] [--engine sql|scan] [--stream]
+    python fetch_and_cache.py --list-snapshots
+    python fetch_and_cache.py --rollback VERSION
+    python fetch_and_cache.py --archive-season 2024-2025 [--conference NAME]
 """
 
+import argparse
+import functools
+import gzip
 import json
 import os
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from config import get_settings, load_env
 from sql_connector import get_mens_db, get_womens_db
-from query_executor import QueryExecutor
+from query_executor import QueryExecutor, dataset_label
+from query_profiler import format_summary, get_profiler
+from bundles import BUNDLES, bundle_filename, compress_all, encoding_suffix
+from dataset_registry import get_dataset_registry
+from dataset_store import SnapshotStore, atomic_write_bytes, atomic_writer
+from serialization import dumps, loads
+from seasons import CURRENT_SEASON, get_season_archive
 
-# Load environment
-load_dotenv()
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Load environment (the REFRESH_* flag defaults below)
+load_env()
 
 # Output directory (frontend public folder)
 # Get the krebstats-web root directory (parent of backend)
@@ -34,279 +72,688 @@ def ensure_output_dir():
     print(f"📁 Output directory: {OUTPUT_DIR}")
 
 
-def save_json(data: dict, filename: str, subfolder: str = ""):
-    """Save data as JSON file."""
-    if subfolder:
-        path = OUTPUT_DIR / subfolder / filename
-    else:
-        path = OUTPUT_DIR / filename
+class RowStream:
+    """
+    Dataset rows fetched lazily from a server-side cursor, batch by batch,
+    while they are being written. Counts rows as they go by.
+    """
+
+    def __init__(self, batches: Iterator[List[Dict[str, Any]]]):
+        self.batches = batches
+        self.row_count = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in self.batches:
+            for row in batch:
+                self.row_count += 1
+                yield row
+
+
+def write_streamed_json(f, payload: dict) -> int:
+    """
+    Write a payload whose "data" is a RowStream, one row at a time.
     
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    The output is formatted like json.dumps(indent=2); row_count is only known
+    once every row is written, so it follows "data" instead of preceding it.
     
-    print(f"  ✅ Saved: {path.name}")
+    Returns:
+        Number of bytes written
+    """
+    rows = payload["data"]
+    header = {key: value for key, value in payload.items() if key not in ("data", "row_count")}
+    head = dumps(header, indent=True).decode("utf-8")
+    
+    written = 0
+    def emit(text: str):
+        nonlocal written
+        chunk = text.encode("utf-8")
+        f.write(chunk)
+        written += len(chunk)
+    
+    emit(head[:-2] + (',\n  "data": [' if header else '{\n  "data": ['))
+    for row in rows:
+        emit(",\n" if rows.row_count > 1 else "\n")
+        emit(textwrap.indent(dumps(row, indent=True).decode("utf-8"), "    "))
+    emit("\n  ]" if rows.row_count else "]")
+    emit(f',\n  "row_count": {rows.row_count}\n}}')
+    return written
 
 
-def fetch_team_offensive_efficiency(gender: str, debug: bool = False):
-    """Fetch team offensive efficiency data."""
-    print(f"\n📊 Fetching team offensive efficiency ({gender})...")
+def save_json(data: dict, filename: str, subfolder: str = "", base_dir: Optional[Path] = None) -> int:
+    """
+    Save data as JSON file (atomically, via temp file plus rename).
     
-    try:
-        executor = QueryExecutor(gender)
-        
-        if debug:
-            # Debug: show what query would be generated
-            raw_query = executor._load_query_file("team", "Team-OffensiveEfficiency.sql")
-            cte, table = executor._extract_cte_and_final_select(raw_query)
-            print(f"  DEBUG - CTE length: {len(cte)} chars")
-            print(f"  DEBUG - Final table: {table}")
-            print(f"  DEBUG - CTE ends with: ...{cte[-100:]}")
-        
-        # Fetch full data with percentiles
-        data_with_percentiles = executor.execute_team_offensive_efficiency(
-            include_percentiles=True,
-            play_types=None,
-            team_filter=None,
-            order_by="PLAY_COUNT",
-            order_direction="DESC",
-            limit=None
-        )
-        
-        # Fetch without percentiles
-        data_without_percentiles = executor.execute_team_offensive_efficiency(
-            include_percentiles=False,
-            play_types=None,
-            team_filter=None,
-            order_by="PLAY_COUNT",
-            order_direction="DESC",
-            limit=None
-        )
-        
-        # Save both versions
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "team-offensive-efficiency",
-            "include_percentiles": True,
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(data_with_percentiles),
-            "data": data_with_percentiles
-        }, "team-offensive-efficiency.json", gender)
-        
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "team-offensive-efficiency",
-            "include_percentiles": False,
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(data_without_percentiles),
-            "data": data_without_percentiles
-        }, "team-offensive-efficiency-no-percentiles.json", gender)
-        
-        return True
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        return False
+    A payload whose "data" is a RowStream is written row by row, so the full
+    result is never held in memory.
+    
+    Args:
+        base_dir: Directory to write under (defaults to OUTPUT_DIR)
+    
+    Returns:
+        Size of the written file in bytes
+    """
+    base_dir = base_dir or OUTPUT_DIR
+    path = base_dir / subfolder / filename if subfolder else base_dir / filename
+    
+    if isinstance(data.get("data"), RowStream):
+        with atomic_writer(path) as f:
+            size = write_streamed_json(f, data)
+        print(f"  ✅ Saved: {path.relative_to(base_dir)} ({data['data'].row_count} rows, streamed)")
+        return size
+    
+    # Encoding time is profiled under the dataset's query template; streamed
+    # payloads are skipped above since their encoding interleaves with fetching
+    with get_profiler().serializing(dataset_label(subfolder, Path(filename).stem)) as profile:
+        body = dumps(data, indent=True)
+        profile["size"] = len(body)
+    atomic_write_bytes(path, body)
+    
+    print(f"  ✅ Saved: {path.relative_to(base_dir)}")
+    return len(body)
 
 
-def fetch_player_shot_stats(gender: str):
-    """Fetch player statistics."""
-    print(f"\n🏀 Fetching player statistics ({gender})...")
+def to_columnar(payload: dict) -> dict:
+    """
+    Convert a payload's list of row dicts into column names plus one value
+    array per column, so each column name is stored once instead of per row.
+    Payloads without row data (e.g. metadata) are returned unchanged.
+    """
+    rows = payload.get("data")
+    if not isinstance(rows, list) or (rows and not isinstance(rows[0], dict)):
+        return payload
     
-    try:
-        executor = QueryExecutor(gender)
-        
-        # Player Offensive Efficiency (by play type)
-        player_eff_data = executor.execute_player_offensive_efficiency()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "player-offensive-efficiency",
-            "description": "Player offensive efficiency by play type with shooting percentages, PPP, and percentile rankings",
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(player_eff_data),
-            "data": player_eff_data
-        }, "player-offensive-efficiency.json", gender)
-        
-        # Shot Location Efficiency
-        shot_eff_data = executor.execute_player_shot_location_efficiency()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "player-shot-location-efficiency",
-            "description": "Player shooting efficiency from different court areas (Layup, Close, Mid-Range, 3P) with percentile rankings",
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(shot_eff_data),
-            "data": shot_eff_data
-        }, "player-shot-location-efficiency.json", gender)
-        
-        # Shot Location Frequency
-        shot_freq_data = executor.execute_player_shot_location_frequency()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "player-shot-location-frequency",
-            "description": "Player shot distribution showing percentage of shots from each court zone",
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(shot_freq_data),
-            "data": shot_freq_data
-        }, "player-shot-location-frequency.json", gender)
-        
-        # PlayType Shot Frequency
-        playtype_freq_data = executor.execute_player_playtype_shot_frequency()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "player-playtype-shot-frequency",
-            "description": "Shot distribution by play type, showing where players shoot from on different offensive actions",
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(playtype_freq_data),
-            "data": playtype_freq_data
-        }, "player-playtype-shot-frequency.json", gender)
-        
-        return True
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        return False
+    columns = list(rows[0].keys()) if rows else []
+    compact = {key: value for key, value in payload.items() if key != "data"}
+    compact["format"] = "columnar"
+    compact["columns"] = columns
+    compact["data"] = [[row.get(column) for row in rows] for column in columns]
+    return compact
+
 
+def compact_filename(filename: str) -> str:
+    """Name of the compact sibling of a dataset file (x.json -> x.min.json)."""
+    return filename[:-len(".json")] + ".min.json"
 
-def fetch_team_shot_stats(gender: str):
-    """Fetch team shot location statistics."""
-    print(f"\n📊 Fetching team shot statistics ({gender})...")
+
+def save_compact(data: dict, filename: str, subfolder: str = "", base_dir: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Save a minified columnar copy of a dataset plus precompressed .gz and .br siblings.
     
-    try:
-        executor = QueryExecutor(gender)
-        
-        # Team Shot Location Frequency
-        team_shot_freq = executor.execute_team_shot_location_frequency()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "query": "team-shot-location-frequency",
-            "description": "Team shot distribution showing percentage of shots from each court zone",
-            "fetched_at": datetime.now().isoformat(),
-            "row_count": len(team_shot_freq),
-            "data": team_shot_freq
-        }, "team-shot-location-frequency.json", gender)
-        
-        # Team PlayType Shot Frequency
-        team_playtype_freq = executor.execute_team_playtype_shot_frequency()
-        save_json({
+    The .br sibling is skipped when the brotli package is not installed.
+    
+    Returns:
+        Sizes in bytes keyed by 'min', 'gzip' and 'br'
+    """
+    base_dir = base_dir or OUTPUT_DIR
+    path = base_dir / subfolder / compact_filename(filename)
+    body = dumps(to_columnar(data))
+    
+    sizes = {"min": len(body)}
+    atomic_write_bytes(path, body)
+    
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    atomic_write_bytes(path.with_name(path.name + ".gz"), gzipped)
+    sizes["gzip"] = len(gzipped)
+    
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        atomic_write_bytes(path.with_name(path.name + ".br"), compressed)
+        sizes["br"] = len(compressed)
+    
+    print(f"  ✅ Saved: {path.relative_to(base_dir)} (+ .gz{' + .br' if brotli else ''})")
+    return sizes
+
+
+def save_bundles(gender: str, base_dir: Path) -> Dict[str, Dict[str, int]]:
+    """
+    Write a gender's page bundles (bundle-team.json, bundle-player.json) from
+    its dataset files under base_dir, minified, with precompressed siblings.
+    
+    Each bundle maps dataset name -> the dataset file's payload, so a page
+    loads everything it needs with one request.
+    
+    Returns:
+        Sizes in bytes per bundle file, keyed by 'json', 'gzip' and 'br'
+    """
+    sizes = {}
+    for bundle, datasets in BUNDLES.items():
+        payload = {
             "success": True,
             "gender": gender,
-            "query": "team-playtype-shot-frequency",
-            "description": "Team shot distribution by play type, showing where teams shoot from on different offensive actions",
+            "season": CURRENT_SEASON,
+            "bundle": bundle,
             "fetched_at": datetime.now().isoformat(),
-            "row_count": len(team_playtype_freq),
-            "data": team_playtype_freq
-        }, "team-playtype-shot-frequency.json", gender)
+            "datasets": {
+                dataset: loads((base_dir / gender / f"{dataset}.json").read_bytes())
+                for dataset in datasets
+            }
+        }
+        path = base_dir / gender / bundle_filename(bundle)
+        body = dumps(payload)
+        atomic_write_bytes(path, body)
         
-        return True
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        return False
+        bundle_sizes = {"json": len(body)}
+        for encoding, compressed in compress_all(body).items():
+            atomic_write_bytes(path.with_name(path.name + encoding_suffix(encoding)), compressed)
+            bundle_sizes[encoding] = len(compressed)
+        sizes[f"{gender}/{path.name}"] = bundle_sizes
+        print(f"  ✅ Saved: {gender}/{path.name} ({len(body):,} B, {bundle_sizes['gzip']:,} B gz)")
+    return sizes
+
+
+def dataset_payload(gender: str, query: str, data: list, **extra) -> dict:
+    """Build the standard JSON envelope for a query result (row_count is filled in by save_json for a RowStream)."""
+    payload = {
+        "success": True,
+        "gender": gender,
+        "query": query,
+    }
+    payload.update(extra)
+    payload["fetched_at"] = datetime.now().isoformat()
+    if not isinstance(data, RowStream):
+        payload["row_count"] = len(data)
+    payload["data"] = data
+    return payload
 
 
-def fetch_metadata(gender: str):
-    """Fetch metadata (play types, teams)."""
-    print(f"\n📋 Fetching metadata ({gender})...")
+def fetch_team_offensive_efficiency(executor: QueryExecutor, debug: bool = False) -> dict:
+    """Fetch team offensive efficiency data with percentiles."""
+    if debug:
+        # Debug: show what query would be generated
+        raw_query = executor._load_query_file("team", "Team-OffensiveEfficiency.sql")
+        cte, table = executor._extract_cte_and_final_select(raw_query)
+        print(f"  DEBUG - CTE length: {len(cte)} chars")
+        print(f"  DEBUG - Final table: {table}")
+        print(f"  DEBUG - CTE ends with: ...{cte[-100:]}")
     
+    data = executor.execute_team_offensive_efficiency(
+        include_percentiles=True,
+        play_types=None,
+        team_filter=None,
+        order_by="PLAY_COUNT",
+        order_direction="DESC",
+        limit=None
+    )
+    return dataset_payload(executor.gender, "team-offensive-efficiency", data, include_percentiles=True)
+
+
+def fetch_team_offensive_efficiency_no_percentiles(executor: QueryExecutor) -> dict:
+    """Fetch team offensive efficiency data without percentiles."""
+    data = executor.execute_team_offensive_efficiency(
+        include_percentiles=False,
+        play_types=None,
+        team_filter=None,
+        order_by="PLAY_COUNT",
+        order_direction="DESC",
+        limit=None
+    )
+    return dataset_payload(executor.gender, "team-offensive-efficiency", data, include_percentiles=False)
+
+
+def fetch_team_shot_location_frequency(executor: QueryExecutor) -> dict:
+    """Fetch team shot location frequency."""
+    return dataset_payload(
+        executor.gender, "team-shot-location-frequency",
+        executor.execute_team_shot_location_frequency(),
+        description="Team shot distribution showing percentage of shots from each court zone"
+    )
+
+
+def fetch_team_playtype_shot_frequency(executor: QueryExecutor) -> dict:
+    """Fetch team shot location frequency by play type."""
+    return dataset_payload(
+        executor.gender, "team-playtype-shot-frequency",
+        executor.execute_team_playtype_shot_frequency(),
+        description="Team shot distribution by play type, showing where teams shoot from on different offensive actions"
+    )
+
+
+def fetch_player_offensive_efficiency(executor: QueryExecutor) -> dict:
+    """Fetch player offensive efficiency by play type."""
+    return dataset_payload(
+        executor.gender, "player-offensive-efficiency",
+        executor.execute_player_offensive_efficiency(),
+        description="Player offensive efficiency by play type with shooting percentages, PPP, and percentile rankings"
+    )
+
+
+def fetch_player_shot_location_efficiency(executor: QueryExecutor) -> dict:
+    """Fetch player shot location efficiency."""
+    return dataset_payload(
+        executor.gender, "player-shot-location-efficiency",
+        executor.execute_player_shot_location_efficiency(),
+        description="Player shooting efficiency from different court areas (Layup, Close, Mid-Range, 3P) with percentile rankings"
+    )
+
+
+def fetch_player_shot_location_frequency(executor: QueryExecutor) -> dict:
+    """Fetch player shot location frequency."""
+    return dataset_payload(
+        executor.gender, "player-shot-location-frequency",
+        executor.execute_player_shot_location_frequency(),
+        description="Player shot distribution showing percentage of shots from each court zone"
+    )
+
+
+def fetch_player_playtype_shot_frequency(executor: QueryExecutor) -> dict:
+    """Fetch player shot location frequency by play type."""
+    return dataset_payload(
+        executor.gender, "player-playtype-shot-frequency",
+        executor.execute_player_playtype_shot_frequency(),
+        description="Shot distribution by play type, showing where players shoot from on different offensive actions"
+    )
+
+
+def fetch_dataset(executor: QueryExecutor, dataset: str) -> dict:
+    """Fetch any dataset in the dataset registry in full (templates without a dedicated fetcher)."""
+    return dataset_payload(executor.gender, dataset, executor.execute_dataset(dataset))
+
+
+def fetch_play_types(executor: QueryExecutor) -> dict:
+    """Fetch available play types."""
+    return {
+        "success": True,
+        "gender": executor.gender,
+        "fetched_at": datetime.now().isoformat(),
+        "play_types": executor.get_available_play_types()
+    }
+
+
+def fetch_teams(executor: QueryExecutor) -> dict:
+    """Fetch available teams."""
+    return {
+        "success": True,
+        "gender": executor.gender,
+        "fetched_at": datetime.now().isoformat(),
+        "teams": executor.get_available_teams()
+    }
+
+
+# Every cached dataset per gender: (output filename, fetch function)
+DATASETS = [
+    ("team-offensive-efficiency.json", fetch_team_offensive_efficiency),
+    ("team-offensive-efficiency-no-percentiles.json", fetch_team_offensive_efficiency_no_percentiles),
+    ("team-shot-location-frequency.json", fetch_team_shot_location_frequency),
+    ("team-playtype-shot-frequency.json", fetch_team_playtype_shot_frequency),
+    ("player-offensive-efficiency.json", fetch_player_offensive_efficiency),
+    ("player-shot-location-efficiency.json", fetch_player_shot_location_efficiency),
+    ("player-shot-location-frequency.json", fetch_player_shot_location_frequency),
+    ("player-playtype-shot-frequency.json", fetch_player_playtype_shot_frequency),
+    ("play-types.json", fetch_play_types),
+    ("teams.json", fetch_teams),
+]
+# Every other template in the dataset registry is refreshed in full as well
+DATASETS += [
+    (f"{name}.json", functools.partial(fetch_dataset, dataset=name))
+    for name in get_dataset_registry().names()
+    if f"{name}.json" not in {filename for filename, _ in DATASETS}
+]
+
+GENDERS = ["mens", "womens"]
+
+
+def load_manifest() -> dict:
+    """Load the previous run's manifest, or an empty one if missing or unreadable."""
     try:
-        executor = QueryExecutor(gender)
-        
-        # Play types
-        play_types = executor.get_available_play_types()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "fetched_at": datetime.now().isoformat(),
-            "play_types": play_types
-        }, "play-types.json", gender)
-        
-        # Teams
-        teams = executor.get_available_teams()
-        save_json({
-            "success": True,
-            "gender": gender,
-            "fetched_at": datetime.now().isoformat(),
-            "teams": teams
-        }, "teams.json", gender)
+        with open(OUTPUT_DIR / "manifest.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def check_watermarks(previous: Dict[str, dict], force: bool) -> Tuple[Dict[str, dict], List[str]]:
+    """
+    Fingerprint each gender's source plays and decide which genders need a refresh.
+    
+    A gender is refreshed when its watermark moved, could not be read, any of
+    its dataset files is missing, or force is set.
+    
+    Returns:
+        Tuple of (current watermarks by gender, genders to refresh)
+    """
+    print("\n🔎 Checking source watermarks...")
+    watermarks = {}
+    stale = []
+    for gender in GENDERS:
+        try:
+            watermarks[gender] = QueryExecutor(gender).get_source_watermark()
+        except Exception as e:
+            print(f"  ⚠️  {gender}: could not read watermark ({e}), refreshing")
+            stale.append(gender)
+            continue
         
-        return True
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        return False
+        old = previous.get(gender) or {}
+        changed = any(old.get(k) != v for k, v in watermarks[gender].items())
+        missing = [f for f, _ in DATASETS if not (OUTPUT_DIR / gender / f).exists()]
+        if force or changed or missing:
+            reason = "forced" if force else ("watermark moved" if changed else f"{len(missing)} dataset(s) missing")
+            print(f"  🔄 {gender}: {watermarks[gender]['row_count']} plays, {reason}")
+            stale.append(gender)
+        else:
+            print(f"  ⏭️  {gender}: {watermarks[gender]['row_count']} plays, unchanged")
+    return watermarks, stale
+
+
+class StreamingQueryExecutor(QueryExecutor):
+    """
+    QueryExecutor whose full-dataset methods return RowStreams over a
+    server-side cursor instead of lists, so save_json can write each dataset
+    to disk as its rows arrive.
+    """
+
+    def _rows(self, dataset: str) -> RowStream:
+        return RowStream(self.stream_dataset(dataset))
+
+    def execute_team_offensive_efficiency(self, include_percentiles: bool = True, **kwargs):
+        if not self._is_full_result(**kwargs):
+            return super().execute_team_offensive_efficiency(include_percentiles=include_percentiles, **kwargs)
+        return self._rows("team-offensive-efficiency" if include_percentiles
+                          else "team-offensive-efficiency-no-percentiles")
+
+    def execute_team_shot_location_frequency(self):
+        return self._rows("team-shot-location-frequency")
 
+    def execute_team_playtype_shot_frequency(self):
+        return self._rows("team-playtype-shot-frequency")
 
-def main():
+    def execute_player_offensive_efficiency(self, include_percentiles: bool = True, **kwargs):
+        if not include_percentiles or not self._is_full_result(**kwargs):
+            return super().execute_player_offensive_efficiency(include_percentiles=include_percentiles, **kwargs)
+        return self._rows("player-offensive-efficiency")
+
+    def execute_player_shot_location_efficiency(self):
+        return self._rows("player-shot-location-efficiency")
+
+    def execute_player_shot_location_frequency(self):
+        return self._rows("player-shot-location-frequency")
+
+    def execute_player_playtype_shot_frequency(self):
+        return self._rows("player-playtype-shot-frequency")
+
+    def execute_dataset(self, dataset: str):
+        return self._rows(dataset)
+
+
+def archive_seasons(seasons: List[str], conference: Optional[str] = None) -> bool:
+    """
+    Compute every dataset of the given closed seasons into the season archive.
+    
+    Datasets that are already archived are left untouched.
+    
+    Returns:
+        True if every season was archived
+    """
+    print(f"\n🗄️  Archiving closed seasons into {get_season_archive().root}")
+    ok = True
+    for season in seasons:
+        for gender in GENDERS:
+            try:
+                executor = QueryExecutor(gender, season=season, conference=conference)
+                built = executor.archive_season()
+            except Exception as e:
+                print(f"  ❌ {gender} {season}: {e}")
+                ok = False
+                continue
+            new = sum(built.values())
+            print(f"  ✅ {gender} {executor.season} ({executor.conference}): "
+                  f"{new} archived, {len(built) - new} already present or empty")
+    return ok
+
+
+def executor_factory(engine: str, stream: bool = False) -> Callable[[str], QueryExecutor]:
+    """
+    Build the per-task executor constructor for a refresh engine.
+
+    "sql" runs one query file per dataset, optionally streaming each result
+    straight to disk. "scan" streams each gender's plays once and computes
+    every team/player dataset from that single pass.
+    """
+    if engine == "scan":
+        # pandas is only needed by the scan engine
+        from aggregation_engine import SeasonScan, SinglePassExecutor
+
+        scans = {gender: SeasonScan(gender) for gender in GENDERS}
+        return lambda gender: SinglePassExecutor(gender, scans[gender])
+    if stream:
+        return StreamingQueryExecutor
+    return QueryExecutor
+
+
+def run_task(gender: str, filename: str, fetch: Callable[[QueryExecutor], dict],
+             db_limits: Dict[str, threading.Semaphore], base_dir: Path,
+             compact: bool = False,
+             make_executor: Callable[[str], QueryExecutor] = QueryExecutor
+             ) -> Tuple[bool, float, Dict[str, int]]:
+    """
+    Fetch one dataset and save it under base_dir, holding the gender's database slot.
+    
+    Returns:
+        Tuple of (succeeded, seconds taken, file sizes in bytes)
+    """
+    with db_limits[gender]:
+        started = time.perf_counter()
+        print(f"\n📊 Fetching {gender}/{filename}...")
+        sizes = {}
+        try:
+            payload = fetch(make_executor(gender))
+            sizes["json"] = save_json(payload, filename, gender, base_dir)
+            if compact:
+                sizes.update(save_compact(payload, filename, gender, base_dir))
+            ok = True
+        except Exception as e:
+            print(f"  ❌ Error ({gender}/{filename}): {e}")
+            ok = False
+        return ok, time.perf_counter() - started, sizes
+
+
+def smallest_pool_size() -> int:
+    """Connection pool size of the smaller of the two databases' pools."""
+    settings = get_settings()
+    return min(settings.pool_size(settings.database(gender)) for gender in ("mens", "womens"))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    pool_size = smallest_pool_size()
+    parser = argparse.ArgumentParser(description="Refresh cached JSON datasets from the database")
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("REFRESH_WORKERS", 4)),
+        help="Datasets fetched concurrently across both genders (1 = sequential)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        default=os.getenv("REFRESH_COMPACT", "False").lower() == "true",
+        help="Also write minified columnar .min.json files with .gz/.br siblings"
+    )
+    parser.add_argument(
+        "--keep-snapshots", type=int, default=int(os.getenv("REFRESH_KEEP_SNAPSHOTS", 3)),
+        help="Number of published snapshots kept for rollback"
+    )
+    parser.add_argument(
+        "--rollback", metavar="VERSION",
+        help="Republish an earlier snapshot instead of refreshing (see --list-snapshots)"
+    )
+    parser.add_argument(
+        "--list-snapshots", action="store_true",
+        help="List available snapshot versions and exit"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Refresh every dataset even if the source watermark has not moved"
+    )
+    parser.add_argument(
+        "--engine", choices=["sql", "scan"], default=os.getenv("REFRESH_ENGINE", "sql"),
+        help="sql: one query per dataset; scan: one pass over each gender's plays"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        default=os.getenv("REFRESH_STREAM", "False").lower() == "true",
+        help="Write datasets to disk as rows arrive instead of buffering whole results (sql engine)"
+    )
+    parser.add_argument(
+        "--archive-season", nargs="+", metavar="SEASON",
+        help="Archive closed seasons (e.g. 2024-2025) instead of refreshing the current one"
+    )
+    parser.add_argument(
+        "--conference", default=None,
+        help="Conference to archive with --archive-season (default: CONFERENCE setting)"
+    )
+    parser.add_argument(
+        "--per-db", type=int, default=int(os.getenv("REFRESH_PER_DB", min(2, pool_size))),
+        help="Max concurrent queries against each database (capped at DB_POOL_SIZE)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    workers = max(1, args.workers)
+    # More concurrent queries than pooled connections would only queue on the pool
+    per_db = max(1, min(args.per_db, smallest_pool_size()))
+    
     print("=" * 50)
     print("🏀 RIT Basketball Data Fetcher")
     print("=" * 50)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Season: {CURRENT_SEASON}, workers: {workers} (max {per_db} per database), engine: {args.engine}")
     
     ensure_output_dir()
+    store = SnapshotStore(OUTPUT_DIR, GENDERS)
     
-    success_count = 0
-    total_count = 0
+    if args.list_snapshots:
+        current = load_manifest().get("snapshot")
+        for version in store.list_versions():
+            print(f"  {'*' if version == current else ' '} {version}")
+        return
     
-    for gender in ["mens", "womens"]:
-        print(f"\n{'='*30}")
-        print(f"Processing: {gender.upper()}")
-        print("="*30)
-        
-        # Fetch team offensive efficiency
-        total_count += 1
-        if fetch_team_offensive_efficiency(gender, debug=False):
-            success_count += 1
+    if args.rollback:
+        store.rollback(args.rollback)
+        print(f"\n⏪ Rolled back to snapshot {args.rollback}")
+        return
+    
+    if args.archive_season:
+        archive_seasons(args.archive_season, args.conference)
+        return
+    
+    manifest = load_manifest()
+    previous_watermarks = manifest.get("watermarks", {})
+    # The live datasets always hold the current season; a new season starts from scratch
+    season_changed = manifest.get("season", CURRENT_SEASON) != CURRENT_SEASON
+    if season_changed:
+        print(f"\n📅 Season changed: {manifest['season']} -> {CURRENT_SEASON}")
+    watermarks, stale_genders = check_watermarks(previous_watermarks, args.force or season_changed)
+    
+    db_limits = {gender: threading.Semaphore(per_db) for gender in GENDERS}
+    all_datasets = [(gender, filename) for gender in GENDERS for filename, _ in DATASETS]
+    tasks = [(gender, filename, fetch) for gender in stale_genders for filename, fetch in DATASETS]
+    timings = {}
+    
+    # Build the new snapshot in a staging directory; unchanged genders are carried over
+    version = store.new_version()
+    staging = store.begin(version) if tasks else None
+    if tasks:
+        previous_snapshot = None
+        if manifest.get("snapshot") and (store.snapshots_dir / manifest["snapshot"]).is_dir():
+            previous_snapshot = store.snapshots_dir / manifest["snapshot"]
+        for gender in GENDERS:
+            if gender not in stale_genders:
+                store.carry_over(staging, gender, previous_snapshot)
+    
+    stream = args.stream
+    if stream and (args.compact or args.engine == "scan"):
+        # Compact siblings and the scan engine both need the whole result in memory
+        print("⚠️  --stream ignored with --compact or --engine scan")
+        stream = False
+    make_executor = executor_factory(args.engine, stream)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_task, gender, filename, fetch, db_limits, staging,
+                        args.compact, make_executor): (gender, filename)
+            for gender, filename, fetch in tasks
+        }
+        for future in as_completed(futures):
+            timings[futures[future]] = future.result()
+    total_elapsed = time.perf_counter() - started
+    
+    success_count = sum(1 for ok, _, _ in timings.values() if ok)
+    total_count = len(tasks)
+    published = False
+    
+    # Page bundles are built from the finished dataset files. They are an
+    # optimization (the pages fall back to the individual files), so a
+    # failure here does not hold back the snapshot
+    bundle_sizes = {}
+    if tasks and success_count == total_count:
+        print("\n🧺 Building page bundles...")
+        for gender in stale_genders:
+            try:
+                bundle_sizes.update(save_bundles(gender, staging))
+            except Exception as e:
+                print(f"  ⚠️  Bundles skipped ({gender}): {e}")
+    
+    if not tasks:
+        # Nothing changed: only record that we checked
+        manifest["last_checked"] = datetime.now().isoformat()
+        atomic_write_bytes(OUTPUT_DIR / "manifest.json", json.dumps(manifest, indent=2, default=str).encode("utf-8"))
+    elif success_count == total_count:
+        store.commit(version)
         
-        # Fetch team shot statistics
-        total_count += 1
-        if fetch_team_shot_stats(gender):
-            success_count += 1
+        # Payload sizes per dataset; skipped datasets keep their previous entry
+        sizes = dict(manifest.get("sizes", {}))
+        for (gender, filename), (_, _, dataset_sizes) in timings.items():
+            sizes[f"{gender}/{filename}"] = dataset_sizes
+        sizes.update(bundle_sizes)
         
-        # Fetch player statistics
-        total_count += 1
-        if fetch_player_shot_stats(gender):
-            success_count += 1
+        recorded = dict(previous_watermarks)
+        recorded.update(watermarks)
         
-        # Fetch metadata
-        total_count += 1
-        if fetch_metadata(gender):
-            success_count += 1
-    
-    # Save a manifest file with last update time
-    save_json({
-        "last_updated": datetime.now().isoformat(),
-        "datasets": [
-            "mens/team-offensive-efficiency.json",
-            "mens/team-offensive-efficiency-no-percentiles.json",
-            "mens/team-shot-location-frequency.json",
-            "mens/team-playtype-shot-frequency.json",
-            "mens/player-offensive-efficiency.json",
-            "mens/player-shot-location-efficiency.json",
-            "mens/player-shot-location-frequency.json",
-            "mens/player-playtype-shot-frequency.json",
-            "mens/play-types.json",
-            "mens/teams.json",
-            "womens/team-offensive-efficiency.json",
-            "womens/team-offensive-efficiency-no-percentiles.json",
-            "womens/team-shot-location-frequency.json",
-            "womens/team-playtype-shot-frequency.json",
-            "womens/player-offensive-efficiency.json",
-            "womens/player-shot-location-efficiency.json",
-            "womens/player-shot-location-frequency.json",
-            "womens/player-playtype-shot-frequency.json",
-            "womens/play-types.json",
-            "womens/teams.json"
-        ]
-    }, "manifest.json")
+        store.publish(version, {
+            "last_updated": datetime.now().isoformat(),
+            "last_checked": datetime.now().isoformat(),
+            "snapshot": version,
+            "season": CURRENT_SEASON,
+            "watermarks": recorded,
+            "datasets": [f"{gender}/{filename}" for gender, filename in all_datasets],
+            "files": store.file_entries(version),
+            "sizes": sizes
+        })
+        published = True
+        pruned = store.prune(args.keep_snapshots, protect=version)
+        print(f"\n📦 Published snapshot {version}" + (f" (pruned {len(pruned)} old)" if pruned else ""))
+    else:
+        # Leave the live datasets and manifest untouched; watermarks are not
+        # advanced, so the next run retries
+        store.abort(version)
+        print(f"\n⚠️  {total_count - success_count} dataset(s) failed; "
+              f"live data left at snapshot {manifest.get('snapshot', '(none)')}")
     
     print("\n" + "=" * 50)
-    print(f"✨ Complete! {success_count}/{total_count} tasks succeeded")
-    print(f"📁 Data saved to: {OUTPUT_DIR}")
+    print("⏱️  Task timings")
+    for gender, filename in all_datasets:
+        if (gender, filename) not in timings:
+            print(f"  ⏭️  {gender + '/' + filename:<55} skipped")
+            continue
+        ok, elapsed, dataset_sizes = timings[(gender, filename)]
+        size_note = ""
+        if "min" in dataset_sizes:
+            size_note = f"  {dataset_sizes['json']:>8,} B -> {dataset_sizes['min']:>8,} B min, {dataset_sizes['gzip']:>7,} B gz"
+        print(f"  {'✅' if ok else '❌'} {gender + '/' + filename:<55} {elapsed:>7.2f}s{size_note}")
+    print(f"  Total wall-clock: {total_elapsed:.2f}s "
+          f"(sum of tasks: {sum(t for _, t, _ in timings.values()):.2f}s)")
+    
+    profile = get_profiler().summary()
+    if profile:
+        print("\n" + "=" * 50)
+        print("🔬 Query profile")
+        print(textwrap.indent(format_summary(profile), "  "))
+    
+    print("\n" + "=" * 50)
+    print(f"✨ Complete! {success_count}/{total_count} tasks succeeded, "
+          f"{len(all_datasets) - total_count} skipped (source unchanged)")
+    if published:
+        print(f"📁 Data saved to: {OUTPUT_DIR}")
     print("=" * 50)
 
 
 if __name__ == "__main__":
     main()
-
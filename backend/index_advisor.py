@@ -0,0 +1,584 @@
+"""
+Index Advisor for RIT Basketball Statistics
+Proposes, measures and applies indexes on plays_table_denorm_extra
+
+Every .sql file under queries/ is parsed for the columns each query filters
+on (WHERE conjuncts), groups by and reads. Those are compared with the
+table's existing indexes (SHOW INDEX) to propose a shared filter index and
+covering indexes. With --apply, each proposed index is created and every
+query it serves is timed before and after; an index that speeds nothing up
+is dropped again, so gains are measured rather than assumed.
+
+Usage:
+    python index_advisor.py                        # propose (inspects both databases)
+    python index_advisor.py --offline              # propose from the query files alone
+    python index_advisor.py --apply --gender mens  # create, measure, keep what helps
+    python index_advisor.py --migration migrations/plays_indexes.sql
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import statistics
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from query_profiler import query_label
+from query_templates import QUERIES_ROOT, split_statements, strip_sql
+from sql_connector import DatabaseManager, get_mens_db, get_womens_db
+
+
+TABLE = "plays_table_denorm_extra"
+
+# InnoDB limit on the total length of an index key
+MAX_KEY_BYTES = 3072
+# MySQL limit on identifier length (index names)
+MAX_IDENTIFIER = 64
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_QUOTED_RE = re.compile(r'"[^"]*"|`[^`]*`')
+# Table columns are lower case in the query files; keywords and aliases are upper case
+_COLUMN_RE = re.compile(r"\b[a-z_][a-z0-9_]*\b")
+_CTE_NAME_RE = re.compile(r"\b(\w+)\s+AS\s*\(", re.IGNORECASE)
+_TABLE_RE = re.compile(
+    rf"\bFROM\s+{TABLE}\b(?:\s+(?:AS\s+)?(?!(?:WHERE|GROUP|ORDER|HAVING|LIMIT)\b)(\w+))?",
+    re.IGNORECASE
+)
+_SELECT_RE = re.compile(r"\bSELECT\b", re.IGNORECASE)
+_CLAUSE_RE = re.compile(r"\b(WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT)\b", re.IGNORECASE)
+_AND_RE = re.compile(r"\bAND\b", re.IGNORECASE)
+_EQUALS_RE = re.compile(r"^(?:\w+\.)?([a-z_][a-z0-9_]*)\s*=\s*(?:''|-?\d+(?:\.\d+)?)$")
+_IN_LIST_RE = re.compile(r"^(?:\w+\.)?([a-z_][a-z0-9_]*)\s+IN\s*\((?:\s*(?:''|-?\d+)\s*,?)+\)$", re.IGNORECASE)
+
+# Bytes per character of each character set, for key length checks
+_CHARSET_BYTES = {"utf8mb4": 4, "utf8mb3": 3, "utf8": 3, "latin1": 1, "ascii": 1, "binary": 1}
+
+
+# ==================== PARSING ====================
+
+def _mask_literals(sql: str) -> str:
+    """Blank out string literals and quoted identifiers, keeping clause structure."""
+    sql = _STRING_RE.sub("''", sql)
+    return _QUOTED_RE.sub('""', sql)
+
+
+def _depths(text: str) -> List[int]:
+    """Parenthesis depth at every character of text."""
+    depths, depth = [], 0
+    for char in text:
+        if char == "(":
+            depth += 1
+        depths.append(depth)
+        if char == ")":
+            depth -= 1
+    return depths
+
+
+def _scope_end(text: str) -> int:
+    """Index of the ")" closing the scope text starts in (or len(text))."""
+    depth = 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            if depth == 0:
+                return i
+            depth -= 1
+    return len(text)
+
+
+def _split_top_level(text: str, pattern: re.Pattern) -> List[str]:
+    """Split text on matches of pattern that are not inside parentheses."""
+    depths = _depths(text)
+    parts, start = [], 0
+    for match in pattern.finditer(text):
+        if depths[match.start()] == 0:
+            parts.append(text[start:match.start()])
+            start = match.end()
+    parts.append(text[start:])
+    return [part.strip() for part in parts]
+
+
+class QueryBlock:
+    """One SELECT that reads plays_table_denorm_extra, reduced to the columns it uses."""
+
+    def __init__(self, equality: List[str], in_list: List[str], other_filters: List[str],
+                 group_by: List[str], referenced: List[str]):
+        self.equality = equality
+        self.in_list = in_list
+        self.other_filters = other_filters
+        self.group_by = group_by
+        self.referenced = referenced
+
+
+class QueryAnalysis:
+    """The plays_table_denorm_extra access pattern of one query file."""
+
+    def __init__(self, name: str, path: Path, blocks: List[QueryBlock]):
+        self.name = name
+        self.path = path
+        self.blocks = blocks
+
+    def _union(self, attribute: str) -> List[str]:
+        columns: List[str] = []
+        for block in self.blocks:
+            columns += [c for c in getattr(block, attribute) if c not in columns]
+        return columns
+
+    @property
+    def equality(self) -> List[str]:
+        """Columns every block compares with a single constant."""
+        common = set.intersection(*(set(b.equality) for b in self.blocks)) if self.blocks else set()
+        return [c for c in self._union("equality") if c in common]
+
+    @property
+    def in_list(self) -> List[str]:
+        return [c for c in self._union("in_list") if c not in self.equality]
+
+    @property
+    def group_by(self) -> List[str]:
+        return self._union("group_by")
+
+    @property
+    def referenced(self) -> List[str]:
+        return self._union("referenced")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.name,
+            "equality": self.equality,
+            "in_list": self.in_list,
+            "group_by": self.group_by,
+            "referenced": self.referenced,
+        }
+
+
+def _columns_in(text: str, columns: Sequence[str]) -> List[str]:
+    found: List[str] = []
+    for name in _COLUMN_RE.findall(text):
+        if name in columns and name not in found:
+            found.append(name)
+    return found
+
+
+def parse_blocks(sql: str, columns: Sequence[str]) -> List[QueryBlock]:
+    """
+    Find every SELECT ... FROM plays_table_denorm_extra in a query.
+
+    Args:
+        sql: Query text (comments already stripped)
+        columns: Column names of the table
+
+    Returns:
+        One QueryBlock per SELECT reading the table
+    """
+    sql = _mask_literals(sql)
+    blocks = []
+    for match in _TABLE_RE.finditer(sql):
+        selects = list(_SELECT_RE.finditer(sql, 0, match.start()))
+        if not selects:
+            continue
+        select_list = sql[selects[-1].end():match.start()]
+        tail = sql[match.end():]
+        tail = tail[:_scope_end(tail)]
+
+        clauses: Dict[str, str] = {}
+        depths = _depths(tail)
+        marks = [m for m in _CLAUSE_RE.finditer(tail) if depths[m.start()] == 0]
+        for i, mark in enumerate(marks):
+            end = marks[i + 1].start() if i + 1 < len(marks) else len(tail)
+            clauses[re.sub(r"\s+", " ", mark.group(1).upper())] = tail[mark.end():end]
+
+        equality, in_list, other = [], [], []
+        for conjunct in _split_top_level(clauses.get("WHERE", ""), _AND_RE):
+            conjunct = " ".join(conjunct.split())
+            equals, listed = _EQUALS_RE.match(conjunct), _IN_LIST_RE.match(conjunct)
+            if equals and equals.group(1) in columns:
+                equality.append(equals.group(1))
+            elif listed and listed.group(1) in columns:
+                in_list.append(listed.group(1))
+            else:
+                other += _columns_in(conjunct, columns)
+
+        group_by = _columns_in(clauses.get("GROUP BY", ""), columns)
+        referenced = _columns_in(select_list + " " + " ".join(clauses.values()), columns)
+        blocks.append(QueryBlock(
+            equality=equality,
+            in_list=[c for c in in_list if c not in equality],
+            other_filters=[c for c in other if c not in equality and c not in in_list],
+            group_by=group_by,
+            referenced=referenced,
+        ))
+    return blocks
+
+
+def query_files(genders: Sequence[str]) -> List[Tuple[str, Path]]:
+    """(name, path) of every query file for the given genders, e.g. mens/team/Team-OffensiveEfficiency.sql."""
+    files = []
+    for gender in genders:
+        for path in sorted((QUERIES_ROOT / gender).glob("*/*.sql")):
+            files.append((f"{gender}/{path.parent.name}/{path.name}", path))
+    return files
+
+
+def guess_columns(files: Sequence[Tuple[str, Path]]) -> List[str]:
+    """
+    Table columns as seen in the query files, for when the database cannot be inspected:
+    lower-case identifiers that are not CTE names or table aliases.
+    """
+    names: Counter = Counter()
+    excluded = {TABLE.lower(), "as"}
+    for _, path in files:
+        sql = _mask_literals(strip_sql(path.read_text()))
+        excluded.update(name.lower() for name in _CTE_NAME_RE.findall(sql))
+        excluded.update(alias.lower() for alias in _TABLE_RE.findall(sql) if alias)
+        names.update(_COLUMN_RE.findall(sql))
+    return sorted(name for name in names if name not in excluded)
+
+
+def analyze_queries(files: Sequence[Tuple[str, Path]], columns: Sequence[str]) -> List[QueryAnalysis]:
+    """Parse every query file that reads plays_table_denorm_extra."""
+    analyses = []
+    for name, path in files:
+        blocks = parse_blocks(strip_sql(path.read_text()), columns)
+        if blocks:
+            analyses.append(QueryAnalysis(name, path, blocks))
+    return analyses
+
+
+# ==================== PROPOSALS ====================
+
+class IndexProposal:
+    """A candidate index and the queries it is meant to serve."""
+
+    def __init__(self, columns: List[str], kind: str, queries: List[str]):
+        self.columns = columns
+        self.kind = kind
+        self.queries = queries
+        self.name = index_name(columns, kind)
+        self.satisfied_by: Optional[str] = None
+        self.key_bytes: Optional[int] = None
+
+    @property
+    def too_wide(self) -> bool:
+        return self.key_bytes is not None and self.key_bytes > MAX_KEY_BYTES
+
+    def create_sql(self) -> str:
+        columns = ", ".join(f"`{c}`" for c in self.columns)
+        return f"CREATE INDEX `{self.name}` ON {TABLE} ({columns}) ALGORITHM=INPLACE LOCK=NONE"
+
+    def drop_sql(self) -> str:
+        return f"DROP INDEX `{self.name}` ON {TABLE}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "columns": self.columns,
+            "queries": self.queries,
+            "satisfied_by": self.satisfied_by,
+            "key_bytes": self.key_bytes,
+            "too_wide": self.too_wide,
+        }
+
+
+def index_name(columns: Sequence[str], kind: str) -> str:
+    """Deterministic index name, shortened with a hash to fit MySQL's identifier limit."""
+    name = f"idx_plays_{kind}_" + "_".join(columns)
+    if len(name) <= MAX_IDENTIFIER:
+        return name
+    digest = hashlib.sha1(",".join(columns).encode("utf-8")).hexdigest()[:8]
+    return f"{name[:MAX_IDENTIFIER - 9]}_{digest}"
+
+
+def _by_frequency(columns: Counter) -> List[str]:
+    return [c for c, _ in sorted(columns.items(), key=lambda item: (-item[1], item[0]))]
+
+
+def propose_indexes(analyses: Sequence[QueryAnalysis]) -> List[IndexProposal]:
+    """
+    Propose indexes for the analysed queries.
+
+    The filter index holds the columns every query compares with a constant
+    (most common first), so one index narrows every query to the season.
+    Covering indexes extend that prefix with each query's IN-list, group-by
+    and remaining columns so the query never reads the table rows; a query
+    whose columns are all in another query's covering index shares it.
+    """
+    if not analyses:
+        return []
+    counts = Counter(c for a in analyses for c in a.equality)
+    prefix = [c for c in _by_frequency(counts) if counts[c] == len(analyses)]
+
+    proposals = []
+    if prefix:
+        proposals.append(IndexProposal(prefix, "filter", [a.name for a in analyses]))
+
+    # Widest first, so narrower queries fold into an index that already covers them
+    covering: List[IndexProposal] = []
+    for analysis in sorted(analyses, key=lambda a: -len(a.referenced)):
+        rest = [c for c in analysis.equality if c not in prefix]
+        for group in (analysis.in_list, analysis.group_by, analysis.referenced):
+            rest += [c for c in group if c not in prefix and c not in rest]
+        columns = prefix + rest
+        for proposal in covering:
+            if set(columns) <= set(proposal.columns):
+                proposal.queries.append(analysis.name)
+                break
+        else:
+            covering.append(IndexProposal(columns, "cover", [analysis.name]))
+    return proposals + covering
+
+
+def check_existing(proposals: Sequence[IndexProposal], existing: Dict[str, List[str]]) -> None:
+    """
+    Mark proposals an existing index already provides: for the filter index an
+    index starting with its columns, for a covering index one that starts
+    with the same filter prefix and contains every column.
+    """
+    for proposal in proposals:
+        for name, columns in existing.items():
+            if proposal.kind == "filter":
+                satisfied = sorted(columns[:len(proposal.columns)]) == sorted(proposal.columns)
+            else:
+                prefix = proposals[0].columns if proposals[0].kind == "filter" else []
+                satisfied = (sorted(columns[:len(prefix)]) == sorted(prefix)
+                             and set(proposal.columns) <= set(columns))
+            if satisfied:
+                proposal.satisfied_by = name
+                break
+
+
+# ==================== DATABASE ====================
+
+def show_indexes(db: DatabaseManager) -> Dict[str, List[str]]:
+    """Existing indexes of the table: name -> columns in key order."""
+    indexes: Dict[str, List[Tuple[int, str]]] = {}
+    for row in db.execute_query(f"SHOW INDEX FROM {TABLE}"):
+        indexes.setdefault(row["Key_name"], []).append((int(row["Seq_in_index"]), row["Column_name"]))
+    return {name: [column for _, column in sorted(parts)] for name, parts in indexes.items()}
+
+
+def table_columns(db: DatabaseManager) -> Dict[str, int]:
+    """Column name -> maximum key bytes, from information_schema."""
+    rows = db.execute_query(
+        """
+        SELECT COLUMN_NAME AS name, DATA_TYPE AS type, CHARACTER_MAXIMUM_LENGTH AS chars,
+               CHARACTER_SET_NAME AS charset
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (TABLE,)
+    )
+    sizes = {}
+    for row in rows:
+        if row["chars"] is not None:
+            sizes[row["name"]] = int(row["chars"]) * _CHARSET_BYTES.get(row["charset"] or "utf8mb4", 4)
+        else:
+            # Numeric and temporal columns: 8 bytes is an upper bound
+            sizes[row["name"]] = 8
+    return sizes
+
+
+def _plan_keys(db: DatabaseManager, statement: str) -> List[Optional[str]]:
+    """Index chosen for each access to the table in EXPLAIN."""
+    names = {TABLE} | {alias.lower() for alias in _TABLE_RE.findall(statement) if alias}
+    rows = db.execute_query("EXPLAIN " + statement)
+    return [row.get("key") for row in rows if (row.get("table") or "").lower() in names]
+
+
+def time_queries(db: DatabaseManager, analyses: Sequence[QueryAnalysis], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Median run time and chosen index of every analysed query.
+
+    Each statement runs once untimed to warm the buffer pool, then ``repeat`` times.
+    """
+    results = {}
+    for analysis in analyses:
+        statements = split_statements(strip_sql(analysis.path.read_text()))
+        with query_label(f"index-advisor/{analysis.name}"):
+            keys: List[Optional[str]] = []
+            for statement in statements:
+                db.execute_query(statement)
+                keys += _plan_keys(db, statement)
+            times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for statement in statements:
+                    db.execute_query(statement)
+                times.append(time.perf_counter() - started)
+        results[analysis.name] = {"median_s": round(statistics.median(times), 6), "keys": keys}
+    return results
+
+
+def apply_proposals(db: DatabaseManager, proposals: Sequence[IndexProposal],
+                    analyses: Sequence[QueryAnalysis], repeat: int, min_gain: float) -> List[Dict[str, Any]]:
+    """
+    Create each missing index, re-time the queries it serves and keep it only
+    if some query got at least ``min_gain`` faster.
+
+    Returns:
+        One measurement per index tried
+    """
+    by_name = {a.name: a for a in analyses}
+    measurements = []
+    for proposal in proposals:
+        if proposal.satisfied_by or proposal.too_wide:
+            continue
+        served = [by_name[name] for name in proposal.queries if name in by_name]
+        if not served:
+            continue
+        print(f"\n🔧 {proposal.name} ({', '.join(proposal.columns)})")
+        before = time_queries(db, served, repeat)
+        started = time.perf_counter()
+        db.execute_query(proposal.create_sql())
+        db.execute_query(f"ANALYZE TABLE {TABLE}")
+        build_s = time.perf_counter() - started
+        after = time_queries(db, served, repeat)
+
+        queries = {}
+        for name in before:
+            old, new = before[name]["median_s"], after[name]["median_s"]
+            gain = (old - new) / old if old else 0.0
+            queries[name] = {
+                "before_s": old, "after_s": new, "gain": round(gain, 4),
+                "keys_before": before[name]["keys"], "keys_after": after[name]["keys"],
+            }
+            print(f"  {name:<55} {old:>8.4f}s -> {new:>8.4f}s ({gain:+.1%})  key: {after[name]['keys']}")
+
+        kept = any(q["gain"] >= min_gain for q in queries.values())
+        if not kept:
+            db.execute_query(proposal.drop_sql())
+            print(f"  ↩️  dropped: no query improved by {min_gain:.0%}")
+        else:
+            print(f"  ✅ kept (built in {build_s:.1f}s)")
+        measurements.append({"index": proposal.to_dict(), "build_s": round(build_s, 3),
+                             "kept": kept, "queries": queries})
+
+    kept_indexes = [m["index"] for m in measurements if m["kept"]]
+    for index in kept_indexes:
+        for other in kept_indexes:
+            if other is not index and other["columns"][:len(index["columns"])] == index["columns"]:
+                print(f"\nℹ️  {index['name']} is a left prefix of {other['name']} and may be redundant")
+                break
+    return measurements
+
+
+def write_migration(path: Path, proposals: Sequence[IndexProposal], database: Optional[str] = None) -> None:
+    """Write the proposed indexes as a SQL migration with a commented-out rollback."""
+    lines = [
+        f"-- plays_table_denorm_extra indexes proposed by index_advisor.py on {datetime.now().isoformat(timespec='seconds')}",
+    ]
+    if database:
+        lines.append(f"USE {database};")
+    lines.append("")
+    for proposal in proposals:
+        lines.append(f"-- {proposal.kind}: serves {', '.join(proposal.queries)}")
+        lines.append(proposal.create_sql() + ";")
+    lines += ["", "-- Rollback"]
+    lines += [f"-- {proposal.drop_sql()};" for proposal in proposals]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+
+
+# ==================== CLI ====================
+
+def advise(gender: str, db: Optional[DatabaseManager], apply: bool, repeat: int,
+           min_gain: float) -> Dict[str, Any]:
+    """Analyse one gender's queries (against its database unless db is None)."""
+    files = query_files([gender])
+    report: Dict[str, Any] = {"gender": gender, "database": db.database if db else None}
+
+    if db is None:
+        columns = guess_columns(files)
+        existing: Dict[str, List[str]] = {}
+        sizes: Dict[str, int] = {}
+    else:
+        sizes = table_columns(db)
+        columns = sorted(sizes)
+        existing = show_indexes(db)
+
+    analyses = analyze_queries(files, columns)
+    proposals = propose_indexes(analyses)
+    check_existing(proposals, existing)
+    for proposal in proposals:
+        if sizes:
+            proposal.key_bytes = sum(sizes.get(c, 0) for c in proposal.columns)
+
+    report["existing_indexes"] = existing
+    report["queries"] = [a.to_dict() for a in analyses]
+    report["proposals"] = [p.to_dict() for p in proposals]
+
+    print(f"\n📋 {gender}: {len(analyses)} queries read {TABLE}")
+    for analysis in analyses:
+        print(f"  {analysis.name:<55} = {analysis.equality}  IN {analysis.in_list}  GROUP BY {analysis.group_by}")
+    if db is not None:
+        print(f"  Existing indexes: {existing or 'none'}")
+    for proposal in proposals:
+        status = (f"already covered by {proposal.satisfied_by}" if proposal.satisfied_by
+                  else f"too wide ({proposal.key_bytes} > {MAX_KEY_BYTES} bytes)" if proposal.too_wide
+                  else "proposed")
+        print(f"  💡 {proposal.name}: ({', '.join(proposal.columns)}) - {status}, "
+              f"serves {len(proposal.queries)} quer{'y' if len(proposal.queries) == 1 else 'ies'}")
+
+    if apply and db is not None:
+        report["measurements"] = apply_proposals(db, proposals, analyses, repeat, min_gain)
+    report["_proposals"] = proposals
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=f"Propose and measure indexes for {TABLE}")
+    parser.add_argument("--gender", choices=["mens", "womens", "both"], default="both")
+    parser.add_argument("--offline", action="store_true",
+                        help="Only parse the query files; do not connect to the database")
+    parser.add_argument("--apply", action="store_true",
+                        help="Create each proposed index, time its queries before and after, keep it only if it helps")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per query")
+    parser.add_argument("--min-gain", type=float, default=0.05,
+                        help="Fraction some query must speed up by for an applied index to be kept")
+    parser.add_argument("--migration", type=Path,
+                        help="Write the proposed (or, with --apply, the kept) indexes to this SQL file")
+    parser.add_argument("--json", type=Path, help="Write the full report to this JSON file")
+    args = parser.parse_args(argv)
+
+    genders = ["mens", "womens"] if args.gender == "both" else [args.gender]
+    reports = []
+    for gender in genders:
+        db = None
+        if not args.offline:
+            db = get_mens_db() if gender == "mens" else get_womens_db()
+        if db is None:
+            reports.append(advise(gender, None, False, args.repeat, args.min_gain))
+            continue
+        try:
+            with db.connection():
+                reports.append(advise(gender, db, args.apply, args.repeat, args.min_gain))
+        except ConnectionError as e:
+            print(f"⚠️  {gender}: could not connect ({e}), analysing the query files only")
+            reports.append(advise(gender, None, False, args.repeat, args.min_gain))
+
+    if args.migration:
+        for report in reports:
+            proposals = [p for p in report["_proposals"] if not p.satisfied_by and not p.too_wide]
+            if "measurements" in report:
+                kept = {m["index"]["name"] for m in report["measurements"] if m["kept"]}
+                proposals = [p for p in proposals if p.name in kept]
+            path = args.migration
+            if len(reports) > 1:
+                path = path.with_name(f"{path.stem}_{report['gender']}{path.suffix}")
+            write_migration(path, proposals, report["database"])
+            print(f"\n📝 {len(proposals)} index(es) written to {path}")
+
+    if args.json:
+        body = [{k: v for k, v in report.items() if not k.startswith("_")} for report in reports]
+        args.json.write_text(json.dumps(body, indent=2, default=str))
+        print(f"📁 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,66 @@ RIT Basketball Statistics API
 FastAPI backend for serving basketball statistics from custom SQL queries
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
-from typing import Optional
-import os
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, List, Tuple, Dict, Any, AsyncIterator, Callable
+import asyncio
+import hashlib
+import hmac
 
+from bundles import BUNDLES, compress, negotiate_encoding, parse_datasets
+from cache_refresh import get_refresher, shutdown_refresher
+from data_versions import DataVersion, get_data_versions
+from dataset_registry import get_dataset_registry
 from queries import RITStatsQueries
-from query_executor import QueryExecutor
+from query_executor import (
+    QueryExecutor, dataset_label, invalidate_base_results, get_base_result_stats,
+    STREAM_BATCH_SIZE, PLAYER_EFFICIENCY_COLUMNS
+)
+from sql_connector import DatabaseBusyError, QueryTimeoutError, get_pool_stats, close_pools
+from query_profiler import get_profiler
+from query_templates import get_template_registry
+from result_cache import TTLCache
+from seasons import (
+    CURRENT_SEASON, DEFAULT_CONFERENCE,
+    get_season_archive, is_closed_season, normalize_conference, normalize_season
+)
+from serialization import dumps
+from single_flight import AsyncSingleFlight
+from concurrency import (
+    CancelOnDisconnect, QueryCancelledError, run_blocking, iterate_blocking, shutdown_db_executor
+)
+from config import get_settings
+
+# Read once per process; see config.py
+settings = get_settings()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (Decimals as numbers)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start warming the caches when the server starts (in the background: the
+    server accepts requests right away); on shutdown stop background refreshes
+    and the database thread pool and close pooled connections.
+    """
+    if settings.cache_warm_up:
+        get_refresher().warm_up(warm_up_tasks())
+    yield
+    shutdown_refresher()
+    shutdown_db_executor()
+    close_pools()
 
-# Load environment variables
-load_dotenv()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -21,7 +70,9 @@ app = FastAPI(
     description="API for serving RIT Men's and Women's Basketball statistics",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend access
@@ -38,6 +89,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Stop a request's in-flight query when its client disconnects
+app.add_middleware(CancelOnDisconnect)
+
+# Apply filters/ordering/limit in-process over one cached base result per gender
+IN_MEMORY_FILTERS = settings.in_memory_filters
+
+# Query results only change when new games are tagged
+result_cache = TTLCache(
+    maxsize=settings.result_cache_size,
+    ttl=settings.result_cache_ttl,
+    refresh_ahead=settings.cache_refresh_ahead
+)
+
+# Identical concurrent requests (same result cache key) share one execution
+request_flight = AsyncSingleFlight()
+
+
+def server_error(e: Exception) -> HTTPException:
+    """
+    HTTP error for a failure while serving a request: 503 with Retry-After
+    when the database is at its concurrency limit (load shedding), 504 when
+    a query hit its execution time limit, 499 when the client went away,
+    500 otherwise.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, DatabaseBusyError):
+        return HTTPException(
+            status_code=503,
+            detail=f"Database busy, retry in {e.retry_after}s",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    if isinstance(e, QueryTimeoutError):
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, QueryCancelledError):
+        return HTTPException(status_code=499, detail=str(e))
+    return HTTPException(status_code=500, detail=str(e))
+
 
 # ==================== HEALTH CHECK ====================
 
@@ -47,15 +136,180 @@ async def root():
     return {
         "status": "healthy",
         "service": "RIT Basketball Statistics API",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "connection_pools": get_pool_stats(),
+        "query_templates": get_template_registry().stats(),
+        "result_cache": result_cache.stats(),
+        "base_results": get_base_result_stats(),
+        "background_refresh": get_refresher().stats(),
+        "request_coalescing": request_flight.stats(),
+        "season_archive": get_season_archive().stats()
     }
 
 
+# ==================== SEASONS ====================
+
+CONFERENCE_DESCRIPTION = "Conference name (default: CONFERENCE setting)"
+
+
+def season_scope(season: Optional[str], conference: Optional[str]) -> Tuple[str, str]:
+    """
+    Validate the season and conference of a request.
+    
+    Every stats endpoint is served both at /api/stats/{gender}/... (season as
+    an optional query parameter, defaulting to CURRENT_SEASON) and at
+    /api/stats/{gender}/{season}/... with a season such as 2024-2025.
+    Closed seasons are answered from the immutable season archive.
+    """
+    try:
+        return normalize_season(season), normalize_conference(conference)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ==================== RESPONSES ====================
+
+def json_response(
+    content: Dict[str, Any],
+    response: Optional[Response] = None,
+    label: Optional[str] = None
+) -> Response:
+    """
+    Encode a body straight to orjson, skipping FastAPI's jsonable_encoder walk
+    over every row. Headers already set on the injected ``response`` are kept.
+    With a profiler ``label`` (see dataset_label), the encoding time and size
+    are recorded as that query's serialize phase.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    if label is None:
+        return FastJSONResponse(content, headers=headers)
+    with get_profiler().serializing(label) as profile:
+        encoded = FastJSONResponse(content, headers=headers)
+        profile["size"] = len(encoded.body)
+    return encoded
+
+
+# ==================== CONDITIONAL RESPONSES ====================
+
+# Seconds a client may reuse a current-season response before revalidating it
+HTTP_MAX_AGE = settings.http_max_age
+
+
+def _opaque_tag(etag: str) -> str:
+    """An entity tag without its weak prefix, for weak comparison."""
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def cache_headers(request: Request, version: DataVersion, immutable: bool = False) -> Dict[str, str]:
+    """
+    ETag, Last-Modified and Cache-Control for a response built from ``version``.
+    
+    The ETag combines the data version with the request path and query, so
+    each filter/page variant of the same data has its own tag. It is weak:
+    bodies are equivalent, not byte-identical (e.g. the "cached" field).
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    variant = hashlib.blake2b(f"{request.url.path}?{query}".encode("utf-8"), digest_size=8).hexdigest()
+    headers = {
+        "ETag": f'W/"{version.token}-{variant}"',
+        "Cache-Control": "public, max-age=31536000, immutable" if immutable
+                         else f"public, max-age={HTTP_MAX_AGE}, must-revalidate",
+    }
+    if version.last_modified is not None:
+        headers["Last-Modified"] = formatdate(version.last_modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, version: DataVersion, etag: str) -> bool:
+    """
+    True if the client's copy is current: If-None-Match lists the ETag, or
+    (without If-None-Match) If-Modified-Since is not older than the data.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        return "*" in tags or _opaque_tag(etag) in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and version.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return int(version.last_modified) <= since
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    version: Optional[DataVersion],
+    immutable: bool = False
+) -> Optional[Response]:
+    """
+    Attach caching headers for ``version`` to ``response``.
+    
+    Returns:
+        A bodiless 304 response if the client's copy is current, else None
+        (the handler goes on to build the body)
+    """
+    if version is None:
+        return None
+    headers = cache_headers(request, version, immutable)
+    if is_not_modified(request, version, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 # ==================== TEAM OFFENSIVE EFFICIENCY ====================
 
+def team_efficiency_cache_key(
+    gender: str,
+    season: str,
+    conference: str,
+    include_percentiles: bool,
+    play_types: Optional[List[str]],
+    team: Optional[str],
+    order_by: str,
+    order_direction: str,
+    limit: Optional[int],
+    version: Optional[str] = None
+) -> Tuple:
+    """
+    Normalize team offensive efficiency parameters into a result cache key.
+
+    ``version`` is the base result's data version token when the response is
+    filtered from it: a re-materialized base result then gets new cache
+    entries, so a body is never served under an ETag it does not match.
+    """
+    return (
+        "team-offensive-efficiency",
+        gender,
+        season,
+        conference,
+        include_percentiles,
+        tuple(sorted(set(play_types))) if play_types else None,
+        team,
+        order_by.strip().upper(),
+        order_direction,
+        limit,
+        version
+    )
+
+
 @app.get("/api/stats/{gender}/teams/offensive-efficiency", tags=["Team Statistics"])
+@app.get("/api/stats/{gender}/{season}/teams/offensive-efficiency", tags=["Team Statistics"])
 async def get_team_offensive_efficiency(
+    request: Request,
+    response: Response,
     gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
     include_percentiles: bool = Query(True, description="Include percentile ranking columns"),
     play_types: Optional[str] = Query(None, description="Comma-separated play types (e.g., 'Transition,PickAndRoll')"),
     team: Optional[str] = Query(None, description="Filter by team name"),
@@ -78,74 +332,506 @@ async def get_team_offensive_efficiency(
     if order_direction.upper() not in ["ASC", "DESC"]:
         raise HTTPException(status_code=400, detail="order_direction must be 'ASC' or 'DESC'")
     
+    season, conference = season_scope(season, conference)
+    play_types_list = [pt.strip() for pt in play_types.split(",") if pt.strip()] if play_types else None
+    order_direction = order_direction.upper()
+    
     try:
-        executor = QueryExecutor(gender)
-        play_types_list = [pt.strip() for pt in play_types.split(",")] if play_types else None
+        executor = QueryExecutor(
+            gender, in_memory_filters=IN_MEMORY_FILTERS, season=season, conference=conference
+        )
+        # Filters are answered from the cached base result, so its version
+        # decides a 304 before anything is filtered or serialized
+        in_memory = IN_MEMORY_FILTERS or executor.closed
+        version = None
+        if in_memory:
+            version = await run_blocking(executor.data_version, "team-offensive-efficiency")
+            not_modified = conditional_response(request, response, version, executor.closed)
+            if not_modified:
+                return not_modified
         
-        data = executor.execute_team_offensive_efficiency(
-            include_percentiles=include_percentiles,
-            play_types=play_types_list,
-            team_filter=team,
-            order_by=order_by,
-            order_direction=order_direction.upper(),
-            limit=limit
+        cache_key = team_efficiency_cache_key(
+            gender, season, conference, include_percentiles, play_types_list, team,
+            order_by, order_direction, limit, version and version.token
         )
         
-        return {
+        data = result_cache.get(cache_key)
+        cached = data is not None
+        if not cached:
+            async def execute() -> List[Dict[str, Any]]:
+                rows = await run_blocking(
+                    executor.execute_team_offensive_efficiency,
+                    include_percentiles=include_percentiles,
+                    play_types=play_types_list,
+                    team_filter=team,
+                    order_by=order_by,
+                    order_direction=order_direction,
+                    limit=limit
+                )
+                result_cache.set(cache_key, rows)
+                return rows
+            
+            data, _ = await request_flight.do(cache_key, execute)
+        
+        if not in_memory:
+            # Without a base result the body must be built to know its version
+            not_modified = conditional_response(request, response, DataVersion.of(data))
+            if not_modified:
+                return not_modified
+        
+        return json_response({
             "success": True,
             "gender": gender,
+            "season": season,
+            "conference": conference,
             "query": "team-offensive-efficiency",
             "filters": {
                 "include_percentiles": include_percentiles,
                 "play_types": play_types_list,
                 "team": team,
                 "order_by": order_by,
-                "order_direction": order_direction.upper(),
+                "order_direction": order_direction,
                 "limit": limit
             },
+            "cached": cached,
             "row_count": len(data),
             "data": data
-        }
+        }, response, dataset_label(gender, "team-offensive-efficiency"))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise server_error(e)
+
+
+# ==================== PLAYER LEADERBOARDS ====================
+
+async def dataset_page(
+    request: Request,
+    response: Response,
+    gender: str,
+    dataset: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    play_types: Optional[str] = None,
+    team: Optional[str] = None,
+    player: Optional[str] = None,
+    order_by: Optional[str] = None,
+    order_direction: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = 50
+) -> dict:
+    """
+    Serve one keyset-paginated page of a dataset from its cached, pre-sorted
+    base result.
+    
+    Without order_by, rows keep the dataset's default order (order_direction
+    DESC reverses it); with order_by, the default direction is DESC.
+    """
+    if gender not in ["mens", "womens"]:
+        raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
+    
+    order_direction = (order_direction or ("DESC" if order_by else "ASC")).upper()
+    if order_direction not in ["ASC", "DESC"]:
+        raise HTTPException(status_code=400, detail="order_direction must be 'ASC' or 'DESC'")
+    
+    season, conference = season_scope(season, conference)
+    play_types_list = [pt.strip() for pt in play_types.split(",") if pt.strip()] if play_types else None
+    
+    try:
+        executor = QueryExecutor(gender, season=season, conference=conference)
+        version = await run_blocking(executor.data_version, dataset)
+        not_modified = conditional_response(request, response, version, executor.closed)
+        if not_modified:
+            return not_modified
+        data, next_cursor = await run_blocking(
+            executor.page_dataset,
+            dataset,
+            columns=columns,
+            play_types=play_types_list,
+            team_filter=team,
+            player_filter=player,
+            order_by=order_by,
+            order_direction=order_direction,
+            after=cursor,
+            page_size=page_size
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise server_error(e)
+    
+    return json_response({
+        "success": True,
+        "gender": gender,
+        "season": season,
+        "conference": conference,
+        "query": dataset,
+        "filters": {
+            "play_types": play_types_list,
+            "team": team,
+            "player": player,
+            "order_by": order_by,
+            "order_direction": order_direction
+        },
+        "page": {
+            "size": page_size,
+            "cursor": cursor,
+            "next_cursor": next_cursor
+        },
+        "row_count": len(data),
+        "data": data
+    }, response, dataset_label(gender, dataset))
+
+
+@app.get("/api/stats/{gender}/players/offensive-efficiency", tags=["Player Statistics"])
+@app.get("/api/stats/{gender}/{season}/players/offensive-efficiency", tags=["Player Statistics"])
+async def get_player_offensive_efficiency(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    include_percentiles: bool = Query(True, description="Include percentile ranking columns"),
+    play_types: Optional[str] = Query(None, description="Comma-separated play types"),
+    team: Optional[str] = Query(None, description="Filter by team name"),
+    player: Optional[str] = Query(None, description="Filter by player name (partial match)"),
+    order_by: str = Query("PLAY_COUNT", description="Column to sort by"),
+    order_direction: str = Query("DESC", description="ASC or DESC"),
+    page_size: int = Query(50, ge=1, le=500, description="Rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Player offensive efficiency by play type, paginated with a cursor."""
+    return await dataset_page(
+        request, response, gender, "player-offensive-efficiency",
+        season=season, conference=conference,
+        columns=None if include_percentiles else PLAYER_EFFICIENCY_COLUMNS,
+        play_types=play_types, team=team, player=player,
+        order_by=order_by, order_direction=order_direction,
+        cursor=cursor, page_size=page_size
+    )
+
+
+@app.get("/api/stats/{gender}/players/shot-location-efficiency", tags=["Player Statistics"])
+@app.get("/api/stats/{gender}/{season}/players/shot-location-efficiency", tags=["Player Statistics"])
+async def get_player_shot_location_efficiency(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    team: Optional[str] = Query(None, description="Filter by team name"),
+    player: Optional[str] = Query(None, description="Filter by player name (partial match)"),
+    order_by: Optional[str] = Query(None, description="Column to sort by (default: most total shots first)"),
+    order_direction: Optional[str] = Query(None, description="ASC or DESC"),
+    page_size: int = Query(50, ge=1, le=500, description="Rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Player shooting efficiency by court zone with percentiles, paginated with a cursor."""
+    return await dataset_page(
+        request, response, gender, "player-shot-location-efficiency",
+        season=season, conference=conference,
+        team=team, player=player,
+        order_by=order_by, order_direction=order_direction,
+        cursor=cursor, page_size=page_size
+    )
+
+
+@app.get("/api/stats/{gender}/players/shot-location-frequency", tags=["Player Statistics"])
+@app.get("/api/stats/{gender}/{season}/players/shot-location-frequency", tags=["Player Statistics"])
+async def get_player_shot_location_frequency(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    team: Optional[str] = Query(None, description="Filter by team name"),
+    player: Optional[str] = Query(None, description="Filter by player name (partial match)"),
+    order_by: Optional[str] = Query(None, description="Column to sort by (default: TOTAL_SHOTS descending)"),
+    order_direction: Optional[str] = Query(None, description="ASC or DESC"),
+    page_size: int = Query(50, ge=1, le=500, description="Rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Player shot counts by court zone, paginated with a cursor."""
+    return await dataset_page(
+        request, response, gender, "player-shot-location-frequency",
+        season=season, conference=conference,
+        team=team, player=player,
+        order_by=order_by, order_direction=order_direction,
+        cursor=cursor, page_size=page_size
+    )
+
+
+@app.get("/api/stats/{gender}/players/playtype-shot-frequency", tags=["Player Statistics"])
+@app.get("/api/stats/{gender}/{season}/players/playtype-shot-frequency", tags=["Player Statistics"])
+async def get_player_playtype_shot_frequency(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    play_types: Optional[str] = Query(None, description="Comma-separated play types"),
+    team: Optional[str] = Query(None, description="Filter by team name"),
+    player: Optional[str] = Query(None, description="Filter by player name (partial match)"),
+    order_by: Optional[str] = Query(None, description="Column to sort by (default: PLAYER, then TOTAL_SHOTS descending)"),
+    order_direction: Optional[str] = Query(None, description="ASC or DESC"),
+    page_size: int = Query(50, ge=1, le=500, description="Rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Player shot counts by court zone and play type, paginated with a cursor."""
+    return await dataset_page(
+        request, response, gender, "player-playtype-shot-frequency",
+        season=season, conference=conference,
+        play_types=play_types, team=team, player=player,
+        order_by=order_by, order_direction=order_direction,
+        cursor=cursor, page_size=page_size
+    )
+
+
+# ==================== DATASETS ====================
+
+@app.get("/api/stats/{gender}/datasets/{dataset}", tags=["Datasets"])
+@app.get("/api/stats/{gender}/{season}/datasets/{dataset}", tags=["Datasets"])
+async def get_dataset(
+    request: Request,
+    response: Response,
+    gender: str,
+    dataset: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    play_types: Optional[str] = Query(None, description="Comma-separated play types (datasets with PLAY_TYPE)"),
+    team: Optional[str] = Query(None, description="Filter by team name (datasets with TEAM)"),
+    player: Optional[str] = Query(None, description="Filter by player name (datasets with PLAYER)"),
+    order_by: Optional[str] = Query(None, description="Column to sort by (default: the query file's order)"),
+    order_direction: Optional[str] = Query(None, description="ASC or DESC"),
+    page_size: int = Query(50, ge=1, le=500, description="Rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    Any dataset in the registry, paginated with a cursor.
+    
+    Every .sql template under queries/{gender}/{category} is a dataset
+    (see /metadata/datasets), served from its cached base result.
+    """
+    if dataset not in get_dataset_registry():
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+    return await dataset_page(
+        request, response, gender, dataset,
+        season=season, conference=conference,
+        play_types=play_types, team=team, player=player,
+        order_by=order_by, order_direction=order_direction,
+        cursor=cursor, page_size=page_size
+    )
+
+
+# ==================== STREAMING ====================
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+async def encode_stream(
+    first: List[Dict[str, Any]],
+    rest: AsyncIterator[List[Dict[str, Any]]],
+    fmt: str,
+    label: str
+) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as they arrive: one JSON object per line for ndjson,
+    or the pieces of a single JSON array for json. Each batch becomes one chunk,
+    and its encoding is recorded as the serialize phase of profiler ``label``.
+    """
+    profiler = get_profiler()
+
+    async def batches():
+        yield first
+        async for batch in rest:
+            yield batch
+    
+    if fmt == "json":
+        yield b"["
+    separator = b""
+    async for batch in batches():
+        if not batch:
+            continue
+        with profiler.serializing(label) as profile:
+            if fmt == "ndjson":
+                chunk = b"".join(dumps(row) + b"\n" for row in batch)
+            else:
+                chunk = separator + b",".join(dumps(row) for row in batch)
+                separator = b","
+            profile["size"] = len(chunk)
+        yield chunk
+    if fmt == "json":
+        yield b"]"
+
+
+@app.get("/api/stream/{gender}/{dataset}", tags=["Streaming"])
+@app.get("/api/stream/{gender}/{season}/{dataset}", tags=["Streaming"])
+async def stream_dataset(
+    gender: str,
+    dataset: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    format: str = Query("ndjson", description="ndjson (one row per line) or json (a chunked JSON array)"),
+    batch_size: int = Query(STREAM_BATCH_SIZE, ge=1, le=10000, description="Rows per database round trip")
+):
+    """
+    Stream a full dataset row by row from a server-side cursor.
+    
+    Memory use and time to first byte stay flat as the dataset grows.
+    Any dataset in the registry can be streamed (see /metadata/datasets).
+    """
+    if gender not in ["mens", "womens"]:
+        raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
+    
+    if dataset not in get_dataset_registry():
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+    
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'json'")
+    
+    season, conference = season_scope(season, conference)
+    executor = QueryExecutor(gender, season=season, conference=conference)
+    batches = iterate_blocking(executor.stream_dataset(dataset, batch_size))
+    
+    # Run the query before answering so failures still get a proper status code
+    try:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = []
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
+    
+    return StreamingResponse(
+        encode_stream(first, batches, format, dataset_label(gender, dataset)),
+        media_type=STREAM_MEDIA_TYPES[format]
+    )
 
 
 # ==================== METADATA ====================
 
+# Metadata list -> QueryExecutor method that queries it
+METADATA_METHODS = {
+    "play-types": "get_available_play_types",
+    "teams": "get_available_teams",
+}
+
+
+def load_metadata(key: Tuple[str, str, str, str]) -> List[str]:
+    """
+    Query a metadata list on a new executor and record its data version.
+
+    Args:
+        key: (metadata list, gender, season, conference)
+    """
+    name, gender, season, conference = key
+    executor = QueryExecutor(gender, season=season, conference=conference)
+    values = getattr(executor, METADATA_METHODS[name])()
+    get_data_versions().observe(key, values)
+    return values
+
+
+def refresh_metadata(key: Tuple[str, str, str, str]) -> None:
+    """Re-query a metadata list and replace its cached value."""
+    result_cache.set(key, load_metadata(key))
+
+
+def cached_metadata(key: Tuple[str, str, str, str]) -> Tuple[List[str], DataVersion]:
+    """
+    A metadata list from the result cache (queried on a miss) and its data version.
+
+    A current-season list close to expiry is still returned, and refreshed
+    in the background.
+
+    Args:
+        key: (metadata list, gender, season, conference)
+    """
+    values, cached = result_cache.get_or_compute(key, lambda: load_metadata(key))
+    if cached and not is_closed_season(key[2]) and result_cache.due_for_refresh(key):
+        get_refresher().schedule(key, lambda: refresh_metadata(key))
+    return values, get_data_versions().get(key)
+
+
 @app.get("/api/stats/{gender}/metadata/play-types", tags=["Metadata"])
-async def get_available_play_types(gender: str):
-    """Get available play types for filtering."""
+@app.get("/api/stats/{gender}/{season}/metadata/play-types", tags=["Metadata"])
+async def get_available_play_types(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION)
+):
+    """Get the season's play types for filtering."""
     if gender not in ["mens", "womens"]:
         raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
     
+    season, conference = season_scope(season, conference)
     try:
-        executor = QueryExecutor(gender)
-        return {
+        play_types, version = await run_blocking(cached_metadata, ("play-types", gender, season, conference))
+        not_modified = conditional_response(request, response, version, is_closed_season(season))
+        if not_modified:
+            return not_modified
+        return json_response({
             "success": True,
             "gender": gender,
-            "play_types": executor.get_available_play_types()
-        }
+            "season": season,
+            "conference": conference,
+            "play_types": play_types
+        }, response, dataset_label(gender, "play-types"))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @app.get("/api/stats/{gender}/metadata/teams", tags=["Metadata"])
-async def get_available_teams_list(gender: str):
-    """Get available teams for filtering."""
+@app.get("/api/stats/{gender}/{season}/metadata/teams", tags=["Metadata"])
+async def get_available_teams_list(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION)
+):
+    """Get the season's teams for filtering."""
     if gender not in ["mens", "womens"]:
         raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
     
+    season, conference = season_scope(season, conference)
     try:
-        executor = QueryExecutor(gender)
-        return {
+        teams, version = await run_blocking(cached_metadata, ("teams", gender, season, conference))
+        not_modified = conditional_response(request, response, version, is_closed_season(season))
+        if not_modified:
+            return not_modified
+        return json_response({
             "success": True,
             "gender": gender,
-            "teams": executor.get_available_teams()
-        }
+            "season": season,
+            "conference": conference,
+            "teams": teams
+        }, response, dataset_label(gender, "teams"))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
+
+
+@app.get("/api/stats/{gender}/metadata/datasets", tags=["Metadata"])
+async def get_available_datasets(gender: str):
+    """Get every dataset in the registry and the query template it runs."""
+    if gender not in ["mens", "womens"]:
+        raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
+    
+    return {
+        "success": True,
+        "gender": gender,
+        "datasets": [spec.describe() for _, spec in get_dataset_registry().items()]
+    }
 
 
 @app.get("/api/stats/{gender}/metadata/tables", tags=["Metadata"])
@@ -159,10 +845,251 @@ async def get_available_tables(gender: str):
         return {
             "success": True,
             "gender": gender,
-            "tables": queries.get_available_tables()
+            "tables": await run_blocking(queries.get_available_tables)
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
+
+
+# ==================== BUNDLES ====================
+
+def resolve_bundle_dataset(
+    gender: str, season: str, conference: str, dataset: str
+) -> Tuple[Dict[str, Any], Optional[DataVersion]]:
+    """
+    One dataset of a bundle and its data version.
+
+    Each call gets its own executor, so concurrent calls run on separate
+    pooled connections. Full datasets come from the cached base results and
+    metadata lists from the result cache; only misses query the database.
+    """
+    if dataset == "play-types":
+        values, version = cached_metadata(("play-types", gender, season, conference))
+        return {"play_types": values}, version
+    if dataset == "teams":
+        values, version = cached_metadata(("teams", gender, season, conference))
+        return {"teams": values}, version
+    rows, version = QueryExecutor(gender, season=season, conference=conference).full_dataset(dataset)
+    return {"query": dataset, "row_count": len(rows), "data": rows}, version
+
+
+def bundle_version(versions: List[Optional[DataVersion]]) -> Optional[DataVersion]:
+    """Combined version of a bundle: changes whenever any of its datasets does."""
+    if any(version is None for version in versions):
+        return None
+    token = hashlib.blake2b(
+        "-".join(version.token for version in versions).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    modified = [version.last_modified for version in versions]
+    return DataVersion(token, None if None in modified else max(modified))
+
+
+@app.get("/api/stats/{gender}/bundle", tags=["Bundles"])
+@app.get("/api/stats/{gender}/{season}/bundle", tags=["Bundles"])
+async def get_bundle(
+    request: Request,
+    response: Response,
+    gender: str,
+    season: Optional[str] = None,
+    conference: Optional[str] = Query(None, description=CONFERENCE_DESCRIPTION),
+    datasets: str = Query(..., description="Comma-separated datasets and/or bundles ('team', 'player')")
+):
+    """
+    Several full datasets in one compressed response.
+
+    - **datasets**: Dataset names (as in /api/stream, plus play-types and
+      teams) or the page bundles `team` and `player`
+
+    Uncached datasets are queried concurrently, each on its own pooled
+    connection. The body maps each dataset name to its rows (or metadata
+    list) and is compressed with br or gzip per Accept-Encoding.
+    """
+    if gender not in ["mens", "womens"]:
+        raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
+
+    season, conference = season_scope(season, conference)
+    try:
+        names = parse_datasets(datasets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        parts = await asyncio.gather(*(
+            run_blocking(resolve_bundle_dataset, gender, season, conference, name) for name in names
+        ))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise server_error(e)
+
+    version = bundle_version([part_version for _, part_version in parts])
+    not_modified = conditional_response(request, response, version, is_closed_season(season))
+    if not_modified:
+        not_modified.headers["Vary"] = "Accept-Encoding"
+        return not_modified
+
+    # The encoded body is cached per data version, so a bundle is compressed once
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    cache_key = ("bundle", gender, season, conference, tuple(names), version and version.token, encoding)
+    body = result_cache.get(cache_key) if version else None
+    if body is None:
+        payload = {
+            "success": True,
+            "gender": gender,
+            "season": season,
+            "conference": conference,
+            "datasets": {name: content for name, (content, _) in zip(names, parts)}
+        }
+
+        def encode_body() -> bytes:
+            with get_profiler().serializing(f"{gender}/bundle") as profile:
+                encoded = compress(dumps(payload), encoding)
+                profile["size"] = len(encoded)
+            return encoded
+
+        async def encode() -> bytes:
+            encoded = await run_in_threadpool(encode_body)
+            if version:
+                result_cache.set(cache_key, encoded)
+            return encoded
+
+        if version:
+            body, _ = await request_flight.do(cache_key, encode)
+        else:
+            body = await encode()
+
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# ==================== WARM-UP ====================
+
+# Datasets the leaderboard pages load first, warmed at startup
+WARM_UP_DATASETS = [
+    dataset for dataset in dict.fromkeys(BUNDLES["team"] + BUNDLES["player"])
+    if dataset not in METADATA_METHODS
+]
+
+
+def warm_dataset(gender: str, dataset: str) -> None:
+    """
+    Materialize a dataset's base result; for team offensive efficiency also
+    cache the default response with and without percentile columns.
+    """
+    executor = QueryExecutor(
+        gender, in_memory_filters=IN_MEMORY_FILTERS, season=CURRENT_SEASON, conference=DEFAULT_CONFERENCE
+    )
+    executor.refresh_base_result(dataset)
+    if dataset != "team-offensive-efficiency":
+        return
+    version = executor.data_version(dataset) if executor.in_memory_filters or executor.closed else None
+    for include_percentiles in (True, False):
+        key = team_efficiency_cache_key(
+            gender, CURRENT_SEASON, DEFAULT_CONFERENCE, include_percentiles,
+            None, None, "PLAY_COUNT", "DESC", None, version and version.token
+        )
+        result_cache.set(key, executor.execute_team_offensive_efficiency(include_percentiles=include_percentiles))
+
+
+def warm_up_tasks() -> List[Tuple[Tuple, Callable[[], None]]]:
+    """Startup warm-up: the pages' datasets and metadata lists, both genders, current season."""
+    tasks = []
+    for gender in ["mens", "womens"]:
+        for dataset in WARM_UP_DATASETS:
+            tasks.append((
+                ("warm-up", gender, dataset),
+                lambda gender=gender, dataset=dataset: warm_dataset(gender, dataset)
+            ))
+        for name in METADATA_METHODS:
+            key = (name, gender, CURRENT_SEASON, DEFAULT_CONFERENCE)
+            tasks.append((("warm-up",) + key, lambda key=key: refresh_metadata(key)))
+    return tasks
+
+
+# ==================== ADMIN ====================
+
+def require_admin(x_admin_token: Optional[str]) -> None:
+    """
+    Reject the request unless it carries ADMIN_TOKEN.
+
+    Fails closed: without a configured ADMIN_TOKEN the admin and debug
+    endpoints are disabled.
+    """
+    admin_token = get_settings().admin_token
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/api/admin/cache/invalidate", tags=["Admin"])
+async def invalidate_result_cache(
+    gender: Optional[str] = Query(None, description="Only invalidate entries for 'mens' or 'womens'"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Drop cached query results, e.g. after new games are tagged.
+    
+    Requires the `X-Admin-Token` header to match `ADMIN_TOKEN`.
+    """
+    require_admin(x_admin_token)
+    
+    if gender is not None and gender not in ["mens", "womens"]:
+        raise HTTPException(status_code=400, detail="Gender must be 'mens' or 'womens'")
+    
+    removed = result_cache.invalidate(
+        (lambda key: key[1] == gender) if gender else None
+    )
+    base_removed = invalidate_base_results(gender)
+    return {
+        "success": True,
+        "gender": gender,
+        "invalidated": removed,
+        "base_results_invalidated": base_removed
+    }
+
+
+
+# ==================== DEBUG ====================
+
+@app.get("/api/debug/queries", tags=["Debug"])
+async def get_query_profile(
+    limit: int = Query(50, ge=1, le=1000, description="Number of recent queries to return"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Per-query timings: totals per query template (connect, execute, fetch and
+    serialize time, row counts) plus the most recent executions, including
+    EXPLAIN ANALYZE output for slow queries when QUERY_EXPLAIN is enabled.
+    
+    Requires the `X-Admin-Token` header to match `ADMIN_TOKEN`.
+    """
+    require_admin(x_admin_token)
+    profiler = get_profiler()
+    return {
+        "enabled": profiler.enabled,
+        "explain_enabled": profiler.explain_enabled,
+        "explain_threshold_seconds": profiler.explain_threshold,
+        "summary": profiler.summary(),
+        "recent": profiler.recent(limit)
+    }
+
+
+@app.post("/api/debug/queries/reset", tags=["Debug"])
+async def reset_query_profile(x_admin_token: Optional[str] = Header(None)):
+    """
+    Clear the recorded query timings.
+    
+    Requires the `X-Admin-Token` header to match `ADMIN_TOKEN`.
+    """
+    require_admin(x_admin_token)
+    get_profiler().reset()
+    return {"success": True}
 
 
 # ==================== RUN SERVER ====================
@@ -170,8 +1097,4 @@ async def get_available_tables(gender: str):
 if __name__ == "__main__":
     import uvicorn
     
-    host = os.getenv("API_HOST", "0.0.0.0")
-    port = int(os.getenv("API_PORT", 8000))
-    debug = os.getenv("DEBUG", "True").lower() == "true"
-    
-    uvicorn.run("main:app", host=host, port=port, reload=debug)
+    uvicorn.run("main:app", host=settings.api_host, port=settings.api_port, reload=settings.debug)
@@ -62,8 +62,8 @@ WITH period_stats AS (
         COUNT(*) AS TOTAL_PLAYS,
         
         -- ADJUSTED RATES PER 100 PLAYS
-        ROUND((SUM(CASE WHEN outcome = 'Turnover' THEN 1 ELSE 0 END) / COUNT(*) * 100), 1) AS "ADJ_TO%",
-        ROUND((SUM(CASE WHEN outcome = 'Foul' THEN 1 ELSE 0 END) / COUNT(*) * 100), 1) AS "ADJ_FD%"
+        ROUND((SUM(CASE WHEN outcome = 'Turnover' THEN 1 ELSE 0 END) / COUNT(*) * 100), 1) AS `ADJ_TO%`,
+        ROUND((SUM(CASE WHEN outcome = 'Foul' THEN 1 ELSE 0 END) / COUNT(*) * 100), 1) AS `ADJ_FD%`
         
     FROM 
         plays_table_denorm_extra p
@@ -85,8 +85,8 @@ ranked_stats AS (
     SELECT *,
         RANK() OVER (PARTITION BY PERIOD ORDER BY TURNOVERS) AS TO_RANK,
         RANK() OVER (PARTITION BY PERIOD ORDER BY FLS_DRAWN) AS FOUL_RANK,
-        RANK() OVER (PARTITION BY PERIOD ORDER BY "ADJ_TO%") AS ADJ_TO_RANK,
-        RANK() OVER (PARTITION BY PERIOD ORDER BY "ADJ_FD%") AS ADJ_FD_RANK
+        RANK() OVER (PARTITION BY PERIOD ORDER BY `ADJ_TO%`) AS ADJ_TO_RANK,
+        RANK() OVER (PARTITION BY PERIOD ORDER BY `ADJ_FD%`) AS ADJ_FD_RANK
     FROM period_stats
     WHERE PERIOD IS NOT NULL
 )
@@ -101,10 +101,10 @@ SELECT
     `3PA`,
     `3P%`,
     TURNOVERS,
-    "ADJ_TO%",
+    `ADJ_TO%`,
     ADJ_TO_RANK,
 	FLS_DRAWN,
-    "ADJ_FD%",
+    `ADJ_FD%`,
     ADJ_FD_RANK
 FROM ranked_stats
 -- HAVING
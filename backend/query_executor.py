@@ -3,28 +3,131 @@ Dynamic Query Executor for RIT Basketball Statistics
 Loads SQL files and modifies final SELECT statements based on parameters
 """
 
-import os
-import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, ContextManager, Iterator, Optional, Tuple
 from pathlib import Path
+from cache_refresh import get_refresher
+from config import get_settings
+from data_versions import DataVersion, get_data_versions
+from dataset_registry import get_dataset_registry
+from query_profiler import query_label
 from sql_connector import DatabaseManager, get_mens_db, get_womens_db
+from query_templates import SQLTemplate, extract_cte_and_final_select, get_template_registry
+from result_cache import TTLCache
+from result_frame import ResultFrame
+from seasons import get_season_archive, is_closed_season, normalize_conference, normalize_season
+
+
+TEAM_EFFICIENCY_COLUMNS = ["PLAY_TYPE", "TEAM", "PPP", "2PA", "2PM", "2P%", "3PA", "3PM", "3P%", "PLAY_COUNT"]
+PLAYER_EFFICIENCY_COLUMNS = ["PLAY_TYPE", "PLAYER", "TEAM", "PPP", "2PA", "2PM", "2P%", "3PA", "3PM", "3P%", "PLAY_COUNT"]
+
+# Result columns a dynamic SELECT may reference, keyed by upper-cased name
+_ALLOWED_COLUMNS = {
+    column.upper(): column
+    for column in PLAYER_EFFICIENCY_COLUMNS + ["PPP_PERCENTILE", "2P%_PERCENTILE", "3P%_PERCENTILE"]
+}
+
+
+def _quote_column(name: str) -> str:
+    """
+    Backquote a whitelisted result column for a parameterized query.
+    
+    Raises:
+        ValueError: If the column is not a known result column
+    """
+    column = _ALLOWED_COLUMNS.get(name.strip().strip('`').upper())
+    if column is None:
+        raise ValueError(f"Unknown column: {name}")
+    return "`" + column.replace("%", "%%") + "`"
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so a filter value matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Rows fetched per round trip when streaming a dataset
+STREAM_BATCH_SIZE = get_settings().stream_batch_size
+
+# Unfiltered base results, materialized once per gender/season/template for in-memory filtering
+_base_results = TTLCache(
+    maxsize=64,
+    ttl=get_settings().base_result_ttl,
+    refresh_ahead=get_settings().cache_refresh_ahead
+)
+
+
+def dataset_label(gender: str, dataset: str) -> str:
+    """
+    Profiler label for a dataset: the query template it comes from
+    (e.g. mens/team/Team-OffensiveEfficiency.sql), or mens/metadata/<dataset>.
+    """
+    registry = get_dataset_registry()
+    if dataset in registry:
+        return f"{gender}/{registry.get(dataset).template_path}"
+    return f"{gender}/metadata/{dataset}"
+
+
+def invalidate_base_results(gender: Optional[str] = None) -> int:
+    """Drop materialized base results (for one gender, or all if None)."""
+    return _base_results.invalidate((lambda key: key[0] == gender) if gender else None)
+
+
+def get_base_result_stats() -> Dict[str, Any]:
+    """Statistics for the materialized base result cache."""
+    return _base_results.stats()
+
+
+def refresh_base_result(gender: str, season: str, conference: str, dataset: str) -> None:
+    """Re-run a dataset's query on a new executor and replace its base result."""
+    QueryExecutor(gender, season=season, conference=conference).refresh_base_result(dataset)
 
 
 class QueryExecutor:
     """Executes SQL queries from files with dynamic modifications."""
 
-    def __init__(self, gender: str = "mens"):
+    def __init__(self, gender: str = "mens", in_memory_filters: bool = False,
+                 season: Optional[str] = None, conference: Optional[str] = None):
         """
         Initialize the query executor.
         
         Args:
             gender: Either "mens" or "womens"
+            in_memory_filters: Answer filter/sort/limit variants from a cached,
+                               unfiltered base result instead of re-querying MySQL
+            season: Season such as '2024-2025' (None = CURRENT_SEASON)
+            conference: Conference name (None = CONFERENCE)
+            
+        Raises:
+            ValueError: If the season or conference is invalid
         """
         self.gender = gender.lower()
+        self.in_memory_filters = in_memory_filters
+        self.season = normalize_season(season)
+        self.conference = normalize_conference(conference)
+        # Closed seasons never change: they are served from the season archive
+        self.closed = is_closed_season(self.season)
         self.db = get_mens_db() if self.gender == "mens" else get_womens_db()
         
         # Base path for queries
         self.queries_path = Path(__file__).parent / "queries" / self.gender
+        self.templates = get_template_registry()
+
+    def _profiled(self, dataset: str) -> ContextManager[None]:
+        """Label the queries run inside the block with the dataset's template."""
+        return query_label(dataset_label(self.gender, dataset))
+
+    def _get_template(self, category: str, filename: str) -> SQLTemplate:
+        """
+        Get a parsed SQL template from the process-wide registry.
+        
+        Args:
+            category: 'team', 'player', or 'situation'
+            filename: Name of the SQL file
+            
+        Returns:
+            Parsed template with its CTE portion and final table name
+        """
+        return self.templates.get(self.gender, category, filename)
 
     def _load_query_file(self, category: str, filename: str) -> str:
         """
@@ -37,12 +140,7 @@ class QueryExecutor:
         Returns:
             Contents of the SQL file
         """
-        file_path = self.queries_path / category / filename
-        if not file_path.exists():
-            raise FileNotFoundError(f"Query file not found: {file_path}")
-        
-        with open(file_path, 'r') as f:
-            return f.read()
+        return self._get_template(category, filename).raw
 
     def _extract_cte_and_final_select(self, query: str) -> Tuple[str, str]:
         """
@@ -51,28 +149,227 @@ class QueryExecutor:
         Returns:
             Tuple of (cte_portion, final_table_name)
         """
-        # Remove comments
-        query = re.sub(r'--.*?$', '', query, flags=re.MULTILINE)
-        # Remove USE statements
-        query = re.sub(r'USE\s+\w+;?\s*', '', query, flags=re.IGNORECASE)
-        query = query.strip()
+        return extract_cte_and_final_select(query)
+
+    def _get_base_frame(self, dataset: str) -> ResultFrame:
+        """
+        Get the full, default-ordered result of a dataset, materializing it on first use.
+        
+        Args:
+            dataset: Name of a dataset in the dataset registry
+            
+        Returns:
+            ResultFrame over every row of the dataset
+        """
+        key = (self.gender, self.season, self.conference, dataset)
+        frame, cached = _base_results.get_or_compute(key, lambda: self._materialize(dataset))
+        if cached and not self.closed and _base_results.due_for_refresh(key):
+            # Serve these rows; a background refresh replaces them before they expire
+            get_refresher().schedule(("base",) + key, lambda: refresh_base_result(*key))
+        return frame
+
+    def _materialize(self, dataset: str) -> ResultFrame:
+        """Run a dataset's query and record its rows' content version."""
+        key = (self.gender, self.season, self.conference, dataset)
+        self.db.result_columns = []
+        rows = self._dataset_rows(dataset)
+        get_data_versions().observe(key, rows)
+        # An empty result still knows its columns when it came from the
+        # database, so ordering and projections keep validating as usual
+        return ResultFrame(
+            rows,
+            key_columns=get_dataset_registry().get(dataset).key_columns,
+            column_names=self.db.result_columns
+        )
+
+    def refresh_base_result(self, dataset: str) -> ResultFrame:
+        """
+        Recompute a dataset's base result and store it, whether or not one is cached.
+
+        Used by the background refresh and the startup warm-up.
+
+        Args:
+            dataset: Name of a dataset in the dataset registry
+        """
+        frame = self._materialize(dataset)
+        _base_results.set((self.gender, self.season, self.conference, dataset), frame)
+        return frame
+
+    def data_version(self, dataset: str) -> DataVersion:
+        """
+        Content version of a dataset's base result, materializing it if needed.
+        
+        While the base result is cached this never touches the database.
+        
+        Args:
+            dataset: Name of a dataset in the dataset registry
+        """
+        key = (self.gender, self.season, self.conference, dataset)
+        self._get_base_frame(dataset)
+        return get_data_versions().get(key)
+
+    def full_dataset(self, dataset: str) -> Tuple[List[Dict[str, Any]], DataVersion]:
+        """
+        Every row of a dataset in its default order, with the rows' content version.
+
+        Served from the cached base result; only a miss runs the query.
+
+        Args:
+            dataset: Name of a dataset in the dataset registry
+
+        Returns:
+            Tuple of (rows, data version)
+        """
+        key = (self.gender, self.season, self.conference, dataset)
+        rows = self._get_base_frame(dataset).rows
+        return rows, get_data_versions().get(key)
+
+    def page_dataset(
+        self,
+        dataset: str,
+        columns: Optional[List[str]] = None,
+        play_types: Optional[List[str]] = None,
+        team_filter: Optional[str] = None,
+        player_filter: Optional[str] = None,
+        order_by: Optional[str] = None,
+        order_direction: str = "DESC",
+        after: Optional[str] = None,
+        page_size: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One keyset-paginated page of a dataset, served from its cached base result.
+        
+        Args:
+            dataset: Name of a dataset in the dataset registry
+            columns: Columns to return (None = all)
+            play_types: Filter by specific play types
+            team_filter: Filter by specific team name
+            player_filter: Filter by player name (partial match)
+            order_by: Column to sort by (None = the dataset's default order)
+            order_direction: 'ASC' or 'DESC'
+            after: Cursor from the previous page
+            page_size: Maximum number of rows to return
+            
+        Returns:
+            Tuple of (rows, next page cursor or None)
+        """
+        return self._get_base_frame(dataset).page(
+            columns=columns,
+            play_types=play_types,
+            team_filter=team_filter,
+            player_filter=player_filter,
+            order_by=order_by,
+            order_direction=order_direction,
+            after=after,
+            page_size=page_size
+        )
+
+    @staticmethod
+    def _is_full_result(play_types=None, team_filter=None, player_filter=None,
+                        order_by: str = "PLAY_COUNT", order_direction: str = "DESC",
+                        limit: Optional[int] = None) -> bool:
+        """True when the call asks for the unfiltered, default-ordered dataset."""
+        return (not play_types and not team_filter and not player_filter and not limit
+                and order_by == "PLAY_COUNT" and order_direction.upper() == "DESC")
+
+    def _scoped_cte(self, category: str, filename: str) -> Tuple[str, Tuple]:
+        """
+        A template's CTE with placeholders for its season/conference filters.
         
-        # Find the final SELECT statement after the CTE
-        # Look for )\nSELECT or )\r\nSELECT pattern (end of CTE, start of final select)
-        # The CTE ends with ) and then the final SELECT begins
+        Returns:
+            Tuple of (CTE with literal % doubled, season/conference parameter values)
+        """
+        template = self._get_template(category, filename)
+        return template.cte_params, template.scope_values(self.season, self.conference)
+
+    def _dataset_query(self, dataset: str) -> Tuple[str, Tuple]:
+        """
+        Build the full query for a dataset in the dataset registry: the
+        template's CTE and the dataset's final SELECT.
         
-        # Split on the last occurrence of ) followed by SELECT
-        pattern = r'\)\s*(SELECT\s+.*?FROM\s+(\w+).*)$'
-        match = re.search(pattern, query, re.DOTALL | re.IGNORECASE)
+        Returns:
+            Tuple of (query, parameter values)
         
-        if match:
-            # Find where the match starts to split the query
-            final_select_start = match.start(1)
-            cte_portion = query[:match.start()].strip() + ')'
-            final_table_name = match.group(2)
-            return cte_portion, final_table_name
+        Raises:
+            ValueError: If the dataset name is unknown
+        """
+        spec = get_dataset_registry().get(dataset)
+        template = self._get_template(spec.category, spec.filename)
+        final_select = spec.final_select(template)
+        return f"{template.cte_params}\n{final_select.replace('%', '%%')}", \
+            template.scope_values(self.season, self.conference)
+
+    def _query_dataset(self, dataset: str) -> List[Dict[str, Any]]:
+        """Run a dataset's full query against the database."""
+        query, params = self._dataset_query(dataset)
+        with self._profiled(dataset), self.db.connection():
+            return self.db.execute_prepared(query, params)
+
+    def _archived(self, dataset: str, compute: Callable[[], List[Any]]) -> List[Any]:
+        """A closed season's result, computed once and then read from the season archive."""
+        return get_season_archive().get_or_compute(
+            self.gender, self.season, self.conference, dataset, compute
+        )
+
+    def _dataset_rows(self, dataset: str) -> List[Dict[str, Any]]:
+        """
+        Every row of a dataset: from the season archive for a closed season,
+        otherwise straight from the database.
+        """
+        if self.closed:
+            return self._archived(dataset, lambda: self._query_dataset(dataset))
+        return self._query_dataset(dataset)
+
+    def archive_season(self) -> Dict[str, bool]:
+        """
+        Compute and store every dataset of a closed season that is not archived yet.
+        
+        Returns:
+            Whether each dataset was newly archived, keyed by dataset name
         
-        return query, None
+        Raises:
+            ValueError: If the executor's season is still open
+        """
+        if not self.closed:
+            raise ValueError(f"Season {self.season} is still open; only closed seasons are archived")
+        archive = get_season_archive()
+        built = {}
+        for dataset in get_dataset_registry().names() + ["play-types", "teams"]:
+            existed = archive.exists(self.gender, self.season, self.conference, dataset)
+            if dataset == "play-types":
+                self.get_available_play_types()
+            elif dataset == "teams":
+                self.get_available_teams()
+            else:
+                self._dataset_rows(dataset)
+            built[dataset] = not existed and archive.exists(self.gender, self.season, self.conference, dataset)
+        return built
+
+    def stream_dataset(self, dataset: str, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream a full dataset in batches over a server-side cursor.
+        
+        The pooled connection is held until the generator is exhausted or
+        closed, so always consume or close it.
+        
+        Args:
+            dataset: Name of a dataset in the dataset registry
+            batch_size: Rows per yielded batch
+            
+        Yields:
+            Lists of up to batch_size row dictionaries
+        """
+        if self.closed:
+            rows = self._dataset_rows(dataset)
+            for start in range(0, len(rows), batch_size):
+                yield rows[start:start + batch_size]
+            return
+        
+        query, params = self._dataset_query(dataset)
+        with self.db.connection():
+            yield from self.db.stream_query(
+                query, params, batch_size=batch_size, label=dataset_label(self.gender, dataset)
+            )
 
     def _build_dynamic_select(
         self,
@@ -85,9 +382,12 @@ class QueryExecutor:
         order_by: str = "PLAY_COUNT",
         order_direction: str = "DESC",
         limit: Optional[int] = None
-    ) -> str:
+    ) -> Tuple[str, Tuple]:
         """
-        Build a dynamic SELECT statement.
+        Build a dynamic SELECT statement with placeholders for every filter value.
+        
+        Column names cannot be parameters, so selected columns and order_by
+        must be known result columns. Literal % is written as %% throughout.
         
         Args:
             table_name: Name of the CTE result table
@@ -101,40 +401,52 @@ class QueryExecutor:
             limit: Max rows to return
             
         Returns:
-            Dynamic SELECT statement
+            Tuple of (SELECT statement, parameter values)
+            
+        Raises:
+            ValueError: If a column or the order direction is not allowed
         """
         # Build SELECT columns
         if columns:
             # If specific columns requested, use them
-            select_cols = ", ".join(columns)
+            select_cols = ", ".join(_quote_column(c) for c in columns)
         elif not include_percentiles:
             # Exclude percentile columns
-            select_cols = "PLAY_TYPE, TEAM, PPP, `2PA`, `2PM`, `2P%`, `3PA`, `3PM`, `3P%`, PLAY_COUNT"
+            select_cols = ", ".join(_quote_column(c) for c in TEAM_EFFICIENCY_COLUMNS)
         else:
             select_cols = "*"
         
         # Build WHERE clause
         where_conditions = []
+        params: List[Any] = []
         
         if play_types:
-            play_types_str = ", ".join([f"'{pt}'" for pt in play_types])
-            where_conditions.append(f"PLAY_TYPE IN ({play_types_str})")
+            where_conditions.append(f"PLAY_TYPE IN ({', '.join(['%s'] * len(play_types))})")
+            params.extend(play_types)
         
         if team_filter:
-            where_conditions.append(f"TEAM = '{team_filter}'")
+            where_conditions.append("TEAM = %s")
+            params.append(team_filter)
         
         if player_filter:
-            where_conditions.append(f"PLAYER LIKE '%{player_filter}%'")
+            where_conditions.append("PLAYER LIKE %s")
+            params.append(f"%{_escape_like(player_filter)}%")
         
         where_clause = ""
         if where_conditions:
             where_clause = "WHERE " + " AND ".join(where_conditions)
         
         # Build ORDER BY
-        order_clause = f"ORDER BY {order_by} {order_direction}"
+        direction = order_direction.upper()
+        if direction not in ("ASC", "DESC"):
+            raise ValueError("order_direction must be 'ASC' or 'DESC'")
+        order_clause = f"ORDER BY {_quote_column(order_by)} {direction}"
         
         # Build LIMIT
-        limit_clause = f"LIMIT {limit}" if limit else ""
+        limit_clause = ""
+        if limit:
+            limit_clause = "LIMIT %s"
+            params.append(int(limit))
         
         # Combine into final SELECT
         select_stmt = f"""
@@ -145,7 +457,7 @@ FROM {table_name}
 {limit_clause}
 """.strip()
         
-        return select_stmt
+        return select_stmt, tuple(params)
 
     def execute_team_offensive_efficiency(
         self,
@@ -170,14 +482,22 @@ FROM {table_name}
         Returns:
             List of dictionaries with query results
         """
-        # Load the base query
-        raw_query = self._load_query_file("team", "Team-OffensiveEfficiency.sql")
-        
-        # Extract CTE portion
-        cte_portion, final_table = self._extract_cte_and_final_select(raw_query)
+        if self.in_memory_filters or self.closed:
+            frame = self._get_base_frame("team-offensive-efficiency")
+            return frame.select(
+                columns=None if include_percentiles else TEAM_EFFICIENCY_COLUMNS,
+                play_types=play_types,
+                team_filter=team_filter,
+                order_by=order_by,
+                order_direction=order_direction,
+                limit=limit
+            )
+        
+        # Load the parsed base query
+        cte_portion, scope = self._scoped_cte("team", "Team-OffensiveEfficiency.sql")
         
         # Build dynamic SELECT
-        dynamic_select = self._build_dynamic_select(
+        dynamic_select, params = self._build_dynamic_select(
             table_name="team_play_data",
             include_percentiles=include_percentiles,
             play_types=play_types,
@@ -190,9 +510,9 @@ FROM {table_name}
         # Combine CTE with dynamic SELECT
         full_query = f"{cte_portion}\n{dynamic_select}"
         
-        # Execute query
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        # Execute query (as a reusable prepared statement)
+        with self._profiled("team-offensive-efficiency"), self.db.connection():
+            return self.db.execute_prepared(full_query, scope + params)
 
     def execute_player_offensive_efficiency(
         self,
@@ -219,22 +539,25 @@ FROM {table_name}
         Returns:
             List of dictionaries with query results
         """
-        # Load the base query
-        raw_query = self._load_query_file("player", "Player-OffensiveEfficiency.sql")
-        
-        # Extract CTE portion
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        
-        # Build columns based on percentile toggle
-        if not include_percentiles:
-            select_cols = "PLAY_TYPE, PLAYER, TEAM, PPP, `2PA`, `2PM`, `2P%`, `3PA`, `3PM`, `3P%`, PLAY_COUNT"
-        else:
-            select_cols = "*"
+        if self.in_memory_filters or self.closed:
+            frame = self._get_base_frame("player-offensive-efficiency")
+            return frame.select(
+                columns=None if include_percentiles else PLAYER_EFFICIENCY_COLUMNS,
+                play_types=play_types,
+                team_filter=team_filter,
+                player_filter=player_filter,
+                order_by=order_by,
+                order_direction=order_direction,
+                limit=limit
+            )
+        
+        # Load the parsed base query
+        cte_portion, scope = self._scoped_cte("player", "Player-OffensiveEfficiency.sql")
         
         # Build dynamic SELECT
-        dynamic_select = self._build_dynamic_select(
+        dynamic_select, params = self._build_dynamic_select(
             table_name="play_data",
-            columns=[select_cols] if not include_percentiles else None,
+            columns=PLAYER_EFFICIENCY_COLUMNS if not include_percentiles else None,
             include_percentiles=include_percentiles,
             play_types=play_types,
             team_filter=team_filter,
@@ -247,31 +570,30 @@ FROM {table_name}
         # Combine CTE with dynamic SELECT
         full_query = f"{cte_portion}\n{dynamic_select}"
         
-        # Execute query
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        # Execute query (as a reusable prepared statement)
+        with self._profiled("player-offensive-efficiency"), self.db.connection():
+            return self.db.execute_prepared(full_query, scope + params)
+
+    def execute_dataset(self, dataset: str) -> List[Dict[str, Any]]:
+        """
+        Execute any dataset in the dataset registry (full, default-ordered result).
+
+        Raises:
+            ValueError: If the dataset name is unknown
+        """
+        return self._dataset_rows(dataset)
 
     def execute_team_shot_location_frequency(self) -> List[Dict[str, Any]]:
         """Execute Team Shot Location Frequency Distribution query."""
-        raw_query = self._load_query_file("team", "Team-ShotLocation-FreqDist.sql")
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        full_query = f"{cte_portion}\nSELECT * FROM team_shot_frequency ORDER BY TOTAL_SHOTS DESC"
-        
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        return self._dataset_rows("team-shot-location-frequency")
 
     def execute_team_playtype_shot_frequency(self) -> List[Dict[str, Any]]:
         """Execute Team PlayType Shot Location Frequency Distribution query."""
-        raw_query = self._load_query_file("team", "Team-PlayType-ShotLocation-FreqDist.sql")
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        full_query = f"{cte_portion}\nSELECT * FROM team_playtype_shot_frequency ORDER BY TEAM, TOTAL_SHOTS DESC"
-        
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        return self._dataset_rows("team-playtype-shot-frequency")
 
     def get_available_play_types(self) -> List[str]:
         """
-        Get list of available play types from the database.
+        Get list of the season's play types from the database.
         
         Returns:
             List of unique play type names
@@ -283,52 +605,59 @@ FROM {table_name}
                     ELSE secondary_play 
                 END AS play_type
             FROM plays_table_denorm_extra
-            WHERE conference = 'Liberty League'
+            WHERE conference = %s AND
+                  year = %s
             ORDER BY play_type
         """
-        with self.db.connection():
-            results = self.db.execute_query(query)
-            return [r['play_type'] for r in results if r['play_type']]
-
-    def execute_player_offensive_efficiency(self) -> List[Dict[str, Any]]:
-        """Execute Player Offensive Efficiency by Play Type query."""
-        raw_query = self._load_query_file("player", "Player-OffensiveEfficiency.sql")
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        full_query = f"{cte_portion}\nSELECT * FROM play_data ORDER BY PLAY_COUNT DESC"
+        def compute() -> List[str]:
+            with self._profiled("play-types"), self.db.connection():
+                results = self.db.execute_query(query, (self.conference, self.season))
+                return [r['play_type'] for r in results if r['play_type']]
         
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        return self._archived("play-types", compute) if self.closed else compute()
 
     def execute_player_shot_location_efficiency(self) -> List[Dict[str, Any]]:
         """Execute Player Shot Location Efficiency query."""
-        raw_query = self._load_query_file("player", "Player-ShotLocation-EffDist.sql")
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        full_query = f"{cte_portion}\nSELECT * FROM shot_percentiles ORDER BY (LAYUP_PLAYS + CLOSE_PLAYS + MID_PLAYS + THREE_PLAYS) DESC"
-        
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        return self._dataset_rows("player-shot-location-efficiency")
 
     def execute_player_shot_location_frequency(self) -> List[Dict[str, Any]]:
         """Execute Player Shot Location Frequency Distribution query."""
-        raw_query = self._load_query_file("player", "Player-ShotLocation-FreqDist.sql")
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        full_query = f"{cte_portion}\nSELECT * FROM shot_frequency ORDER BY TOTAL_SHOTS DESC"
-        
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        return self._dataset_rows("player-shot-location-frequency")
 
     def execute_player_playtype_shot_frequency(self) -> List[Dict[str, Any]]:
         """Execute Player PlayType Shot Location Frequency Distribution query."""
-        raw_query = self._load_query_file("player", "Player-PlayType-ShotLocation-FreqDist.sql")
-        cte_portion, _ = self._extract_cte_and_final_select(raw_query)
-        full_query = f"{cte_portion}\nSELECT * FROM player_playtype_shot_frequency ORDER BY PLAYER, TOTAL_SHOTS DESC"
+        return self._dataset_rows("player-playtype-shot-frequency")
+
+    def get_source_watermark(self) -> Dict[str, Any]:
+        """
+        Fingerprint the season's source plays.
         
-        with self.db.connection():
-            return self.db.execute_query(full_query)
+        Combines the row count with an order-independent checksum of every
+        column the query files read, so new, deleted and re-tagged plays all
+        move the watermark.
+        
+        Returns:
+            Dictionary with row_count and checksum
+        """
+        query = """
+            SELECT
+                COUNT(*) AS row_count,
+                BIT_XOR(CRC32(CONCAT_WS('|',
+                    primary_team, primary_player, secondary_player,
+                    primary_play, secondary_play, outcome, shot_level,
+                    period, start_time
+                ))) AS checksum
+            FROM plays_table_denorm_extra
+            WHERE conference = %s AND
+                  year = %s
+        """
+        with self._profiled("watermark"), self.db.connection():
+            row = self.db.execute_query(query, (self.conference, self.season))[0]
+            return {"row_count": int(row['row_count']), "checksum": int(row['checksum'] or 0)}
 
     def get_available_teams(self) -> List[str]:
         """
-        Get list of available teams from the database.
+        Get list of the season's teams from the database.
         
         Returns:
             List of unique team names
@@ -336,10 +665,14 @@ FROM {table_name}
         query = """
             SELECT DISTINCT primary_team AS team
             FROM plays_table_denorm_extra
-            WHERE conference = 'Liberty League'
+            WHERE conference = %s AND
+                  year = %s
             ORDER BY team
         """
-        with self.db.connection():
-            results = self.db.execute_query(query)
-            return [r['team'] for r in results if r['team']]
+        def compute() -> List[str]:
+            with self._profiled("teams"), self.db.connection():
+                results = self.db.execute_query(query, (self.conference, self.season))
+                return [r['team'] for r in results if r['team']]
+        
+        return self._archived("teams", compute) if self.closed else compute()
 
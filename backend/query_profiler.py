@@ -0,0 +1,203 @@
+"""
+Query Profiler for RIT Basketball Statistics
+Records per-query connect/execute/fetch/serialize timings, row counts and
+optional EXPLAIN ANALYZE output
+
+Queries are grouped by label: the query template they came from (e.g.
+mens/team/Team-OffensiveEfficiency.sql), set by QueryExecutor around each
+database call. Unlabelled queries are grouped by their first line.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import get_settings
+
+
+# Time phases tracked for every query
+PHASES = ("connect", "execute", "fetch", "serialize")
+
+_current_label: ContextVar[Optional[str]] = ContextVar("query_label", default=None)
+
+
+@contextmanager
+def query_label(label: str) -> Iterator[None]:
+    """Attribute the queries run inside the block to ``label``."""
+    token = _current_label.set(label)
+    try:
+        yield
+    finally:
+        _current_label.reset(token)
+
+
+def current_label(query: str) -> str:
+    """The active label, or a short form of the query's first line."""
+    label = _current_label.get()
+    if label:
+        return label
+    first_line = next((line.strip() for line in query.splitlines() if line.strip()), "")
+    return first_line[:60]
+
+
+class QueryRecord:
+    """Timings and size of one query execution."""
+
+    __slots__ = ("label", "database", "started_at", "rows", "error", "explain") + PHASES
+
+    def __init__(self, label: str, database: Optional[str] = None):
+        self.label = label
+        self.database = database
+        self.started_at = time.time()
+        self.rows = 0
+        self.error: Optional[str] = None
+        self.explain: Optional[str] = None
+        for phase in PHASES:
+            setattr(self, phase, 0.0)
+
+    @property
+    def total(self) -> float:
+        return sum(getattr(self, phase) for phase in PHASES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "label": self.label,
+            "database": self.database,
+            "started_at": self.started_at,
+            "rows": self.rows,
+        }
+        record.update({f"{phase}_ms": round(getattr(self, phase) * 1000, 3) for phase in PHASES})
+        record["total_ms"] = round(self.total * 1000, 3)
+        if self.error:
+            record["error"] = self.error
+        if self.explain:
+            record["explain"] = self.explain
+        return record
+
+
+class QueryProfiler:
+    """
+    Thread-safe store of recent query records plus running totals per label.
+
+    Settings come from the environment:
+        QUERY_PROFILING          record queries at all (default True)
+        QUERY_PROFILE_HISTORY    recent records kept (default 200)
+        QUERY_EXPLAIN            capture EXPLAIN ANALYZE for slow queries (default False)
+        QUERY_EXPLAIN_THRESHOLD  seconds of execute + fetch that count as slow (default 1.0)
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.enabled = settings.query_profiling
+        self.explain_enabled = settings.query_explain
+        self.explain_threshold = settings.query_explain_threshold
+        self._recent: deque = deque(maxlen=settings.query_profile_history)
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def should_explain(self, record: QueryRecord) -> bool:
+        """True if a finished query is slow enough to capture its plan."""
+        return self.explain_enabled and record.execute + record.fetch >= self.explain_threshold
+
+    def _totals_for(self, label: str) -> Dict[str, Any]:
+        totals = self._totals.get(label)
+        if totals is None:
+            totals = {"count": 0, "errors": 0, "rows": 0, "max_ms": 0.0, "serialized_bytes": 0}
+            totals.update({phase: 0.0 for phase in PHASES})
+            self._totals[label] = totals
+        return totals
+
+    def record(self, record: QueryRecord) -> None:
+        """Store a finished query."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._recent.append(record)
+            totals = self._totals_for(record.label)
+            totals["count"] += 1
+            totals["errors"] += 1 if record.error else 0
+            totals["rows"] += record.rows
+            totals["max_ms"] = max(totals["max_ms"], record.total * 1000)
+            for phase in PHASES:
+                totals[phase] += getattr(record, phase)
+
+    def record_serialize(self, label: str, seconds: float, size: int = 0) -> None:
+        """Add JSON encoding time (and output size) for a label's results."""
+        if not self.enabled:
+            return
+        with self._lock:
+            totals = self._totals_for(label)
+            totals["serialize"] += seconds
+            totals["serialized_bytes"] += size
+
+    @contextmanager
+    def serializing(self, label: str) -> Iterator[Dict[str, int]]:
+        """
+        Time a block that encodes a result; set ``size`` on the yielded dict
+        to record the encoded size too.
+        """
+        info = {"size": 0}
+        started = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record_serialize(label, time.perf_counter() - started, info["size"])
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """The most recent query records, newest first."""
+        with self._lock:
+            records = list(self._recent)[-limit:]
+        return [record.to_dict() for record in reversed(records)]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Totals per label, slowest total time first."""
+        with self._lock:
+            totals = {label: dict(values) for label, values in self._totals.items()}
+        rows = []
+        for label, values in totals.items():
+            count = values["count"] or 1
+            row = {"label": label, "count": values["count"], "errors": values["errors"], "rows": values["rows"]}
+            for phase in PHASES:
+                row[f"{phase}_ms"] = round(values[phase] * 1000, 3)
+            total = sum(values[phase] for phase in PHASES)
+            row["total_ms"] = round(total * 1000, 3)
+            row["avg_ms"] = round(total * 1000 / count, 3)
+            row["max_ms"] = round(values["max_ms"], 3)
+            row["serialized_bytes"] = values["serialized_bytes"]
+            rows.append(row)
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        """Forget every record and total."""
+        with self._lock:
+            self._recent.clear()
+            self._totals.clear()
+
+
+_profiler: Optional[QueryProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> QueryProfiler:
+    """Get the process-wide query profiler."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = QueryProfiler()
+        return _profiler
+
+
+def format_summary(rows: List[Dict[str, Any]]) -> str:
+    """Render profiler summary rows as a fixed-width text table."""
+    header = f"{'Query':<52} {'n':>4} {'rows':>7} {'connect':>9} {'execute':>9} {'fetch':>9} {'serialize':>9} {'total':>9}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['label'][:52]:<52} {row['count']:>4} {row['rows']:>7} "
+            + " ".join(f"{row[f'{phase}_ms'] / 1000:>8.2f}s" for phase in PHASES)
+            + f" {row['total_ms'] / 1000:>8.2f}s"
+        )
+    return "\n".join(lines)
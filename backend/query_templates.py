@@ -0,0 +1,224 @@
+"""
+SQL Template Registry for RIT Basketball Statistics
+Loads and parses the .sql files under queries/ once per process
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+
+QUERIES_ROOT = Path(__file__).parent / "queries"
+
+_COMMENT_RE = re.compile(r'--.*?$', re.MULTILINE)
+_USE_RE = re.compile(r'USE\s+\w+;?\s*', re.IGNORECASE)
+# The CTE ends with ) and then the final SELECT begins
+_FINAL_SELECT_RE = re.compile(r'\)\s*(SELECT\s+.*?FROM\s+(\w+).*)$', re.DOTALL | re.IGNORECASE)
+# The season/conference literals every query file filters on, e.g. p.year = '2025-2026'
+_SCOPE_RE = re.compile(r"\b(conference|year)(\s*=\s*)'[^']*'", re.IGNORECASE)
+_SELECT_RE = re.compile(r"\bSELECT\b", re.IGNORECASE)
+_ORDER_BY_RE = re.compile(r"\bORDER\s+BY\s+", re.IGNORECASE)
+
+
+def strip_sql(query: str) -> str:
+    """Remove comments and USE statements, so a query file runs against any database."""
+    query = _COMMENT_RE.sub('', query)
+    query = _USE_RE.sub('', query)
+    return query.strip()
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a query file's SQL into its SELECT statements (on semicolons outside literals)."""
+    statements, start, quoted = [], 0, False
+    for i, char in enumerate(sql):
+        if char == "'":
+            quoted = not quoted
+        elif char == ";" and not quoted:
+            statements.append(sql[start:i])
+            start = i + 1
+    statements.append(sql[start:])
+    return [s.strip() for s in statements if _SELECT_RE.search(s)]
+
+
+def first_statement(query: str) -> str:
+    """
+    The first SELECT statement of a query file, without comments or USE.
+
+    Some files keep an older variant of the query after the one in use.
+    """
+    statements = split_statements(strip_sql(query))
+    return statements[0] if statements else ""
+
+
+def extract_order_by(final_select: str) -> Optional[str]:
+    """
+    The ORDER BY expression list of a final SELECT, or None if it is unordered.
+
+    Only a top-level ORDER BY counts, not one inside a window function.
+    """
+    matches = list(_ORDER_BY_RE.finditer(final_select))
+    if not matches:
+        return None
+    tail = final_select[matches[-1].end():]
+    depth = 0
+    for char in tail:
+        depth += char == "("
+        depth -= char == ")"
+        if depth < 0:
+            return None
+    return " ".join(tail.split()) or None
+
+
+def extract_cte_and_final_select(query: str) -> Tuple[str, Optional[str]]:
+    """
+    Extract the CTE portion and final SELECT table from a query.
+
+    Args:
+        query: Raw SQL file contents
+
+    Returns:
+        Tuple of (cte_portion, final_table_name)
+    """
+    query = first_statement(query)
+
+    # Split on the last occurrence of ) followed by SELECT
+    match = _FINAL_SELECT_RE.search(query)
+
+    if match:
+        cte_portion = query[:match.start()].strip() + ')'
+        final_table_name = match.group(2)
+        return cte_portion, final_table_name
+
+    return query, None
+
+
+class SQLTemplate:
+    """A parsed .sql file: raw text, CTE portion, final table name and default ordering."""
+
+    def __init__(self, gender: str, category: str, filename: str, raw: str, mtime: float):
+        self.gender = gender
+        self.category = category
+        self.filename = filename
+        self.raw = raw
+        self.mtime = mtime
+        self.cte, self.final_table = extract_cte_and_final_select(raw)
+        # ORDER BY of the file's own final SELECT: the dataset's default order
+        final_select = _FINAL_SELECT_RE.search(first_statement(raw))
+        self.order_by = extract_order_by(final_select.group(1)) if final_select else None
+        # The CTE with literal % doubled, for queries sent with parameters
+        # (pymysql treats % as a placeholder marker when params are given),
+        # and its season/conference literals turned into placeholders
+        self.scope_params: List[str] = []
+        self.cte_params = _SCOPE_RE.sub(self._scope_placeholder, self.cte.replace("%", "%%"))
+
+    def _scope_placeholder(self, match: "re.Match") -> str:
+        self.scope_params.append(match.group(1).lower())
+        return f"{match.group(1)}{match.group(2)}%s"
+
+    def scope_values(self, season: str, conference: str) -> Tuple[str, ...]:
+        """Parameter values for cte_params' season/conference placeholders, in order."""
+        values = {"year": season, "conference": conference}
+        return tuple(values[name] for name in self.scope_params)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.gender, self.category, self.filename)
+
+
+class TemplateRegistry:
+    """
+    Process-wide cache of parsed SQL templates keyed by gender/category/filename.
+
+    Templates are parsed once and re-read only when the file's mtime changes.
+    """
+
+    def __init__(self, root: Path = QUERIES_ROOT):
+        self.root = root
+        self._templates: Dict[Tuple[str, str, str], SQLTemplate] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    def _path(self, gender: str, category: str, filename: str) -> Path:
+        return self.root / gender / category / filename
+
+    def _load(self, gender: str, category: str, filename: str, mtime: float) -> SQLTemplate:
+        path = self._path(gender, category, filename)
+        with open(path, 'r') as f:
+            raw = f.read()
+        return SQLTemplate(gender, category, filename, raw, mtime)
+
+    def get(self, gender: str, category: str, filename: str) -> SQLTemplate:
+        """
+        Get a parsed template, loading or reloading it if needed.
+
+        Args:
+            gender: 'mens' or 'womens'
+            category: 'team', 'player', or 'situation'
+            filename: Name of the SQL file
+
+        Returns:
+            The parsed SQLTemplate
+        """
+        key = (gender, category, filename)
+        path = self._path(gender, category, filename)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Query file not found: {path}")
+
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None and template.mtime == mtime:
+                self._stats["hits"] += 1
+                return template
+            self._stats["misses"] += 1
+            if template is not None:
+                self._stats["reloads"] += 1
+
+        template = self._load(gender, category, filename, mtime)
+        with self._lock:
+            self._templates[key] = template
+        return template
+
+    def preload(self) -> int:
+        """
+        Load and parse every template under the queries root.
+
+        Returns:
+            Number of templates loaded
+        """
+        count = 0
+        for path in sorted(self.root.glob("*/*/*.sql")):
+            category_dir = path.parent
+            template = self._load(
+                category_dir.parent.name, category_dir.name, path.name, path.stat().st_mtime
+            )
+            with self._lock:
+                self._templates[template.key] = template
+            count += 1
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of registry hit/miss counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["templates"] = len(self._templates)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
+
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry, preloading all templates on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TemplateRegistry()
+            _registry.preload()
+        return _registry
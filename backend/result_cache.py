@@ -0,0 +1,198 @@
+"""
+Result Cache for RIT Basketball Statistics
+In-process LRU cache with per-entry time-to-live for query results
+
+Entries in the last ``refresh_ahead`` seconds of their TTL are still served
+but reported as due for refresh, so callers can recompute them in the
+background (see cache_refresh.py) before a request has to wait for them.
+Concurrent misses for the same key in get_or_compute share one computation
+(see single_flight.py).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from single_flight import SingleFlight
+
+
+_MISSING = object()
+
+
+class CacheEntry:
+    """A cached value and the times it was stored and expires."""
+
+    __slots__ = ("value", "stored_at", "expires_at")
+
+    def __init__(self, value: Any, ttl: float):
+        self.value = value
+        self.stored_at = time.time()
+        self.expires_at = self.stored_at + ttl
+
+    def expired(self, now: float) -> bool:
+        return now >= self.expires_at
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    When more than ``maxsize`` entries are stored, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300, refresh_ahead: float = 0):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid after it is stored
+            refresh_ahead: Seconds before expiry from which an entry is due
+                           for a background refresh (0 = never)
+        """
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "refresh_due_hits": 0,
+        }
+        self._flight = SingleFlight()
+        # Age of the values served by hits
+        self._served_age_total = 0.0
+        self._served_age_max = 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a value, counting a hit or a miss.
+
+        Returns:
+            The cached value, or ``default`` if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            now = time.time()
+            if entry.expired(now):
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            if self._refresh_due(entry, now):
+                self._stats["refresh_due_hits"] += 1
+            age = entry.age(now)
+            self._served_age_total += age
+            self._served_age_max = max(self._served_age_max, age)
+            return entry.value
+
+    def _refresh_due(self, entry: CacheEntry, now: float) -> bool:
+        return self.refresh_ahead > 0 and now >= entry.expires_at - self.refresh_ahead
+
+    def due_for_refresh(self, key: Hashable) -> bool:
+        """True if ``key`` is cached, not yet expired, and within ``refresh_ahead`` of expiring."""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.time()
+            return entry is not None and not entry.expired(now) and self._refresh_due(entry, now)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if the cache is full."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Return the cached value for ``key``, computing and storing it on a miss.
+
+        Concurrent misses for the same key wait for one computation instead
+        of each running ``compute``; if it raises, every one of them raises.
+
+        Returns:
+            Tuple of (value, was_cached)
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value, True
+
+        def compute_and_store() -> Any:
+            # Stored by a computation that finished since the lookup above
+            value = self._peek(key)
+            if value is _MISSING:
+                value = compute()
+                self.set(key, value)
+            return value
+
+        value, _ = self._flight.do(key, compute_and_store)
+        return value, False
+
+    def _peek(self, key: Hashable) -> Any:
+        """A live value for ``key``, or _MISSING, without touching counters or LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expired(time.time()):
+                return _MISSING
+            return entry.value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop entries from the cache.
+
+        Args:
+            predicate: Called with each key; matching entries are dropped.
+                       If None, every entry is dropped.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if predicate is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters and occupancy."""
+        with self._lock:
+            now = time.time()
+            stats = dict(self._stats)
+            stats.update({
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "refresh_ahead": self.refresh_ahead,
+                "oldest_age_s": round(max(
+                    (e.age(now) for e in self._entries.values() if not e.expired(now)), default=0.0
+                ), 3),
+                "served_age_max_s": round(self._served_age_max, 3),
+            })
+            served_age_total = self._served_age_total
+        flight = self._flight.stats()
+        stats["coalesced"] = flight["deduplicated"]
+        stats["computing"] = flight["in_flight"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        stats["served_age_mean_s"] = round(served_age_total / stats["hits"], 3) if stats["hits"] else None
+        return stats
@@ -0,0 +1,268 @@
+"""
+Columnar Result Frame for RIT Basketball Statistics
+Answers filter/sort/limit variants in-process from one materialized result
+"""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from decimal import Decimal, InvalidOperation
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+
+def _sort_key(value: Any):
+    """
+    Sort key matching MySQL ordering: NULLs first in ascending order and
+    strings compared case-insensitively, as with the default collation.
+    """
+    if value is None:
+        return (0, 0)
+    if isinstance(value, str):
+        return (1, value.casefold())
+    return (1, value)
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON-safe form of a sort value; Decimals keep their exact digits."""
+    if isinstance(value, Decimal):
+        return {"d": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        try:
+            return Decimal(value["d"])
+        except (KeyError, TypeError, InvalidOperation):
+            raise ValueError("Invalid cursor")
+    return value
+
+
+class ResultFrame:
+    """
+    A query result stored column-wise with a precomputed ascending sort index
+    for every column.
+
+    Filtering is a pass over the relevant columns and ordering walks the
+    precomputed index, so any combination of filters, ordering and limit is
+    answered without touching the database.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], key_columns: Optional[List[str]] = None,
+                 column_names: Optional[List[str]] = None):
+        """
+        Materialize a result set.
+
+        Args:
+            rows: Rows as returned by DatabaseManager.execute_query
+            key_columns: Columns that together identify a row; they break
+                         ties between equal sort values when paginating
+                         (the row's position breaks any ties left)
+            column_names: Result columns, for an empty result (e.g. from
+                          cursor.description); otherwise taken from the rows
+        """
+        self.rows = rows
+        self.key_columns = key_columns or []
+        self.column_names: List[str] = list(rows[0].keys()) if rows else list(column_names or [])
+        self.columns: Dict[str, List[Any]] = {
+            name: [row.get(name) for row in rows] for name in self.column_names
+        }
+        self._lookup = {name.upper(): name for name in self.column_names}
+        self._sort_index: Dict[str, List[int]] = {
+            name: sorted(range(len(rows)), key=lambda i, col=self.columns[name]: _sort_key(col[i]))
+            for name in self.column_names
+        }
+        # Lazily built per sort column: (ascending row positions, their keyset keys)
+        self._keysets: Dict[Optional[str], Tuple[List[int], List[Tuple]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def resolve_column(self, name: str) -> str:
+        """
+        Map a column name to its stored spelling (column names are case-insensitive).
+
+        Raises:
+            ValueError: If the column does not exist
+        """
+        column = self._lookup.get(name.strip().strip('`').upper())
+        if column is None:
+            raise ValueError(f"Unknown column: {name}")
+        return column
+
+    def _matches(
+        self,
+        play_types: Optional[Iterable[str]],
+        team_filter: Optional[str],
+        player_filter: Optional[str]
+    ) -> List[bool]:
+        """Build a row mask for the play type / team / player filters."""
+        mask = [True] * len(self.rows)
+
+        if play_types:
+            wanted = {pt.casefold() for pt in play_types}
+            values = self.columns[self.resolve_column("PLAY_TYPE")]
+            mask = [m and v is not None and v.casefold() in wanted for m, v in zip(mask, values)]
+
+        if team_filter:
+            wanted_team = team_filter.casefold()
+            values = self.columns[self.resolve_column("TEAM")]
+            mask = [m and v is not None and v.casefold() == wanted_team for m, v in zip(mask, values)]
+
+        if player_filter:
+            needle = player_filter.casefold()
+            values = self.columns[self.resolve_column("PLAYER")]
+            mask = [m and v is not None and needle in v.casefold() for m, v in zip(mask, values)]
+
+        return mask
+
+    def select(
+        self,
+        columns: Optional[List[str]] = None,
+        play_types: Optional[List[str]] = None,
+        team_filter: Optional[str] = None,
+        player_filter: Optional[str] = None,
+        order_by: str = "PLAY_COUNT",
+        order_direction: str = "DESC",
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter, order and limit the materialized rows.
+
+        Args:
+            columns: Columns to return (None = all)
+            play_types: Keep rows whose PLAY_TYPE is in this list
+            team_filter: Keep rows for this TEAM
+            player_filter: Keep rows whose PLAYER contains this text
+            order_by: Column to order by
+            order_direction: ASC or DESC
+            limit: Max rows to return
+
+        Returns:
+            List of row dictionaries
+        """
+        if not self.column_names:
+            # An empty result whose columns are unknown: every variant is empty
+            return []
+        order_column = self.resolve_column(order_by)
+        projection = [self.resolve_column(c) for c in columns] if columns else None
+        mask = self._matches(play_types, team_filter, player_filter)
+
+        index = self._sort_index[order_column]
+        if order_direction.upper() == "DESC":
+            index = reversed(index)
+
+        results = []
+        for i in index:
+            if not mask[i]:
+                continue
+            row = self.rows[i]
+            results.append({c: row[c] for c in projection} if projection else row)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def _row_key(self, column: Optional[str], position: int) -> Tuple:
+        """
+        Keyset key of a row: its sort value, then its key columns, then its
+        position, so the key is unique even where the key columns are not.
+        """
+        row = self.rows[position]
+        value = position if column is None else row[column]
+        return (value,) + tuple(row.get(k) for k in self.key_columns) + (position,)
+
+    def _keyset(self, column: Optional[str]) -> Tuple[List[int], List[Tuple]]:
+        """
+        Row positions in ascending (sort value, key columns, position) order, plus the
+        comparable key of each. ``column`` None is the order rows were
+        materialized in.
+        """
+        if column not in self._keysets:
+            keys = [
+                tuple(_sort_key(v) for v in self._row_key(column, i))
+                for i in range(len(self.rows))
+            ]
+            order = sorted(range(len(self.rows)), key=keys.__getitem__)
+            self._keysets[column] = (order, [keys[i] for i in order])
+        return self._keysets[column]
+
+    def _encode_cursor(self, column: Optional[str], position: int) -> str:
+        payload = [column, [_encode_value(v) for v in self._row_key(column, position)]]
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+
+    def _decode_cursor(self, column: Optional[str], cursor: str) -> Tuple:
+        try:
+            cursor_column, values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if cursor_column != column or not isinstance(values, list) \
+                or len(values) != 2 + len(self.key_columns):
+            raise ValueError("Cursor does not match this ordering")
+        return tuple(_sort_key(_decode_value(v)) for v in values)
+
+    def page(
+        self,
+        columns: Optional[List[str]] = None,
+        play_types: Optional[List[str]] = None,
+        team_filter: Optional[str] = None,
+        player_filter: Optional[str] = None,
+        order_by: Optional[str] = None,
+        order_direction: str = "DESC",
+        after: Optional[str] = None,
+        page_size: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of filtered, ordered rows using keyset pagination.
+
+        The cursor holds the sort value, key columns and position of the last
+        row served; the next page starts right after it, found by binary search,
+        so every page costs the same however deep it is.
+
+        Args:
+            columns: Columns to return (None = all)
+            play_types: Keep rows whose PLAY_TYPE is in this list
+            team_filter: Keep rows for this TEAM
+            player_filter: Keep rows whose PLAYER contains this text
+            order_by: Column to order by (None = the query's own order)
+            order_direction: ASC or DESC
+            after: Cursor returned with the previous page (None = first page)
+            page_size: Max rows to return
+
+        Returns:
+            Tuple of (rows, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If a column is unknown or the cursor is invalid
+        """
+        if not self.column_names:
+            # An empty result whose columns are unknown: every page is empty
+            return [], None
+        column = self.resolve_column(order_by) if order_by else None
+        projection = [self.resolve_column(c) for c in columns] if columns else None
+        mask = self._matches(play_types, team_filter, player_filter)
+        order, keys = self._keyset(column)
+        descending = order_direction.upper() == "DESC"
+
+        if descending:
+            start = bisect_left(keys, self._decode_cursor(column, after)) - 1 if after else len(order) - 1
+            positions = (order[i] for i in range(start, -1, -1))
+        else:
+            start = bisect_right(keys, self._decode_cursor(column, after)) if after else 0
+            positions = (order[i] for i in range(start, len(order)))
+
+        page = []
+        for position in positions:
+            if not mask[position]:
+                continue
+            if len(page) == page_size:
+                # One more match exists, so there is a next page
+                return self._project(page, projection), self._encode_cursor(column, page[-1])
+            page.append(position)
+        return self._project(page, projection), None
+
+    def _project(self, positions: List[int], projection: Optional[List[str]]) -> List[Dict[str, Any]]:
+        if projection:
+            return [{c: self.rows[i][c] for c in projection} for i in positions]
+        return [self.rows[i] for i in positions]
@@ -0,0 +1,179 @@
+"""
+Season Scope for RIT Basketball Statistics
+Current season and conference settings, season validation, and the
+write-once archive of closed seasons
+
+Only the current season changes as games are tagged, so only it goes through
+the refresh/TTL path. A closed season's datasets are computed once, stored as
+immutable JSON artifacts under seasons/{season}/{conference}/{gender}/ and
+served from there ever after.
+"""
+
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import get_settings
+from dataset_store import atomic_write_bytes
+from serialization import dumps, loads
+
+
+CURRENT_SEASON = get_settings().current_season
+DEFAULT_CONFERENCE = get_settings().conference
+
+SEASON_ARCHIVE_DIR = get_settings().season_archive_dir
+
+_SEASON_RE = re.compile(r"^(\d{4})-(\d{4})$")
+
+
+def normalize_season(season: Optional[str]) -> str:
+    """
+    Validate a season such as '2024-2025' (None means the current season).
+
+    Raises:
+        ValueError: If the season is malformed or has not started yet
+    """
+    if season is None:
+        return CURRENT_SEASON
+    season = season.strip()
+    match = _SEASON_RE.match(season)
+    if not match or int(match.group(2)) != int(match.group(1)) + 1:
+        raise ValueError("season must look like '2024-2025'")
+    if season > CURRENT_SEASON:
+        raise ValueError(f"Season {season} has not started (current season is {CURRENT_SEASON})")
+    return season
+
+
+def normalize_conference(conference: Optional[str]) -> str:
+    """
+    Validate a conference name (None means the default conference).
+
+    Raises:
+        ValueError: If the name is empty or too long
+    """
+    if conference is None:
+        return DEFAULT_CONFERENCE
+    conference = conference.strip()
+    if not conference or len(conference) > 64:
+        raise ValueError("conference must be 1-64 characters")
+    return conference
+
+
+def is_closed_season(season: str) -> bool:
+    """True for a season before the current one (its results never change)."""
+    return season < CURRENT_SEASON
+
+
+def conference_slug(conference: str) -> str:
+    """Directory-safe form of a conference name (Liberty League -> liberty-league)."""
+    return re.sub(r"[^a-z0-9]+", "-", conference.lower()).strip("-") or "conference"
+
+
+class SeasonArchive:
+    """
+    Write-once store of closed-season datasets.
+
+    Each (gender, season, conference, dataset) result is computed at most once:
+    it is loaded from memory, then from its artifact on disk, and only queried
+    when neither exists. Artifacts are never overwritten. Empty results are
+    not stored, so a season loaded into the database later is still picked up.
+    """
+
+    def __init__(self, root: Path = SEASON_ARCHIVE_DIR):
+        self.root = root
+        self._rows: Dict[Tuple[str, str, str, str], List[Any]] = {}
+        self._key_locks: Dict[Tuple[str, str, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_loads": 0, "computed": 0}
+
+    def path(self, gender: str, season: str, conference: str, dataset: str) -> Path:
+        """Location of one artifact."""
+        return self.root / season / conference_slug(conference) / gender / f"{dataset}.json"
+
+    def _key_lock(self, key: Tuple[str, str, str, str]) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _load(self, path: Path) -> Optional[List[Any]]:
+        """Read an artifact's rows, or None if it does not exist."""
+        try:
+            with open(path, "rb") as f:
+                return loads(f.read())["data"]
+        except FileNotFoundError:
+            return None
+
+    def _save(self, path: Path, gender: str, season: str, conference: str,
+              dataset: str, rows: List[Any]) -> None:
+        """Write an artifact in the same envelope as the live dataset files."""
+        payload = {
+            "success": True,
+            "gender": gender,
+            "season": season,
+            "conference": conference,
+            "query": dataset,
+            "archived_at": datetime.now().isoformat(),
+            "row_count": len(rows),
+            "data": rows,
+        }
+        atomic_write_bytes(path, dumps(payload, indent=True))
+
+    def get_or_compute(self, gender: str, season: str, conference: str, dataset: str,
+                       compute: Callable[[], List[Any]]) -> List[Any]:
+        """
+        The archived rows of a dataset, computing and storing them on first use.
+
+        Args:
+            compute: Runs the dataset's query; called at most once per artifact
+
+        Returns:
+            List of rows (row dictionaries, or plain values for metadata lists)
+        """
+        key = (gender, season, conference, dataset)
+        with self._key_lock(key):
+            with self._lock:
+                rows = self._rows.get(key)
+                if rows is not None:
+                    self._stats["memory_hits"] += 1
+                    return rows
+
+            path = self.path(gender, season, conference, dataset)
+            rows = self._load(path)
+            if rows is not None:
+                stat = "disk_loads"
+            else:
+                rows = compute()
+                stat = "computed"
+                if rows:
+                    self._save(path, gender, season, conference, dataset, rows)
+            with self._lock:
+                self._stats[stat] += 1
+                if rows:
+                    self._rows[key] = rows
+            return rows
+
+    def exists(self, gender: str, season: str, conference: str, dataset: str) -> bool:
+        """True if the dataset has already been archived."""
+        return self.path(gender, season, conference, dataset).is_file()
+
+    def stats(self) -> Dict[str, Any]:
+        """Archive counters and the number of artifacts held in memory."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_memory"] = len(self._rows)
+        stats["current_season"] = CURRENT_SEASON
+        return stats
+
+
+_archive: Optional[SeasonArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_season_archive() -> SeasonArchive:
+    """Get the process-wide closed-season archive."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = SeasonArchive()
+        return _archive
@@ -0,0 +1,93 @@
+"""
+Fast Serialization for RIT Basketball Statistics
+Native numeric conversion of query results and orjson encoding for API
+responses and cached dataset files
+
+pymysql returns every DECIMAL column (SUM, ROUND, division) as Decimal,
+which JSON encoders either stringify or walk slowly. Result sets are
+converted once, column by column, to int (scale 0) or float, so encoding is
+a single orjson call producing real JSON numbers.
+"""
+
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import orjson
+from pymysql.constants import FIELD_TYPE
+
+
+_DECIMAL_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def numeric_converters(description: Optional[Sequence[Sequence[Any]]]) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Map a result set's DECIMAL columns to native converters, from cursor.description.
+
+    Returns:
+        Column name -> int (scale 0, e.g. SUM of integers) or float
+    """
+    converters = {}
+    for column in description or ():
+        name, type_code, scale = column[0], column[1], column[5]
+        if type_code in _DECIMAL_TYPES:
+            converters[name] = int if scale == 0 else float
+    return converters
+
+
+def decimal_converters(rows: List[Dict[str, Any]]) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Converters for rows built in Python, matching numeric_converters: a
+    Decimal column becomes int if every value is whole-scale (e.g. Decimal('40')),
+    float otherwise.
+    """
+    converters: Dict[str, Callable[[Any], Any]] = {}
+    for row in rows:
+        for name, value in row.items():
+            if isinstance(value, Decimal) and converters.get(name) is not float:
+                converters[name] = int if value.as_tuple().exponent >= 0 else float
+    return converters
+
+
+def convert_rows(rows: List[Dict[str, Any]], converters: Dict[str, Callable[[Any], Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert the given columns of every row in place, one column at a time.
+
+    Returns:
+        The same rows
+    """
+    if not rows or not converters:
+        return rows
+    for name, convert in converters.items():
+        if name not in rows[0]:
+            continue
+        for row in rows:
+            value = row[name]
+            if value is not None:
+                row[name] = convert(value)
+    return rows
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not know: Decimals as numbers, anything else as text."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    return str(value)
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """
+    Encode a value as JSON bytes with orjson.
+
+    Args:
+        value: Payload (dicts, lists, numbers, strings, datetimes, numpy values)
+        indent: Pretty-print with two-space indentation (as json.dumps(indent=2))
+    """
+    option = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+    return orjson.dumps(value, default=_default, option=option)
+
+
+def loads(body: Any) -> Any:
+    """Decode JSON bytes or text."""
+    return orjson.loads(body)
@@ -0,0 +1,178 @@
+"""
+Single-Flight Request Coalescing for RIT Basketball Statistics
+Concurrent callers with the same key share one in-flight execution
+
+When a leaderboard link is shared, dozens of identical requests arrive
+together; without coalescing each one runs the same heavy CTE on its own
+connection. The first caller for a key (the leader) runs the work, callers
+arriving while it is in flight wait for its result, and the key is released
+as soon as it finishes, so nothing is cached here: a later call runs again
+(or hits a cache in front of it). An exception reaches every waiting caller,
+except CallCancelled: the leader's own request went away, so the callers
+still waiting run the work again (one of them as the new leader).
+
+SingleFlight coalesces blocking work across threads (cache misses inside the
+database thread pool); AsyncSingleFlight coalesces awaitables on the event
+loop, where waiting callers hold no thread at all.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CallCancelled(Exception):
+    """Base for errors meaning the leader's call was cancelled, not that the work failed."""
+
+
+class _Stats:
+    """Counters shared by both flavours: calls, executions, deduplicated calls, errors."""
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+        self.errors = 0
+
+    def snapshot(self, in_flight: int) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "errors": self.errors,
+            "in_flight": in_flight,
+            "dedup_rate": round(self.deduplicated / self.calls, 4) if self.calls else None,
+        }
+
+
+class _Call:
+    """One in-flight execution in a SingleFlight."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe coalescing of blocking calls by key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``func`` unless a call for ``key`` is already in flight, in which
+        case wait for that call instead.
+
+        Returns:
+            Tuple of (value, shared): shared is True if another caller's
+            execution produced the value
+
+        Raises:
+            Whatever ``func`` raised, in the leader and in every waiting
+            caller (waiting callers retry after CallCancelled)
+        """
+        with self._lock:
+            self._stats.calls += 1
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self._stats.executions += 1
+            if leader:
+                break
+
+            call.done.wait()
+            if isinstance(call.error, CallCancelled):
+                # Run again, or wait for whoever leads the next execution
+                continue
+            # Counted once per call, for the execution whose outcome it shared
+            with self._lock:
+                self._stats.deduplicated += 1
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats.snapshot(len(self._calls))
+
+
+class AsyncSingleFlight:
+    """
+    Coalescing of awaitables by key, for use on one event loop.
+
+    The leader's work runs as its own task, so a caller that goes away (e.g.
+    the client disconnected) neither cancels it nor fails the other callers.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._stats = _Stats()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await ``func()`` unless a call for ``key`` is already in flight, in
+        which case await that call instead.
+
+        Returns:
+            Tuple of (value, shared): shared is True if another caller's
+            execution produced the value
+
+        Raises:
+            Whatever ``func()`` raised, in every caller (waiting callers
+            retry after CallCancelled)
+        """
+        self._stats.calls += 1
+        while True:
+            task = self._tasks.get(key)
+            shared = task is not None
+            if not shared:
+                self._stats.executions += 1
+                task = self._tasks[key] = asyncio.ensure_future(func())
+                task.add_done_callback(lambda finished: self._finished(key, finished))
+            try:
+                value = await asyncio.shield(task)
+            except CallCancelled:
+                if not shared:
+                    raise
+                # Run again, or await whoever leads the next execution
+                continue
+            except Exception:
+                # Counted once per call, for the execution whose outcome it shared
+                if shared:
+                    self._stats.deduplicated += 1
+                raise
+            if shared:
+                self._stats.deduplicated += 1
+            return value, shared
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Retrieve the exception even when every caller has gone away
+        if not task.cancelled() and task.exception() is not None:
+            self._stats.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.snapshot(len(self._tasks))
@@ -1,14 +1,415 @@
 """
 SQL Connector Module for RIT Basketball Statistics
-Handles database connections and query execution
+Handles pooled database connections and query execution
 """
 
+import math
 import pymysql
-from dotenv import load_dotenv
-import pandas as pd
-import os
-from typing import Optional, List, Dict, Any, Tuple
-from contextlib import contextmanager
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple, Iterator, Sequence, Callable
+from contextlib import contextmanager, nullcontext
+
+from concurrency import QueryCancelledError, current_cancel_scope
+from config import get_settings
+from query_profiler import QueryRecord, current_label, get_profiler
+from serialization import convert_rows, numeric_converters
+
+if TYPE_CHECKING:
+    # Imported on first use only: pandas (and NumPy) would add about half a
+    # second to every cold start for a method no endpoint calls
+    import pandas as pd
+
+
+# MySQL error codes handled by the prepared statement cache
+ER_UNKNOWN_STMT_HANDLER = 1243
+ER_MAX_PREPARED_STMT_COUNT_REACHED = 1461
+# MySQL error codes of a statement stopped by KILL QUERY or max_execution_time;
+# the connection itself is still usable
+ER_QUERY_INTERRUPTED = 1317
+ER_QUERY_TIMEOUT = 3024
+
+# pymysql-style markers: %s is a parameter, %% a literal percent sign
+_PYFORMAT_RE = re.compile(r"%([%s])")
+
+
+def to_qmark(query: str) -> str:
+    """Convert a pymysql-style parameterized query to MySQL's ? placeholders."""
+    return _PYFORMAT_RE.sub(lambda m: "%" if m.group(1) == "%" else "?", query)
+
+
+class DatabaseBusyError(ConnectionError):
+    """
+    Raised when a database has no capacity for another query right now.
+
+    Attributes:
+        database: Name of the database
+        retry_after: Suggested seconds before retrying
+    """
+
+    def __init__(self, message: str, database: Optional[str] = None, retry_after: int = 1):
+        super().__init__(message)
+        self.database = database
+        self.retry_after = retry_after
+
+
+class PoolTimeoutError(DatabaseBusyError):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+class PoolQueueFullError(DatabaseBusyError):
+    """Raised when too many requests are already waiting for a pooled connection."""
+
+
+class QueryTimeoutError(TimeoutError):
+    """Raised when the server stopped a query at its execution time limit (max_execution_time)."""
+
+
+class PooledConnection:
+    """A pymysql connection plus the bookkeeping the pool needs to manage it."""
+
+    def __init__(self, raw: pymysql.connections.Connection):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.checked_out_at = self.created_at
+        self.broken = False
+        # Server-side prepared statements of this session: query text -> statement name
+        self.statements: "OrderedDict[str, str]" = OrderedDict()
+        self.statement_session: Optional[int] = None
+        self.statement_seq = 0
+
+    def age(self, now: float) -> float:
+        return now - self.created_at
+
+    def idle_for(self, now: float) -> float:
+        return now - self.last_used
+
+    def close(self) -> None:
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent connections to a single database.
+
+    Connections are created lazily up to ``size``. On checkout a connection
+    that has sat idle longer than ``ping_interval`` is pinged (and reconnected
+    if the server dropped it); connections older than ``max_lifetime`` or idle
+    longer than ``idle_timeout`` are closed instead of being reused.
+
+    ``size`` is also the database's concurrent query limit. At most
+    ``max_waiting`` callers wait for a connection; further checkouts are
+    rejected at once with a PoolQueueFullError (load shedding) whose
+    retry_after is estimated from how long connections are held.
+    """
+
+    def __init__(
+        self,
+        connect_kwargs: Dict[str, Any],
+        size: int = 5,
+        max_lifetime: float = 1800,
+        idle_timeout: float = 300,
+        checkout_timeout: float = 10,
+        ping_interval: float = 30,
+        statement_cache_size: int = 0,
+        max_waiting: int = 10
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            connect_kwargs: Keyword arguments passed to pymysql.connect
+            size: Maximum number of open connections
+            max_lifetime: Seconds after which a connection is retired
+            idle_timeout: Seconds an idle connection is kept before eviction
+            checkout_timeout: Seconds to wait for a free connection
+            ping_interval: Idle seconds after which a connection is pinged on checkout
+            statement_cache_size: Prepared statements kept per connection (0 disables)
+            max_waiting: Callers allowed to wait for a connection at once
+        """
+        self.connect_kwargs = connect_kwargs
+        self.size = max(1, size)
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+        self.statement_cache_size = statement_cache_size
+        self.max_waiting = max(0, max_waiting)
+
+        self._idle: deque = deque()
+        self._open = 0
+        self._waiting = 0
+        # Moving average of how long a checkout holds its connection
+        self._hold_time = 0.0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+            "rejected": 0,
+            "queries_killed": 0,
+            "query_timeouts": 0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "pings": 0,
+            "reconnects": 0,
+            "evicted_idle": 0,
+            "evicted_lifetime": 0,
+            "discarded_broken": 0,
+            "statement_hits": 0,
+            "statement_misses": 0,
+            "statements_prepared": 0,
+            "statements_deallocated": 0,
+            "statement_cache_resets": 0,
+        }
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        """Add to one of the pool's counters."""
+        with self._cond:
+            self._stats[counter] += amount
+
+    def _new_connection(self) -> PooledConnection:
+        raw = pymysql.connect(**self.connect_kwargs)
+        with self._cond:
+            self._stats["connections_created"] += 1
+        return PooledConnection(raw)
+
+    def _retire(self, pooled: PooledConnection, reason: str) -> None:
+        """Close a connection and free its slot. Caller must hold the lock."""
+        pooled.close()
+        self._open -= 1
+        self._stats["connections_closed"] += 1
+        if reason:
+            self._stats[reason] += 1
+        self._cond.notify()
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop idle connections past their idle timeout or lifetime. Caller must hold the lock."""
+        kept = deque()
+        while self._idle:
+            pooled = self._idle.popleft()
+            if pooled.age(now) >= self.max_lifetime:
+                self._retire(pooled, "evicted_lifetime")
+            elif pooled.idle_for(now) >= self.idle_timeout:
+                self._retire(pooled, "evicted_idle")
+            else:
+                kept.append(pooled)
+        self._idle = kept
+
+    def _check_alive(self, pooled: PooledConnection) -> PooledConnection:
+        """Ping a connection that has been idle for a while, reconnecting if needed."""
+        if pooled.idle_for(time.monotonic()) < self.ping_interval:
+            return pooled
+
+        thread_id = pooled.raw.thread_id()
+        pooled.raw.ping(reconnect=True)
+        with self._cond:
+            self._stats["pings"] += 1
+            if pooled.raw.thread_id() != thread_id:
+                self._stats["reconnects"] += 1
+        return pooled
+
+    def _retry_after(self) -> int:
+        """Seconds until a new caller could expect a connection. Caller must hold the lock."""
+        return max(1, math.ceil(self._hold_time * (self._waiting + 1) / self.size))
+
+    def acquire(self) -> PooledConnection:
+        """
+        Check out a connection, waiting up to ``checkout_timeout`` seconds.
+
+        Returns:
+            A live PooledConnection
+
+        Raises:
+            PoolQueueFullError: If ``max_waiting`` callers are already waiting
+            PoolTimeoutError: If no connection became available in time
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+        wait_started = 0.0
+        database = self.connect_kwargs.get("db")
+
+        with self._cond:
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._evict_expired(now)
+
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+
+                    if self._open < self.size:
+                        # Reserve the slot now, connect outside the lock
+                        self._open += 1
+                        pooled = None
+                        break
+
+                    if not waited and self._waiting >= self.max_waiting:
+                        self._stats["rejected"] += 1
+                        raise PoolQueueFullError(
+                            f"{self._waiting} requests are already waiting for a connection to {database}",
+                            database, self._retry_after()
+                        )
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {self.checkout_timeout}s waiting for a connection to {database}",
+                            database, self._retry_after()
+                        )
+                    if not waited:
+                        waited = True
+                        wait_started = now
+                        self._waiting += 1
+                        self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+            finally:
+                if waited:
+                    self._waiting -= 1
+
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["wait_time_total"] += time.monotonic() - wait_started
+
+        try:
+            if pooled is None:
+                pooled = self._new_connection()
+            else:
+                pooled = self._check_alive(pooled)
+            pooled.checked_out_at = time.monotonic()
+        except Exception:
+            with self._cond:
+                if pooled is not None:
+                    self._retire(pooled, "discarded_broken")
+                else:
+                    self._open -= 1
+                    self._cond.notify()
+            raise
+
+        return pooled
+
+    def release(self, pooled: PooledConnection) -> None:
+        """Return a connection to the pool, closing it if it is broken or too old."""
+        now = time.monotonic()
+        with self._cond:
+            self._hold_time += 0.2 * ((now - pooled.checked_out_at) - self._hold_time)
+            if pooled.broken:
+                self._retire(pooled, "discarded_broken")
+            elif pooled.age(now) >= self.max_lifetime:
+                self._retire(pooled, "evicted_lifetime")
+            else:
+                pooled.last_used = now
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def kill_query(self, thread_id: int) -> None:
+        """
+        Stop the statement running on a connection (KILL QUERY), over a
+        short-lived connection of its own: pooled ones may all be busy.
+        """
+        # Bounded, since the query's own thread waits for the kill to finish
+        timeout = self.connect_kwargs.get("connect_timeout", 10)
+        raw = pymysql.connect(**self.connect_kwargs, read_timeout=timeout, write_timeout=timeout)
+        try:
+            with raw.cursor() as cursor:
+                cursor.execute("KILL QUERY %s", (thread_id,))
+        finally:
+            raw.close()
+        self.record("queries_killed")
+
+    def close_all(self) -> None:
+        """Close every idle connection. Checked-out connections are closed on release."""
+        with self._cond:
+            while self._idle:
+                self._retire(self._idle.pop(), "")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool counters and current occupancy."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self.size,
+                "max_waiting": self.max_waiting,
+                "waiting": self._waiting,
+                "hold_time_avg": round(self._hold_time, 4),
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+            })
+        stats["wait_time_total"] = round(stats["wait_time_total"], 4)
+        lookups = stats["statement_hits"] + stats["statement_misses"]
+        stats["statement_hit_rate"] = round(stats["statement_hits"] / lookups, 4) if lookups else None
+        return stats
+
+
+_pools: Dict[Tuple[str, int, str, str], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(hostname: str, port: int, username: str, password: str, database: str) -> ConnectionPool:
+    """
+    Get the process-wide connection pool for a database, creating it on first use.
+
+    Pool sizing and recycling are configured through the DB_POOL_* environment
+    variables; DB_MAX_EXECUTION_TIME is applied to every pooled session.
+    """
+    key = (hostname, port, username, database)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            settings = get_settings()
+            connect_kwargs = {
+                "host": hostname,
+                "port": port,
+                "user": username,
+                "passwd": password,
+                "db": database,
+                "cursorclass": pymysql.cursors.DictCursor,
+                # Pooled connections outlive a single request; autocommit keeps
+                # each SELECT from reading an old REPEATABLE READ snapshot.
+                "autocommit": True,
+                "connect_timeout": settings.db_connect_timeout,
+            }
+            if settings.db_max_execution_time > 0:
+                # Applies to SELECTs; the server stops them with ER_QUERY_TIMEOUT
+                connect_kwargs["init_command"] = (
+                    f"SET SESSION max_execution_time = {int(settings.db_max_execution_time * 1000)}"
+                )
+            pool = ConnectionPool(
+                connect_kwargs=connect_kwargs,
+                size=settings.pool_size(database),
+                max_lifetime=settings.db_pool_max_lifetime,
+                idle_timeout=settings.db_pool_idle_timeout,
+                checkout_timeout=settings.db_pool_timeout,
+                ping_interval=settings.db_pool_ping_interval,
+                statement_cache_size=settings.db_statement_cache_size,
+                max_waiting=settings.db_pool_max_waiting,
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every connection pool, keyed by database name."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {key[3]: pool.stats() for key, pool in pools}
+
+
+def close_pools() -> None:
+    """Close idle connections in every pool (e.g. on application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
 
 
 class DatabaseManager:
@@ -22,35 +423,44 @@ class DatabaseManager:
             database: Name of the database to connect to. 
                      If None, uses MENS database from environment.
         """
-        load_dotenv()
+        settings = get_settings()
 
-        self.hostname = os.getenv('DB_HOST')
-        self.username = os.getenv('DB_USERNAME')
-        self.password = os.getenv('DB_PASSWORD')
-        self.port = int(os.getenv('PORT', 25060))
+        self.hostname = settings.db_host
+        self.username = settings.db_username
+        self.password = settings.db_password
+        self.port = settings.db_port
         
         # Default to mens database if not specified
-        self.database = database or os.getenv('MENS', 'RITMensBasketball')
+        self.database = database or settings.mens_database
         
+        self.pool = get_pool(self.hostname, self.port, self.username, self.password, self.database)
+
         self.conn = None
         self.cursor = None
+        self._pooled = None
+        
+        self.profiler = get_profiler()
+        # Checkout time of the current connection, charged to its first query
+        self._connect_seconds = 0.0
+        # Column names of the last result fetched (known even when it has no rows)
+        self.result_columns: List[str] = []
 
     def connect(self) -> bool:
         """
-        Establish database connection.
+        Check out a connection from the shared pool.
         
         Returns:
             True if connection successful, False otherwise.
+
+        Raises:
+            DatabaseBusyError: If the database is at its concurrency limit and
+                               its wait queue is full or the wait timed out
         """
+        started = time.perf_counter()
         try:
-            self.conn = pymysql.connect(
-                host=self.hostname,
-                port=self.port,
-                user=self.username,
-                passwd=self.password,
-                db=self.database,
-                cursorclass=pymysql.cursors.DictCursor
-            )
+            self._pooled = self.pool.acquire()
+            self._connect_seconds = time.perf_counter() - started
+            self.conn = self._pooled.raw
             self.cursor = self.conn.cursor()
             return True
         except pymysql.Error as e:
@@ -58,12 +468,51 @@ class DatabaseManager:
             return False
 
     def disconnect(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Return the connection to the pool."""
+        if self._pooled:
+            try:
+                self.cursor.close()
+            except Exception:
+                self._pooled.broken = True
+            self.pool.release(self._pooled)
+            self._pooled = None
             self.conn = None
             self.cursor = None
 
+    def _mark_if_broken(self, error: pymysql.Error) -> None:
+        """Flag the current connection for disposal after a connection-level error."""
+        if error.args and error.args[0] in (ER_QUERY_INTERRUPTED, ER_QUERY_TIMEOUT):
+            # Only the statement was stopped
+            return
+        if self._pooled and isinstance(error, (pymysql.OperationalError, pymysql.InterfaceError)):
+            self._pooled.broken = True
+
+    @contextmanager
+    def _interruptible(self):
+        """
+        Run a statement so that it can be stopped: while the block runs,
+        cancelling the request's scope kills it with KILL QUERY. A statement
+        the server stopped raises QueryCancelledError (request cancelled) or
+        QueryTimeoutError (max_execution_time reached).
+        """
+        scope = current_cancel_scope()
+        if scope is None:
+            running = nullcontext()
+        else:
+            thread_id = self.conn.thread_id()
+            running = scope.running(lambda: self.pool.kill_query(thread_id))
+        try:
+            with running:
+                yield
+        except pymysql.OperationalError as e:
+            if e.args[0] == ER_QUERY_TIMEOUT:
+                self.pool.record("query_timeouts")
+                print(f"⏱️  Query stopped at the execution time limit on {self.database}")
+                raise QueryTimeoutError(f"Query exceeded the execution time limit: {e.args[1]}") from e
+            if e.args[0] == ER_QUERY_INTERRUPTED and scope is not None and scope.cancelled:
+                raise QueryCancelledError("Query stopped: the client disconnected") from e
+            raise
+
     @contextmanager
     def connection(self):
         """Context manager for database connections."""
@@ -73,6 +522,49 @@ class DatabaseManager:
         finally:
             self.disconnect()
 
+    @contextmanager
+    def _profile(self, query: str, params: Optional[Sequence[Any]] = None) -> Iterator[QueryRecord]:
+        """
+        Record one query with the profiler: the block fills in execute/fetch
+        times and rows, connect time is the checkout that preceded it.
+        A slow query's plan is captured when QUERY_EXPLAIN is on.
+        """
+        record = QueryRecord(current_label(query), self.database)
+        record.connect, self._connect_seconds = self._connect_seconds, 0.0
+        try:
+            yield record
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            if record.error is None and self.profiler.should_explain(record):
+                record.explain = self._explain(query, params)
+            self.profiler.record(record)
+
+    def _run(self, record: QueryRecord, execute: Callable[[], Any]) -> List[Dict[str, Any]]:
+        """
+        Run ``execute`` on the cursor, then fetch every row, timing both phases.
+        DECIMAL columns are converted to native int/float as part of the fetch.
+        """
+        started = time.perf_counter()
+        with self._interruptible():
+            execute()
+        executed = time.perf_counter()
+        rows = convert_rows(self.cursor.fetchall(), numeric_converters(self.cursor.description))
+        self.result_columns = [column[0] for column in self.cursor.description or ()]
+        record.execute += executed - started
+        record.fetch += time.perf_counter() - executed
+        record.rows = len(rows)
+        return rows
+
+    def _explain(self, query: str, params: Optional[Sequence[Any]] = None) -> str:
+        """EXPLAIN ANALYZE a query (it runs again) and return the plan text."""
+        try:
+            self.cursor.execute("EXPLAIN ANALYZE " + self.cursor.mogrify(query, params))
+            return "\n".join(str(next(iter(row.values()))) for row in self.cursor.fetchall())
+        except pymysql.Error as e:
+            return f"EXPLAIN ANALYZE failed: {e}"
+
     def execute_query(self, query: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
         """
         Execute a SELECT query and return results.
@@ -88,16 +580,175 @@ class DatabaseManager:
             raise ConnectionError("Database not connected. Call connect() first.")
         
         try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
-            return self.cursor.fetchall()
+            with self._profile(query, params or None) as record:
+                if params:
+                    return self._run(record, lambda: self.cursor.execute(query, params))
+                return self._run(record, lambda: self.cursor.execute(query))
         except pymysql.Error as e:
             print(f"Query execution error: {e}")
+            self._mark_if_broken(e)
             raise
 
-    def execute_query_as_dataframe(self, query: str, params: Optional[Tuple] = None) -> pd.DataFrame:
+    def execute_prepared(self, query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Execute a parameterized SELECT, optionally as a server-side prepared statement.
+        
+        With DB_STATEMENT_CACHE_SIZE=0 (the default) the parameters are bound
+        client-side and the query is sent in a single round trip. Otherwise the
+        statement is prepared once per pooled connection and reused by later
+        calls with the same query text, so MySQL skips parsing it again, at the
+        cost of a SET and an EXECUTE round trip per call (plus PREPARE on a
+        miss). Each connection keeps an LRU of DB_STATEMENT_CACHE_SIZE
+        statements, which is reset when the connection reconnects (prepared
+        statements live in the server session).
+        
+        Args:
+            query: SQL with pymysql-style %s placeholders (literal % written as %%)
+            params: Parameter values, one per placeholder
+            
+        Returns:
+            List of dictionaries containing query results
+        """
+        if not self.cursor:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        params = tuple(params)
+        try:
+            with self._profile(query, params) as record:
+                if self.pool.statement_cache_size <= 0:
+                    return self._run(record, lambda: self.cursor.execute(query, params))
+                try:
+                    try:
+                        return self._run(record, lambda: self._execute_statement(self._prepare(query), params))
+                    except pymysql.Error as e:
+                        if e.args[0] != ER_UNKNOWN_STMT_HANDLER:
+                            raise
+                        # The server forgot our statements (e.g. session reset): prepare again
+                        self._reset_statements()
+                        return self._run(record, lambda: self._execute_statement(self._prepare(query), params))
+                except pymysql.Error as e:
+                    if e.args[0] != ER_MAX_PREPARED_STMT_COUNT_REACHED:
+                        raise
+                    return self._run(record, lambda: self.cursor.execute(query, params))
+        except pymysql.Error as e:
+            print(f"Query execution error: {e}")
+            self._mark_if_broken(e)
+            raise
+
+    def _reset_statements(self) -> None:
+        pooled = self._pooled
+        if pooled.statements:
+            self.pool.record("statement_cache_resets")
+        pooled.statements.clear()
+        pooled.statement_session = pooled.raw.thread_id()
+
+    def _prepare(self, query: str) -> str:
+        """Get the name of the prepared statement for a query, preparing it on a miss."""
+        pooled = self._pooled
+        if pooled.statement_session != pooled.raw.thread_id():
+            self._reset_statements()
+        
+        name = pooled.statements.get(query)
+        if name is not None:
+            pooled.statements.move_to_end(query)
+            self.pool.record("statement_hits")
+            return name
+        
+        self.pool.record("statement_misses")
+        while len(pooled.statements) >= self.pool.statement_cache_size:
+            _, oldest = pooled.statements.popitem(last=False)
+            self.cursor.execute(f"DEALLOCATE PREPARE {oldest}")
+            self.pool.record("statements_deallocated")
+        
+        pooled.statement_seq += 1
+        name = f"stmt_{pooled.statement_seq}"
+        self.cursor.execute(f"PREPARE {name} FROM %s", (to_qmark(query),))
+        pooled.statements[query] = name
+        self.pool.record("statements_prepared")
+        return name
+
+    def _execute_statement(self, name: str, params: Tuple) -> None:
+        """Bind parameters to session variables and EXECUTE a prepared statement."""
+        if params:
+            variables = [f"@p{i}" for i in range(len(params))]
+            self.cursor.execute("SET " + ", ".join(f"{v} = %s" for v in variables), params)
+            self.cursor.execute(f"EXECUTE {name} USING {', '.join(variables)}")
+        else:
+            self.cursor.execute(f"EXECUTE {name}")
+
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Tuple] = None,
+        batch_size: int = 5000,
+        label: Optional[str] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute a SELECT with an unbuffered (server-side) cursor and yield rows in batches.
+        
+        Rows are pulled from the server as they are consumed instead of being
+        buffered client-side. The connection is busy until the generator is
+        exhausted or closed; closing it early discards the connection rather
+        than draining the unread rows.
+        
+        Args:
+            query: SQL query string
+            params: Optional tuple of parameters for parameterized queries
+            batch_size: Number of rows per yielded batch
+            label: Profiler label for the query (generators may resume in
+                   another thread, so the query_label() context is not used)
+            
+        Yields:
+            Lists of up to batch_size row dictionaries
+        """
+        if not self.conn:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        cursor = self.conn.cursor(pymysql.cursors.SSDictCursor)
+        record = QueryRecord(label or current_label(query), self.database)
+        record.connect, self._connect_seconds = self._connect_seconds, 0.0
+        exhausted = False
+        try:
+            started = time.perf_counter()
+            with self._interruptible():
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                record.execute = time.perf_counter() - started
+                converters = numeric_converters(cursor.description)
+                while True:
+                    started = time.perf_counter()
+                    batch = convert_rows(cursor.fetchmany(batch_size), converters)
+                    record.fetch += time.perf_counter() - started
+                    if not batch:
+                        exhausted = True
+                        break
+                    record.rows += len(batch)
+                    yield batch
+        except (QueryCancelledError, QueryTimeoutError) as e:
+            record.error = str(e)
+            raise
+        except pymysql.Error as e:
+            print(f"Query execution error: {e}")
+            record.error = str(e)
+            self._mark_if_broken(e)
+            raise
+        finally:
+            if exhausted:
+                try:
+                    cursor.close()
+                except pymysql.Error:
+                    exhausted = False
+            if not exhausted and self._pooled:
+                # Unread rows are still in flight; reusing the connection would
+                # mean reading all of them first
+                self._pooled.broken = True
+            if exhausted and self.profiler.should_explain(record):
+                record.explain = self._explain(query, params or None)
+            self.profiler.record(record)
+
+    def execute_query_as_dataframe(self, query: str, params: Optional[Tuple] = None) -> "pd.DataFrame":
         """
         Execute a SELECT query and return results as a pandas DataFrame.
         
@@ -108,6 +759,8 @@ class DatabaseManager:
         Returns:
             DataFrame containing query results
         """
+        import pandas as pd
+
         results = self.execute_query(query, params)
         return pd.DataFrame(results)
 
@@ -125,11 +778,13 @@ class DatabaseManager:
         if not self.cursor:
             raise ConnectionError("Database not connected. Call connect() first.")
         
+        query = f'CALL {procedure_name}(%s' + ', %s' * (len(params) - 1) + ')'
         try:
-            self.cursor.execute(f'CALL {procedure_name}(%s' + ', %s' * (len(params) - 1) + ')', params)
-            return self.cursor.fetchall()
+            with self._profile(query, params) as record:
+                return self._run(record, lambda: self.cursor.execute(query, params))
         except pymysql.Error as e:
             print(f"Procedure execution error: {e}")
+            self._mark_if_broken(e)
             raise
 
     def get_tables(self) -> List[str]:
@@ -145,12 +800,10 @@ class DatabaseManager:
 
 def get_mens_db() -> DatabaseManager:
     """Get a DatabaseManager instance for the men's basketball database."""
-    load_dotenv()
-    return DatabaseManager(os.getenv('MENS', 'RITMensBasketball'))
+    return DatabaseManager(get_settings().mens_database)
 
 
 def get_womens_db() -> DatabaseManager:
     """Get a DatabaseManager instance for the women's basketball database."""
-    load_dotenv()
-    return DatabaseManager(os.getenv('WOMENS', 'RITWomensBasketball'))
+    return DatabaseManager(get_settings().womens_database)
 
@@ -0,0 +1,53 @@
+/**
+ * Static Stats Data
+ * Loads the prebuilt JSON datasets written by backend/fetch_and_cache.py
+ *
+ * Every refresh is published as an immutable snapshot, and manifest.json maps
+ * each file to its copy in that snapshot. Resolving all of a page load's files
+ * through one manifest keeps them from the same refresh, even while the next
+ * one is being published.
+ */
+
+export const STATIC_DATA_PATH = "/data/stats";
+
+// Same naming as backend/bundles.py bundle_filename (team -> bundle-team.json)
+export const bundleFileName = (bundle) => `bundle-${bundle}.json`;
+
+// The current manifest, or null if there is none (data written before snapshots)
+export const loadManifest = async () => {
+  try {
+    const res = await fetch(`${STATIC_DATA_PATH}/manifest.json`, { cache: "no-cache" });
+    return res.ok ? await res.json() : null;
+  } catch {
+    return null;
+  }
+};
+
+// Fetch a data file (e.g. "mens/teams.json") from the manifest's snapshot,
+// falling back to the live path if the manifest does not list it or the
+// snapshot has been pruned since the manifest was read
+export const fetchDataFile = async (file, manifest) => {
+  const snapshotPath = manifest?.files?.[file]?.path;
+  if (snapshotPath) {
+    const res = await fetch(`${STATIC_DATA_PATH}/${snapshotPath}`);
+    if (res.ok) {
+      return res;
+    }
+  }
+  return fetch(`${STATIC_DATA_PATH}/${file}`);
+};
+
+// Load a page's datasets from its prebuilt bundle (one request), falling back
+// to the individual dataset files for snapshots written before bundles existed
+export const loadDatasets = async (gender, bundle, names, manifest) => {
+  const bundleRes = await fetchDataFile(`${gender}/${bundleFileName(bundle)}`, manifest);
+  if (bundleRes.ok) {
+    const { datasets } = await bundleRes.json();
+    return names.map((name) => datasets[name]);
+  }
+
+  const responses = await Promise.all(
+    names.map((name) => fetchDataFile(`${gender}/${name}.json`, manifest))
+  );
+  return Promise.all(responses.map((res) => (res.ok ? res.json() : null)));
+};
@@ -11,8 +11,7 @@ import {
   Filter,
   X
 } from 'lucide-react';
-
-const STATIC_DATA_PATH = "/data/stats";
+import { loadDatasets, loadManifest } from '../data/staticStats';
 
 // Reusable Expandable Stats Section Component with Filters
 const StatsSection = ({ 
@@ -465,37 +464,35 @@ const PlayerLeaderboardsPage = () => {
       try {
         const genders = ['mens', 'womens'];
         const dataCache = { mens: null, womens: null };
+        // One manifest for both genders, so every file comes from the same snapshot
+        const manifest = await loadManifest();
         
         for (const gender of genders) {
-          const [effRes, shotEffRes, shotFreqRes, playtypeFreqRes, playTypesRes, teamsRes] = await Promise.all([
-            fetch(`${STATIC_DATA_PATH}/${gender}/player-offensive-efficiency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/player-shot-location-efficiency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/player-shot-location-frequency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/player-playtype-shot-frequency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/play-types.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/teams.json`)
-          ]);
-
-          if (!effRes.ok || !shotEffRes.ok || !shotFreqRes.ok || !playtypeFreqRes.ok) {
+          const [effData, shotEffData, shotFreqData, playtypeFreqData, playTypesData, teamsData] = await loadDatasets(
+            gender,
+            'player',
+            [
+              'player-offensive-efficiency',
+              'player-shot-location-efficiency',
+              'player-shot-location-frequency',
+              'player-playtype-shot-frequency',
+              'play-types',
+              'teams'
+            ],
+            manifest
+          );
+
+          if (!effData || !shotEffData || !shotFreqData || !playtypeFreqData) {
             throw new Error("Data not found. Run: python backend/fetch_and_cache.py");
           }
 
-          const [effData, shotEffData, shotFreqData, playtypeFreqData, playTypesData, teamsData] = await Promise.all([
-            effRes.json(),
-            shotEffRes.json(),
-            shotFreqRes.json(),
-            playtypeFreqRes.json(),
-            playTypesRes.json(),
-            teamsRes.json()
-          ]);
-
           dataCache[gender] = {
             playerOffensiveEfficiency: effData,
             playerShotLocationEfficiency: shotEffData,
             playerShotLocationFrequency: shotFreqData,
             playerPlaytypeShotFrequency: playtypeFreqData,
-            playTypes: playTypesData.play_types || [],
-            teams: teamsData.teams || [],
+            playTypes: playTypesData?.play_types || [],
+            teams: teamsData?.teams || [],
             players: extractPlayers([effData, shotEffData, shotFreqData, playtypeFreqData])
           };
         }
@@ -11,8 +11,7 @@ import {
   Filter,
   X
 } from 'lucide-react';
-
-const STATIC_DATA_PATH = "/data/stats";
+import { loadDatasets, loadManifest } from '../data/staticStats';
 
 // Reusable Expandable Stats Section Component with Filters
 const StatsSection = ({ 
@@ -409,34 +408,27 @@ const TeamLeaderboardsPage = () => {
       try {
         const genders = ['mens', 'womens'];
         const dataCache = { mens: null, womens: null };
+        // One manifest for both genders, so every file comes from the same snapshot
+        const manifest = await loadManifest();
         
         for (const gender of genders) {
-          const [effRes, shotFreqRes, playtypeFreqRes, playTypesRes, teamsRes] = await Promise.all([
-            fetch(`${STATIC_DATA_PATH}/${gender}/team-offensive-efficiency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/team-shot-location-frequency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/team-playtype-shot-frequency.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/play-types.json`),
-            fetch(`${STATIC_DATA_PATH}/${gender}/teams.json`)
-          ]);
-
-          if (!effRes.ok || !shotFreqRes.ok || !playtypeFreqRes.ok) {
+          const [effData, shotFreqData, playtypeFreqData, playTypesData, teamsData] = await loadDatasets(
+            gender,
+            'team',
+            ['team-offensive-efficiency', 'team-shot-location-frequency', 'team-playtype-shot-frequency', 'play-types', 'teams'],
+            manifest
+          );
+
+          if (!effData || !shotFreqData || !playtypeFreqData) {
             throw new Error("Data not found. Run: python backend/fetch_and_cache.py");
           }
 
-          const [effData, shotFreqData, playtypeFreqData, playTypesData, teamsData] = await Promise.all([
-            effRes.json(),
-            shotFreqRes.json(),
-            playtypeFreqRes.json(),
-            playTypesRes.json(),
-            teamsRes.json()
-          ]);
-
           dataCache[gender] = {
             teamOffensiveEfficiency: effData,
             teamShotFrequency: shotFreqData,
             teamPlaytypeShotFrequency: playtypeFreqData,
-            playTypes: playTypesData.play_types || [],
-            teams: teamsData.teams || []
+            playTypes: playTypesData?.play_types || [],
+            teams: teamsData?.teams || []
           };
         }
 
@@ -1,8 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { BarChart3, Filter, ChevronDown, Loader2, ToggleLeft, ToggleRight, RefreshCw } from "lucide-react";
-
-// Static data path (from public folder)
-const STATIC_DATA_PATH = "/data/stats";
+import { fetchDataFile, loadManifest } from "../data/staticStats";
 
 export default function TeamStatisticsSection() {
   const [gender, setGender] = useState("mens");
@@ -25,12 +23,13 @@ export default function TeamStatisticsSection() {
       setError(null);
       
       try {
-        // Load both mens and womens data upfront
+        // Load both mens and womens data upfront, all from the same snapshot
+        const manifest = await loadManifest();
         const [mensRes, womensRes, mensPlayTypesRes, womensPlayTypesRes] = await Promise.all([
-          fetch(`${STATIC_DATA_PATH}/mens/team-offensive-efficiency.json`),
-          fetch(`${STATIC_DATA_PATH}/womens/team-offensive-efficiency.json`),
-          fetch(`${STATIC_DATA_PATH}/mens/play-types.json`),
-          fetch(`${STATIC_DATA_PATH}/womens/play-types.json`)
+          fetchDataFile("mens/team-offensive-efficiency.json", manifest),
+          fetchDataFile("womens/team-offensive-efficiency.json", manifest),
+          fetchDataFile("mens/play-types.json", manifest),
+          fetchDataFile("womens/play-types.json", manifest)
         ]);
 
         if (!mensRes.ok || !womensRes.ok) {